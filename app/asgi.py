@@ -1,6 +1,6 @@
 from litestar import Litestar
 
-from app.server import plugins, openapi, dependencies, routers, cors, startup
+from app.server import plugins, openapi, dependencies, routers, cors, compression, startup, tracing
 from app.config.settings import get_settings
 
 settings = get_settings()
@@ -12,12 +12,21 @@ def create_app() -> Litestar:
     
     return Litestar(
         cors_config=cors.config,
+        compression_config=compression.config,
+        middleware=[tracing.middleware],
         plugins=plugins.plugins,
         openapi_config=openapi.config,
         dependencies=depends,
         debug=settings.app.DEBUG,
         route_handlers=routers.routers_list,
-        on_startup=[startup.start_http_session]
+        on_startup=[
+            startup.start_http_session,
+            startup.ensure_partitions,
+            startup.ensure_availability_trigger,
+            startup.ensure_table_versions,
+            startup.start_background_jobs,
+        ],
+        on_shutdown=[startup.stop_background_jobs],
     )
 
 
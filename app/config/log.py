@@ -28,6 +28,8 @@ log = StructlogConfig(
             root={"level": logging.getLevelName(settings.log.LEVEL)},
         ),
         processors=[
+            # trace_id/span_id bound by TraceContextMiddleware
+            structlog.contextvars.merge_contextvars,
             structlog.processors.TimeStamper(fmt="iso"),
             structlog.processors.add_log_level,
             structlog.processors.StackInfoRenderer(),
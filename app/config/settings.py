@@ -26,6 +26,12 @@ class PostgresSettings:
     MIGRATION_CONFIG: str = field(default_factory=lambda: str(Path(BASE_DIR).parent / "app" / "db" / "migrations" / "alembic.ini"))
     MIGRATION_PATH: str = field(default_factory=lambda: str(Path(BASE_DIR).parent / "app" / "db" / "migrations"))
     MIGRATION_DDL_VERSION_TABLE: str = "ddl_version"
+    MIGRATION_LOCK_TIMEOUT: str = field(default_factory=lambda: os.getenv("DATABASE_MIGRATION_LOCK_TIMEOUT", "5s"))
+    MIGRATION_STATEMENT_TIMEOUT: str = field(
+        default_factory=lambda: os.getenv("DATABASE_MIGRATION_STATEMENT_TIMEOUT", "60s")
+    )
+    MIGRATION_LOCK_RETRIES: int = field(default_factory=lambda: int(os.getenv("DATABASE_MIGRATION_LOCK_RETRIES", "5")))
+    MIGRATION_DRY_RUN: bool = field(default_factory=lambda: json.loads(os.getenv("DATABASE_MIGRATION_DRY_RUN", "false")))
 
     SCHEMA: str = field(default_factory=lambda: os.getenv("POSTGRES_SCHEMA", "public"))
 
@@ -105,6 +111,7 @@ class AppSettings:
     VERSION: str = "0"
     DEBUG: bool = field(default_factory=lambda: json.loads(os.getenv("DEBUG", "false")))
     TEST: bool = field(default_factory=lambda: json.loads(os.getenv("TEST", "false")))
+    EXPORT_BATCH_SIZE: int = field(default_factory=lambda: int(os.getenv("EXPORT_BATCH_SIZE", "1000")))
 
     def __post_init__(self):
         pyproject_path = Path(BASE_DIR).parent.parent / "pyproject.toml"
@@ -122,7 +129,10 @@ class YooKassaSettings:
         default_factory=lambda: os.getenv("YOOKASSA_SECRET_KEY", "")
     )
     RETURN_URL: str = field(default_factory=lambda: os.getenv("YOOKASSA_RETURN_URL", ""))
+    API_URL: str = field(default_factory=lambda: os.getenv("YOOKASSA_API_URL", "https://api.yookassa.ru/v3"))
     IS_TEST: bool = field(default_factory=lambda: json.loads(os.getenv("YOOKASSA_TEST", "false")))
+    # сколько ссылка на оплату неоплаченного билета выдается повторно вместо создания нового платежа
+    PAYMENT_LINK_TTL: int = field(default_factory=lambda: int(os.getenv("YOOKASSA_PAYMENT_LINK_TTL", "3600")))
 
     def __post_init__(self) -> None:
         if not self.SHOP_ID or not self.SECRET_KEY:
@@ -135,6 +145,162 @@ class EmailSettings:
     SMTP_PORT: int = field(default_factory=lambda: int(os.getenv("EMAIL_SMTP_PORT", "587")))
     SMTP_USER: str = field(default_factory=lambda: os.getenv("EMAIL_SMTP_USER", ""))
     SMTP_PASSWORD: str = field(default_factory=lambda: os.getenv("EMAIL_SMTP_PASSWORD", ""))
+    SMTP_USE_TLS: bool = field(default_factory=lambda: json.loads(os.getenv("EMAIL_SMTP_USE_TLS", "true")))
+
+
+@dataclass
+class ArchiveSettings:
+    AFTER_DAYS: int = field(default_factory=lambda: int(os.getenv("ARCHIVE_AFTER_DAYS", "180")))
+    EVENT_BATCH_SIZE: int = field(default_factory=lambda: int(os.getenv("ARCHIVE_EVENT_BATCH_SIZE", "20")))
+    INTERVAL: int = field(default_factory=lambda: int(os.getenv("ARCHIVE_INTERVAL", "3600")))
+    PARTITION_MONTHS_AHEAD: int = field(default_factory=lambda: int(os.getenv("ARCHIVE_PARTITION_MONTHS_AHEAD", "3")))
+    EXPORT_DIR: str = field(default_factory=lambda: os.getenv("ARCHIVE_EXPORT_DIR", ""))
+
+
+@dataclass
+class HttpCacheSettings:
+    """``Cache-Control`` values of the conditional catalog routes."""
+    EVENTS: str = field(
+        default_factory=lambda: os.getenv("HTTP_CACHE_EVENTS", "public, max-age=15, stale-while-revalidate=60")
+    )
+    SPEAKERS: str = field(
+        default_factory=lambda: os.getenv("HTTP_CACHE_SPEAKERS", "public, max-age=60, stale-while-revalidate=300")
+    )
+    MATERIALS: str = field(
+        default_factory=lambda: os.getenv("HTTP_CACHE_MATERIALS", "public, max-age=60, stale-while-revalidate=300")
+    )
+
+
+@dataclass
+class CompressionSettings:
+    BACKEND: str = field(default_factory=lambda: os.getenv("COMPRESSION_BACKEND", "brotli"))
+    MINIMUM_SIZE: int = field(default_factory=lambda: int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024")))
+    GZIP_LEVEL: int = field(default_factory=lambda: int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")))
+    BROTLI_QUALITY: int = field(default_factory=lambda: int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4")))
+    # precompressed entries are compressed once, so they can afford the slow settings
+    PRECOMPRESSED_GZIP_LEVEL: int = field(
+        default_factory=lambda: int(os.getenv("COMPRESSION_PRECOMPRESSED_GZIP_LEVEL", "9"))
+    )
+    PRECOMPRESSED_BROTLI_QUALITY: int = field(
+        default_factory=lambda: int(os.getenv("COMPRESSION_PRECOMPRESSED_BROTLI_QUALITY", "9"))
+    )
+    PRECOMPRESSED_ENTRIES: int = field(
+        default_factory=lambda: int(os.getenv("COMPRESSION_PRECOMPRESSED_ENTRIES", "512"))
+    )
+
+
+@dataclass
+class CheckInSettings:
+    # ключ подписи билетов; если не задан, выводится из YOOKASSA_SECRET_KEY
+    SECRET: str = field(default_factory=lambda: os.getenv("CHECKIN_SECRET", ""))
+    INDEX_TTL: float = field(default_factory=lambda: float(os.getenv("CHECKIN_INDEX_TTL", "300")))
+    FLUSH_INTERVAL: float = field(default_factory=lambda: float(os.getenv("CHECKIN_FLUSH_INTERVAL", "1")))
+    FLUSH_BATCH_SIZE: int = field(default_factory=lambda: int(os.getenv("CHECKIN_FLUSH_BATCH_SIZE", "500")))
+
+
+@dataclass
+class QrSettings:
+    SCALE: int = field(default_factory=lambda: int(os.getenv("QR_SCALE", "8")))
+    BORDER: int = field(default_factory=lambda: int(os.getenv("QR_BORDER", "2")))
+    CACHE_SIZE: int = field(default_factory=lambda: int(os.getenv("QR_CACHE_SIZE", "2048")))
+    WORKERS: int = field(default_factory=lambda: int(os.getenv("QR_WORKERS", "2")))
+
+
+@dataclass
+class AvailabilitySettings:
+    # не больше стольких обновлений в секунду на мероприятие
+    MAX_UPDATES_PER_SECOND: float = field(
+        default_factory=lambda: float(os.getenv("AVAILABILITY_MAX_UPDATES_PER_SECOND", "2"))
+    )
+    KEEPALIVE: float = field(default_factory=lambda: float(os.getenv("AVAILABILITY_KEEPALIVE", "15")))
+
+
+@dataclass
+class WaitlistSettings:
+    # неоплаченный билет мероприятия с листом ожидания освобождает место через столько секунд
+    RESERVATION_TTL: int = field(default_factory=lambda: int(os.getenv("WAITLIST_RESERVATION_TTL", "1800")))
+    INTERVAL: int = field(default_factory=lambda: int(os.getenv("WAITLIST_INTERVAL", "60")))
+    PAYMENT_CONCURRENCY: int = field(default_factory=lambda: int(os.getenv("WAITLIST_PAYMENT_CONCURRENCY", "8")))
+
+
+@dataclass
+class EntitlementSettings:
+    # инкрементальное обновление снимка Pro-подписок (по updated_at) и полная перезагрузка
+    REFRESH_INTERVAL: float = field(default_factory=lambda: float(os.getenv("ENTITLEMENT_REFRESH_INTERVAL", "15")))
+    FULL_REFRESH_INTERVAL: float = field(
+        default_factory=lambda: float(os.getenv("ENTITLEMENT_FULL_REFRESH_INTERVAL", "3600"))
+    )
+
+
+@dataclass
+class ProSettings:
+    EXPIRY_INTERVAL: int = field(default_factory=lambda: int(os.getenv("PRO_EXPIRY_INTERVAL", "300")))
+    EXPIRY_BATCH_SIZE: int = field(default_factory=lambda: int(os.getenv("PRO_EXPIRY_BATCH_SIZE", "500")))
+
+
+@dataclass
+class AnalyticsSettings:
+    INTERVAL: int = field(default_factory=lambda: int(os.getenv("ANALYTICS_INTERVAL", "60")))
+    # rows committed later than their updated_at are still picked up by the next refresh
+    OVERLAP: int = field(default_factory=lambda: int(os.getenv("ANALYTICS_OVERLAP", "120")))
+
+
+@dataclass
+class FunnelSettings:
+    FLUSH_INTERVAL_MS: int = field(default_factory=lambda: int(os.getenv("FUNNEL_FLUSH_INTERVAL_MS", "500")))
+    FLUSH_BATCH_SIZE: int = field(default_factory=lambda: int(os.getenv("FUNNEL_FLUSH_BATCH_SIZE", "1000")))
+    # events beyond this are dropped while the database is unavailable
+    MAX_BUFFER: int = field(default_factory=lambda: int(os.getenv("FUNNEL_MAX_BUFFER", "100000")))
+
+
+@dataclass
+class TracingSettings:
+    SLOW_CALL_MS: float = field(default_factory=lambda: float(os.getenv("TRACING_SLOW_CALL_MS", "1000")))
+    SLOW_CALL_SAMPLE_RATE: float = field(
+        default_factory=lambda: float(os.getenv("TRACING_SLOW_CALL_SAMPLE_RATE", "1.0"))
+    )
+    # log every upstream call as a span, not only the slow ones
+    LOG_SPANS: bool = field(default_factory=lambda: json.loads(os.getenv("TRACING_LOG_SPANS", "false")))
+
+
+@dataclass
+class HttpClientSettings:
+    """Connector of the shared aiohttp session."""
+    LIMIT: int = field(default_factory=lambda: int(os.getenv("HTTP_CLIENT_LIMIT", "200")))
+    LIMIT_PER_HOST: int = field(default_factory=lambda: int(os.getenv("HTTP_CLIENT_LIMIT_PER_HOST", "100")))
+    DNS_CACHE_TTL: int = field(default_factory=lambda: int(os.getenv("HTTP_CLIENT_DNS_CACHE_TTL", "300")))
+    # idle connections are kept this long; aiohttp's default of 15s drops them between registrations
+    KEEPALIVE_TIMEOUT: float = field(default_factory=lambda: float(os.getenv("HTTP_CLIENT_KEEPALIVE_TIMEOUT", "60")))
+    # connections opened at startup to the YooKassa API and to HTTP_CLIENT_WARMUP_URLS
+    WARMUP_CONNECTIONS: int = field(default_factory=lambda: int(os.getenv("HTTP_CLIENT_WARMUP_CONNECTIONS", "4")))
+    WARMUP_URLS: list[str] = field(
+        default_factory=lambda: [url for url in os.getenv("HTTP_CLIENT_WARMUP_URLS", "").split(",") if url]
+    )
+    WARMUP_TIMEOUT: float = field(default_factory=lambda: float(os.getenv("HTTP_CLIENT_WARMUP_TIMEOUT", "5")))
+
+
+@dataclass
+class RateLimitSettings:
+    """Limits are ``capacity/period``: requests per that many seconds."""
+    ENABLED: bool = field(default_factory=lambda: json.loads(os.getenv("RATE_LIMIT_ENABLED", "true")))
+    # memory: per worker; redis: shared through RATE_LIMIT_REDIS_URL
+    BACKEND: str = field(default_factory=lambda: os.getenv("RATE_LIMIT_BACKEND", "memory"))
+    REDIS_URL: str = field(default_factory=lambda: os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0"))
+    REDIS_TIMEOUT: float = field(default_factory=lambda: float(os.getenv("RATE_LIMIT_REDIS_TIMEOUT", "0.2")))
+    MAX_KEYS: int = field(default_factory=lambda: int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000")))
+    # client IP from X-Forwarded-For, only behind a proxy that sets it
+    TRUST_FORWARDED: bool = field(default_factory=lambda: json.loads(os.getenv("RATE_LIMIT_TRUST_FORWARDED", "false")))
+    REGISTER_PER_IP: str = field(default_factory=lambda: os.getenv("RATE_LIMIT_REGISTER_PER_IP", "20/60"))
+    REGISTER_PER_EMAIL: str = field(default_factory=lambda: os.getenv("RATE_LIMIT_REGISTER_PER_EMAIL", "5/600"))
+    REGISTER_PER_USER: str = field(default_factory=lambda: os.getenv("RATE_LIMIT_REGISTER_PER_USER", "10/600"))
+    REGISTER_PER_EVENT: str = field(default_factory=lambda: os.getenv("RATE_LIMIT_REGISTER_PER_EVENT", "300/60"))
+    WEBHOOK_PER_IP: str = field(default_factory=lambda: os.getenv("RATE_LIMIT_WEBHOOK_PER_IP", "600/60"))
+
+
+@dataclass
+class SingleFlightSettings:
+    # a shared read running longer fails for all its callers with 503
+    TIMEOUT: float = field(default_factory=lambda: float(os.getenv("SINGLE_FLIGHT_TIMEOUT", "5")))
 
 
 @dataclass
@@ -144,6 +310,21 @@ class Settings:
     log: LogSettings = field(default_factory=LogSettings)
     yookassa: YooKassaSettings = field(default_factory=YooKassaSettings)
     email: EmailSettings = field(default_factory=EmailSettings)
+    archive: ArchiveSettings = field(default_factory=ArchiveSettings)
+    http_cache: HttpCacheSettings = field(default_factory=HttpCacheSettings)
+    compression: CompressionSettings = field(default_factory=CompressionSettings)
+    checkin: CheckInSettings = field(default_factory=CheckInSettings)
+    qr: QrSettings = field(default_factory=QrSettings)
+    availability: AvailabilitySettings = field(default_factory=AvailabilitySettings)
+    waitlist: WaitlistSettings = field(default_factory=WaitlistSettings)
+    entitlement: EntitlementSettings = field(default_factory=EntitlementSettings)
+    pro: ProSettings = field(default_factory=ProSettings)
+    analytics: AnalyticsSettings = field(default_factory=AnalyticsSettings)
+    funnel: FunnelSettings = field(default_factory=FunnelSettings)
+    tracing: TracingSettings = field(default_factory=TracingSettings)
+    http_client: HttpClientSettings = field(default_factory=HttpClientSettings)
+    rate_limit: RateLimitSettings = field(default_factory=RateLimitSettings)
+    single_flight: SingleFlightSettings = field(default_factory=SingleFlightSettings)
     
     @classmethod
     def from_env(cls, env_name=".env") -> "Settings":
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import asyncio
+import re
+import sys
 from typing import TYPE_CHECKING, cast
 
 from sqlalchemy import Column, pool
@@ -11,6 +13,9 @@ from alembic import context
 from alembic.autogenerate import rewriter
 from alembic.operations import ops
 
+from app.config.settings import get_settings
+from app.db.migrations.helpers import LockReport
+
 if TYPE_CHECKING:
     from sqlalchemy.engine import Connection
 
@@ -23,7 +28,15 @@ __all__ = ("do_run_migrations", "run_migrations_offline", "run_migrations_online
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config: AlembicCommandConfig = context.config  # type: ignore  # noqa: PGH003
+settings = get_settings()
 writer = rewriter.Rewriter()
+# Partitions and tables left behind by ``convert_to_range_partitioned`` live outside the metadata
+UNMANAGED_TABLES = re.compile(r"^\w+_(p\d{6}|default|partitioned|legacy)$")
+
+
+def include_name(name: str | None, type_: str, parent_names: dict[str, str | None]) -> bool:  # noqa: ARG001
+    """Keep autogenerate from dropping partitions of partitioned tables."""
+    return not (type_ == "table" and name is not None and UNMANAGED_TABLES.match(name))
 
 
 @writer.rewrites(ops.CreateTableOp)
@@ -62,7 +75,11 @@ def run_migrations_offline() -> None:
 
     Calls to context.execute() here emit the given string to the
     script output.
+
+    With ``DATABASE_MIGRATION_DRY_RUN`` the SQL is not printed; instead every
+    revision is listed with the locks its statements take.
     """
+    report = LockReport(sys.stdout) if settings.postgres.MIGRATION_DRY_RUN else None
     context.configure(
         url=config.db_url,
         target_metadata=metadata_registry.get(config.bind_key),
@@ -74,14 +91,29 @@ def run_migrations_offline() -> None:
         user_module_prefix=config.user_module_prefix,
         render_as_batch=config.render_as_batch,
         process_revision_directives=writer,
+        include_name=include_name,
+        transaction_per_migration=True,
+        output_buffer=report,
     )
 
     with context.begin_transaction():
         context.run_migrations()
 
+    if report is not None:
+        report.flush()
+        report.render()
+
 
 def do_run_migrations(connection: Connection) -> None:
-    """Run migrations."""
+    """Run migrations.
+
+    Every revision gets its own transaction and the connection waits for locks
+    at most ``DATABASE_MIGRATION_LOCK_TIMEOUT``, so a blocked DDL statement fails
+    fast instead of queueing all writes to the table behind it.
+    """
+    connection.exec_driver_sql(f"SET lock_timeout = '{settings.postgres.MIGRATION_LOCK_TIMEOUT}'")
+    connection.exec_driver_sql(f"SET statement_timeout = '{settings.postgres.MIGRATION_STATEMENT_TIMEOUT}'")
+    connection.commit()
     context.configure(
         connection=connection,
         target_metadata=metadata_registry.get(config.bind_key),
@@ -91,6 +123,8 @@ def do_run_migrations(connection: Connection) -> None:
         user_module_prefix=config.user_module_prefix,
         render_as_batch=config.render_as_batch,
         process_revision_directives=writer,
+        include_name=include_name,
+        transaction_per_migration=True,
     )
 
     with context.begin_transaction():
@@ -0,0 +1,365 @@
+"""Online schema change helpers for migration scripts.
+
+Revisions touching large tables (``event_ticket``, ``payment``) should use these
+helpers instead of the bare ``op`` calls, so that writes are never blocked for the
+whole migration.  All helpers expect to run inside the ``autocommit_block()`` that
+``script.py.mako`` opens around ``schema_upgrades``/``data_upgrades``.
+"""
+
+from __future__ import annotations
+
+import datetime
+import re
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, TextIO
+
+from alembic import op
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.config.settings import get_settings
+from app.db.partitions import monthly_partition_ddl, monthly_partitions
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+__all__ = (
+    "LockReport",
+    "add_check_constraint_not_valid",
+    "add_foreign_key_not_valid",
+    "batched_backfill",
+    "convert_to_range_partitioned",
+    "create_index_concurrently",
+    "drop_index_concurrently",
+    "guarded",
+    "set_timeouts",
+    "validate_constraint",
+)
+
+settings = get_settings()
+
+LOCK_NOT_AVAILABLE = "55P03"
+"""SQLSTATE raised when ``lock_timeout`` expires."""
+
+
+def _sqlstate(exc: DBAPIError) -> str | None:
+    return getattr(exc.orig, "sqlstate", None) or getattr(exc.orig, "pgcode", None)
+
+
+def set_timeouts(lock_timeout: str | None = None, statement_timeout: str | None = None) -> None:
+    """Set session level ``lock_timeout``/``statement_timeout`` for the migration connection."""
+    lock_timeout = lock_timeout or settings.postgres.MIGRATION_LOCK_TIMEOUT
+    statement_timeout = statement_timeout or settings.postgres.MIGRATION_STATEMENT_TIMEOUT
+    op.execute(f"SET lock_timeout = '{lock_timeout}'")
+    op.execute(f"SET statement_timeout = '{statement_timeout}'")
+
+
+def guarded[T](
+    operation: Callable[[], T],
+    *,
+    lock_timeout: str | None = None,
+    statement_timeout: str | None = None,
+    retries: int | None = None,
+    backoff: float = 0.5,
+    on_retry: Callable[[], Any] | None = None,
+) -> T:
+    """Run ``operation`` with lock/statement timeouts, retrying when the lock is not acquired.
+
+    A DDL statement waiting for an ``ACCESS EXCLUSIVE`` lock queues every other query on the
+    table behind it, so it is better to give up quickly and try again than to wait.
+
+    Args:
+        operation: Callable emitting the statement(s) through ``op``.
+        lock_timeout: How long to wait for the lock, e.g. ``"3s"``.
+        statement_timeout: Upper bound for the statement itself.
+        retries: Number of attempts, defaults to ``MIGRATION_LOCK_RETRIES``.
+        backoff: Base delay in seconds, doubled after every failed attempt.
+        on_retry: Cleanup to run before the next attempt (e.g. dropping an invalid index).
+
+    Returns:
+        The result of ``operation``.
+    """
+    retries = retries or settings.postgres.MIGRATION_LOCK_RETRIES
+    for attempt in range(1, retries + 1):
+        set_timeouts(lock_timeout, statement_timeout)
+        try:
+            return operation()
+        except DBAPIError as e:
+            if _sqlstate(e) != LOCK_NOT_AVAILABLE or attempt == retries:
+                raise
+            if on_retry is not None:
+                on_retry()
+            time.sleep(backoff * 2 ** (attempt - 1))
+        finally:
+            set_timeouts()
+    raise RuntimeError("unreachable")
+
+
+def create_index_concurrently(
+    index_name: str,
+    table_name: str,
+    columns: Sequence[str],
+    *,
+    unique: bool = False,
+    where: str | None = None,
+    **kw: Any,
+) -> None:
+    """Build an index without blocking writes (``CREATE INDEX CONCURRENTLY``).
+
+    A failed concurrent build leaves an ``INVALID`` index behind, so it is dropped
+    before every retry.
+    """
+    if where is not None:
+        kw["postgresql_where"] = text(where)
+
+    guarded(
+        lambda: op.create_index(
+            index_name,
+            table_name,
+            list(columns),
+            unique=unique,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+            **kw,
+        ),
+        statement_timeout="0",
+        on_retry=lambda: drop_index_concurrently(index_name, table_name),
+    )
+
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    guarded(
+        lambda: op.drop_index(
+            index_name,
+            table_name=table_name,
+            if_exists=True,
+            postgresql_concurrently=True,
+        ),
+    )
+
+
+def add_check_constraint_not_valid(constraint_name: str, table_name: str, condition: str) -> None:
+    """Add a CHECK constraint without scanning the table; call :func:`validate_constraint` afterwards."""
+    guarded(
+        lambda: op.execute(
+            f'ALTER TABLE "{table_name}" ADD CONSTRAINT "{constraint_name}" CHECK ({condition}) NOT VALID'
+        ),
+    )
+
+
+def add_foreign_key_not_valid(
+    constraint_name: str,
+    table_name: str,
+    column: str,
+    referent_table: str,
+    referent_column: str = "id",
+    ondelete: str | None = None,
+) -> None:
+    """Add a FOREIGN KEY without scanning the table; call :func:`validate_constraint` afterwards."""
+    on_delete = f" ON DELETE {ondelete}" if ondelete else ""
+    guarded(
+        lambda: op.execute(
+            f'ALTER TABLE "{table_name}" ADD CONSTRAINT "{constraint_name}" '
+            f'FOREIGN KEY ("{column}") REFERENCES "{referent_table}" ("{referent_column}"){on_delete} NOT VALID'
+        ),
+    )
+
+
+def validate_constraint(constraint_name: str, table_name: str) -> None:
+    """Validate a ``NOT VALID`` constraint, holding only ``SHARE UPDATE EXCLUSIVE``."""
+    guarded(
+        lambda: op.execute(f'ALTER TABLE "{table_name}" VALIDATE CONSTRAINT "{constraint_name}"'),
+        statement_timeout="0",
+    )
+
+
+def batched_backfill(
+    table_name: str,
+    set_clause: str,
+    where: str,
+    *,
+    batch_size: int = 5000,
+    pause: float = 0.1,
+    params: dict[str, Any] | None = None,
+) -> int:
+    """Update rows in small committed chunks instead of one long transaction.
+
+    ``where`` must stop matching a row once it is updated, otherwise the loop never ends::
+
+        batched_backfill("payment", "source = payment_metadata->>'source'", "source IS NULL")
+
+    Args:
+        table_name: Table to update.
+        set_clause: SQL for the ``SET`` part.
+        where: SQL predicate selecting rows that still need the backfill.
+        batch_size: Rows per chunk.
+        pause: Seconds to sleep between chunks to let replicas and vacuum catch up.
+        params: Bind parameters used by ``set_clause``/``where``.
+
+    Returns:
+        Total number of updated rows.
+    """
+    statement = text(
+        f'UPDATE "{table_name}" SET {set_clause} '
+        f'WHERE id IN (SELECT id FROM "{table_name}" WHERE {where} '
+        f"ORDER BY id LIMIT :batch_size FOR UPDATE)"
+    )
+    if op.get_context().as_sql:
+        op.execute(statement.bindparams(**(params or {}), batch_size=batch_size))
+        return 0
+
+    bind = op.get_bind()
+    total = 0
+    while True:
+        updated = guarded(lambda: bind.execute(statement, {**(params or {}), "batch_size": batch_size}).rowcount)
+        total += updated
+        if updated < batch_size:
+            return total
+        time.sleep(pause)
+
+
+def convert_to_range_partitioned(
+    table_name: str,
+    column: str,
+    *,
+    months_ahead: int = 3,
+    foreign_keys: Sequence[tuple[str, str]] = (),
+    select_list: str = "*",
+    batch_size: int = 50000,
+    pause: float = 0.05,
+) -> None:
+    """Replace ``table_name`` with a copy partitioned monthly by ``column``.
+
+    Rows are copied in committed chunks while the old table keeps serving writes.
+    The final swap runs as one ``DO`` block under a short ``ACCESS EXCLUSIVE`` lock:
+    it drops copies of rows deleted since the copy started, re-copies rows inserted or
+    updated meanwhile and renames the tables, leaving the old one as ``<table>_legacy``
+    to be dropped later.
+    The table must have ``id`` and ``updated_at`` columns.
+
+    Args:
+        table_name: Table to convert, e.g. ``"payment"``.
+        column: Partition key, becomes a part of the primary key.
+        months_ahead: Empty partitions to create after the current month.
+        foreign_keys: ``(column, "table(column)")`` pairs, ``LIKE`` does not copy them.
+        select_list: Expression list used to copy rows, may transform columns.
+        batch_size: Rows per copy chunk.
+        pause: Seconds to sleep between chunks.
+    """
+    new = f"{table_name}_partitioned"
+    op.execute(
+        f'CREATE TABLE IF NOT EXISTS "{new}" (LIKE "{table_name}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY RANGE ("{column}")'
+    )
+    op.execute(f'ALTER TABLE "{new}" ADD PRIMARY KEY (id, "{column}")')
+    for fk_column, target in foreign_keys:
+        op.execute(f'ALTER TABLE "{new}" ADD FOREIGN KEY ("{fk_column}") REFERENCES {target}')
+    op.execute(f'CREATE TABLE IF NOT EXISTS "{table_name}_default" PARTITION OF "{new}" DEFAULT')
+
+    bind = op.get_bind()
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    oldest = None if op.get_context().as_sql else bind.execute(text(f'SELECT min("{column}") FROM "{table_name}"')).scalar()
+    since = oldest.date() if oldest is not None else today
+    until = today.replace(day=1) + datetime.timedelta(days=31 * months_ahead)
+    for start, end in monthly_partitions(since, until):
+        op.execute(monthly_partition_ddl(table_name, start, end, parent=new))
+
+    started_at = datetime.datetime.now(datetime.timezone.utc)
+    copy = text(
+        f"WITH rows AS (SELECT {select_list} FROM \"{table_name}\" WHERE id > :last_id ORDER BY id LIMIT :batch_size), "
+        f'copied AS (INSERT INTO "{new}" SELECT * FROM rows ON CONFLICT DO NOTHING) '
+        "SELECT max(id) FROM rows"
+    )
+    if not op.get_context().as_sql:
+        last_id = 0
+        while (last_id := bind.execute(copy, {"last_id": last_id, "batch_size": batch_size}).scalar()) is not None:
+            time.sleep(pause)
+
+    guarded(
+        lambda: op.execute(
+            f"""
+            DO $$
+            BEGIN
+                LOCK TABLE "{table_name}" IN ACCESS EXCLUSIVE MODE;
+                DELETE FROM "{new}" WHERE id IN (
+                    SELECT id FROM "{table_name}" WHERE updated_at >= '{started_at.isoformat()}'
+                );
+                DELETE FROM "{new}" AS copied
+                WHERE NOT EXISTS (SELECT FROM "{table_name}" AS source WHERE source.id = copied.id);
+                INSERT INTO "{new}" SELECT {select_list} FROM "{table_name}"
+                WHERE updated_at >= '{started_at.isoformat()}' OR id > (SELECT coalesce(max(id), 0) FROM "{new}");
+                ALTER TABLE "{table_name}" RENAME TO "{table_name}_legacy";
+                ALTER TABLE "{new}" RENAME TO "{table_name}";
+            END $$
+            """
+        ),
+        statement_timeout="0",
+    )
+
+
+# (pattern, lock mode) pairs, checked in order; the first match wins.
+LOCK_RULES: tuple[tuple[re.Pattern[str], str], ...] = tuple(
+    (re.compile(pattern, re.IGNORECASE | re.DOTALL), lock)
+    for pattern, lock in (
+        (r"^CREATE\s+(UNIQUE\s+)?INDEX\s+CONCURRENTLY", "SHARE UPDATE EXCLUSIVE"),
+        (r"^DROP\s+INDEX\s+CONCURRENTLY", "SHARE UPDATE EXCLUSIVE"),
+        (r"^CREATE\s+(UNIQUE\s+)?INDEX", "SHARE (blocks writes)"),
+        (r"^ALTER\s+TABLE.*VALIDATE\s+CONSTRAINT", "SHARE UPDATE EXCLUSIVE"),
+        (r"^ALTER\s+TABLE.*FOREIGN\s+KEY.*NOT\s+VALID", "SHARE ROW EXCLUSIVE (brief)"),
+        (r"^ALTER\s+TABLE.*NOT\s+VALID", "ACCESS EXCLUSIVE (brief)"),
+        (r"^ALTER\s+TABLE.*(ADD\s+CONSTRAINT|SET\s+NOT\s+NULL|ALTER\s+COLUMN.*TYPE)", "ACCESS EXCLUSIVE (table scan)"),
+        (r"^ALTER\s+TABLE", "ACCESS EXCLUSIVE"),
+        (r"^(DROP|TRUNCATE)\s+TABLE", "ACCESS EXCLUSIVE"),
+        (r"^(UPDATE|DELETE|INSERT)", "ROW EXCLUSIVE"),
+        (r"^CREATE\s+TABLE", "none"),
+    )
+)
+_RUNNING = re.compile(r"^-- Running (?P<step>.+)$", re.MULTILINE)
+_TABLE = re.compile(r'\b(?:TABLE|ON|INTO|UPDATE|FROM)\s+(?:ONLY\s+)?(?:IF\s+(?:NOT\s+)?EXISTS\s+)?"?([\w.]+)"?', re.IGNORECASE)
+
+
+@dataclass
+class LockReport:
+    """``output_buffer`` for offline mode that reports the lock each revision statement takes.
+
+    Used by ``env.py`` when ``DATABASE_MIGRATION_DRY_RUN`` is set, e.g.::
+
+        DATABASE_MIGRATION_DRY_RUN=true litestar database upgrade --sql
+    """
+
+    stream: TextIO
+    revisions: dict[str, list[tuple[str, str, str]]] = field(default_factory=dict)
+    _current: str = "(preamble)"
+    _pending: str = ""
+
+    def write(self, chunk: str) -> int:
+        self._pending += chunk
+        *statements, self._pending = self._pending.split(";\n")
+        for statement in statements:
+            self._consume(statement)
+        return len(chunk)
+
+    def flush(self) -> None:
+        if self._pending.strip():
+            self._consume(self._pending)
+            self._pending = ""
+        self.stream.flush()
+
+    def _consume(self, chunk: str) -> None:
+        for line in chunk.splitlines():
+            if match := _RUNNING.match(line.strip()):
+                self._current = match.group("step")
+        statement = "\n".join(line for line in chunk.splitlines() if not line.startswith("--")).strip()
+        if not statement or statement.upper() in {"BEGIN", "COMMIT"} or statement.upper().startswith("SET "):
+            return
+        lock = next((lock for pattern, lock in LOCK_RULES if pattern.search(statement)), "unknown")
+        table = match.group(1) if (match := _TABLE.search(statement)) else "-"
+        self.revisions.setdefault(self._current, []).append((lock, table, statement.splitlines()[0]))
+
+    def render(self) -> None:
+        for revision, statements in self.revisions.items():
+            self.stream.write(f"{revision}\n")
+            for lock, table, statement in statements:
+                self.stream.write(f"  {lock:<32} {table:<24} {statement[:100]}\n")
+        self.stream.flush()
@@ -1,19 +1,33 @@
 from .user import User
 from .speaker import Speaker
 from .event import Event
+from .event_slug_counter import EventSlugCounter
+from .table_version import TableVersion
 from .event_speaker import EventSpeaker
 from .event_material import EventMaterial
 from .event_ticket import EventTicket
 from .payment import Payment
 from .pro_subscription import ProSubscription
+from .waitlist_entry import WaitlistEntry
+from .funnel_event import FunnelEvent
+from .analytics import EventStats, DailyRevenue
+from .archive import event_ticket_archive, payment_archive
 
 __all__ = [
     "User",
     "Speaker",
     "Event",
+    "EventSlugCounter",
+    "TableVersion",
     "EventSpeaker",
     "EventMaterial",
     "EventTicket",
     "Payment",
     "ProSubscription",
+    "WaitlistEntry",
+    "FunnelEvent",
+    "EventStats",
+    "DailyRevenue",
+    "event_ticket_archive",
+    "payment_archive",
 ]
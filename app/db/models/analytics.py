@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import datetime
+from decimal import Decimal
+
+from advanced_alchemy.base import BigIntAuditBase
+from sqlalchemy import Date, Enum, ForeignKey, Integer, Numeric, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .payment import PaymentType
+
+
+class EventStats(BigIntAuditBase):
+    """Per-event counters, recomputed by ``AnalyticsService`` for events whose tickets or payments changed."""
+    __tablename__ = "event_stats"
+    __table_args__ = (
+        UniqueConstraint("event_id", name="uq_event_stats_event"),
+        {"comment": "Precomputed ticket and revenue counters per event"}
+    )
+
+    event_id: Mapped[int] = mapped_column(ForeignKey("event.id", ondelete="CASCADE"), nullable=False)
+    tickets_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    tickets_waiting: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    tickets_paid: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    tickets_refunded: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    tickets_expired: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    checked_in: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=0)
+    refunded_amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=0)
+
+
+class DailyRevenue(BigIntAuditBase):
+    """Succeeded payments per day (UTC, by payment creation) and payment type."""
+    __tablename__ = "daily_revenue"
+    __table_args__ = (
+        UniqueConstraint("day", "payment_type", name="uq_daily_revenue_day_type"),
+        {"comment": "Precomputed revenue per day and payment type"}
+    )
+
+    day: Mapped[datetime.date] = mapped_column(Date, nullable=False)
+    payment_type: Mapped[PaymentType] = mapped_column(Enum(PaymentType, native_enum=False, length=30), nullable=False)
+    payments: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    revenue: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False, default=0)
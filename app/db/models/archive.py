@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from sqlalchemy import Column, Index, Table
+
+from advanced_alchemy.base import orm_registry
+
+from .event_ticket import EventTicket
+from .payment import Payment
+
+__all__ = ("event_ticket_archive", "payment_archive")
+
+
+def _archive_of(table: Table, *indexes: str) -> Table:
+    """Cold copy of ``table``: same columns, no foreign keys or checks, so rows can be moved as is."""
+    columns = [
+        Column(
+            column.name,
+            column.type,
+            primary_key=column.name == "id",
+            autoincrement=False,
+            nullable=column.nullable,
+        )
+        for column in table.columns
+    ]
+    archive = Table(
+        f"{table.name}_archive",
+        orm_registry.metadata,
+        *columns,
+        comment=f"Archived rows of {table.name} for past events",
+    )
+    for name in indexes:
+        Index(f"ix_{archive.name}_{name}", archive.c[name])
+    return archive
+
+
+event_ticket_archive = _archive_of(EventTicket.__table__, "event_id", "user_id")
+payment_archive = _archive_of(Payment.__table__, "ticket_id", "created_at")
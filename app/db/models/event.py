@@ -6,7 +6,7 @@ import datetime
 from advanced_alchemy.base import BigIntAuditBase
 from advanced_alchemy.mixins import SlugKey
 from advanced_alchemy.types import DateTimeUTC
-from sqlalchemy import String, Numeric, CheckConstraint, Integer
+from sqlalchemy import String, Numeric, CheckConstraint, Index, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -22,6 +22,8 @@ class Event(BigIntAuditBase, SlugKey):
         CheckConstraint("pro_price >= 0", name="check_pro_price_positive"),
         CheckConstraint("pro_price <= price", name="check_pro_price_less_than_price"),
         CheckConstraint("max_participants > 0", name="check_max_participants_positive"),
+        # max(updated_at) of the catalog tables is the ETag of the catalog endpoints
+        Index("ix_event_updated_at", "updated_at"),
         {"comment": "Educational events"}
     )
 
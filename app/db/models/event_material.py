@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 from advanced_alchemy.base import BigIntAuditBase
-from sqlalchemy import String, Boolean, ForeignKey
+from sqlalchemy import String, Boolean, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -11,7 +11,10 @@ if TYPE_CHECKING:
 
 class EventMaterial(BigIntAuditBase):
     __tablename__ = "event_material"
-    __table_args__ = {"comment": "Educational materials for events"}
+    __table_args__ = (
+        Index("ix_event_material_updated_at", "updated_at"),
+        {"comment": "Educational materials for events"}
+    )
 
     title: Mapped[str] = mapped_column(nullable=False)
     url: Mapped[str] = mapped_column(String(255), nullable=False)
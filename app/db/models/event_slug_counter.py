@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from advanced_alchemy.base import BigIntAuditBase
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class EventSlugCounter(BigIntAuditBase):
+    __tablename__ = "event_slug_counter"
+    __table_args__ = {"comment": "Last slug suffix handed out per slugified event title"}
+
+    base: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    last_suffix: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
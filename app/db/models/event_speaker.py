@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 from advanced_alchemy.base import BigIntAuditBase
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -12,7 +12,10 @@ if TYPE_CHECKING:
 
 class EventSpeaker(BigIntAuditBase):
     __tablename__ = "event_speaker"
-    __table_args__ = {"comment": "Association table for events and speakers"}
+    __table_args__ = (
+        Index("ix_event_speaker_updated_at", "updated_at"),
+        {"comment": "Association table for events and speakers"}
+    )
 
     event_id: Mapped[int] = mapped_column(ForeignKey("event.id", ondelete="CASCADE"), nullable=False)
     speaker_id: Mapped[int] = mapped_column(ForeignKey("speaker.id", ondelete="CASCADE"), nullable=False)
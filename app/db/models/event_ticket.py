@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+import datetime
 from advanced_alchemy.base import BigIntAuditBase
-from sqlalchemy import ForeignKey, Boolean, Numeric, CheckConstraint, Enum, UniqueConstraint
+from advanced_alchemy.types import DateTimeUTC
+from sqlalchemy import ForeignKey, Boolean, Numeric, CheckConstraint, Enum, Index, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from enum import StrEnum
 
@@ -16,6 +18,8 @@ class EventTicketStatus(StrEnum):
     WAITING_PAYMENT = "waiting_payment"
     PAID = "paid"
     REFUNDED = "refunded"
+    # не оплачен за WAITLIST_RESERVATION_TTL, место отдано листу ожидания
+    EXPIRED = "expired"
 
 
 class EventTicket(BigIntAuditBase):
@@ -23,6 +27,7 @@ class EventTicket(BigIntAuditBase):
     __table_args__ = (
         CheckConstraint("amount_paid >= 0", name="check_amount_paid_positive"),
         UniqueConstraint("event_id", "user_id", name="uq_event_user"),
+        Index("ix_event_ticket_updated_at", "updated_at"),
         {"comment": "Event registration tickets"}
     )
 
@@ -34,6 +39,25 @@ class EventTicket(BigIntAuditBase):
         nullable=False,
         default=EventTicketStatus.WAITING_PAYMENT
     )
+    # start of the current reservation, moved when the ticket is reissued; unpaid ones expire by it
+    reserved_at: Mapped[datetime.datetime] = mapped_column(
+        DateTimeUTC(timezone=True),
+        nullable=False,
+        default=lambda: datetime.datetime.now(datetime.timezone.utc)
+    )
+    checked_in_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTimeUTC(timezone=True),
+        nullable=True,
+        default=None
+    )
+    # YooKassa payment of a WAITING_PAYMENT ticket, handed out again on repeated registration
+    yookassa_payment_id: Mapped[str | None] = mapped_column(String(255), nullable=True, default=None)
+    payment_url: Mapped[str | None] = mapped_column(String(500), nullable=True, default=None)
+    payment_url_expires_at: Mapped[datetime.datetime | None] = mapped_column(
+        DateTimeUTC(timezone=True),
+        nullable=True,
+        default=None
+    )
 
     event: Mapped["Event"] = relationship(
         back_populates="registrations",
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import datetime
+from enum import StrEnum
+
+from advanced_alchemy.base import BigIntBase
+from advanced_alchemy.types import DateTimeUTC
+from sqlalchemy import BigInteger, Enum, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class FunnelStep(StrEnum):
+    REGISTRATION_STARTED = "registration_started"
+    PAYMENT_CREATED = "payment_created"
+    PAYMENT_SUCCEEDED = "payment_succeeded"
+    EMAIL_SENT = "email_sent"
+
+
+class FunnelEvent(BigIntBase):
+    """Append-only registration funnel log, written in batches by ``FunnelService``.
+
+    No foreign keys: rows outlive archived tickets and inserts skip the FK checks.
+    """
+    __tablename__ = "funnel_event"
+    __table_args__ = (
+        Index("ix_funnel_event_event_step", "event_id", "step"),
+        Index("ix_funnel_event_source_occurred_at", "source", "occurred_at"),
+        {"comment": "Registration funnel steps attributed to a source"}
+    )
+
+    step: Mapped[FunnelStep] = mapped_column(Enum(FunnelStep, native_enum=False, length=30), nullable=False)
+    source: Mapped[str] = mapped_column(String(100), nullable=False)
+    event_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    user_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    ticket_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    occurred_at: Mapped[datetime.datetime] = mapped_column(DateTimeUTC(timezone=True), nullable=False)
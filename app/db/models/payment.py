@@ -2,8 +2,10 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 from enum import StrEnum
+import datetime
 from advanced_alchemy.base import BigIntAuditBase
-from sqlalchemy import String, Numeric, Enum, ForeignKey, CheckConstraint
+from advanced_alchemy.types import DateTimeUTC
+from sqlalchemy import String, Numeric, Enum, ForeignKey, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -52,7 +54,23 @@ class Payment(BigIntAuditBase):
             name="check_payment_target"
         ),
         CheckConstraint("amount >= 0", name="check_amount_positive"),
-        {"comment": "Payment records for tickets and subscriptions"}
+        # changed payments since the last analytics refresh
+        Index("ix_payment_updated_at", "updated_at"),
+        # PaymentService.record skips repeated webhook notifications by it
+        Index("ix_payment_yookassa_id", "yookassa_id"),
+        {
+            "comment": "Payment records for tickets and subscriptions",
+            # Monthly partitions are created by ArchiveService.ensure_payment_partitions
+            "postgresql_partition_by": "RANGE (created_at)",
+        }
+    )
+
+    # Partition key has to be a part of the primary key
+    created_at: Mapped[datetime.datetime] = mapped_column(
+        DateTimeUTC(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.datetime.now(datetime.timezone.utc),
+        sort_order=3002,
     )
 
     ticket_id: Mapped[int | None] = mapped_column(ForeignKey("event_ticket.id"), nullable=True)
@@ -74,6 +92,7 @@ class Payment(BigIntAuditBase):
         nullable=False,
         default=PaymentType.EVENT_TICKET,
     )
+    # event_id/user_id are reachable through ticket_id, only extra attributes (source) are stored here
     payment_metadata: Mapped[dict] = mapped_column(JSONB, nullable=False, default={})
 
     ticket: Mapped["EventTicket | None"] = relationship(
@@ -3,7 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 import datetime
 from advanced_alchemy.base import BigIntAuditBase
-from sqlalchemy import ForeignKey, CheckConstraint
+from sqlalchemy import ForeignKey, CheckConstraint, Index
 from advanced_alchemy.types import DateTimeUTC
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -19,10 +19,12 @@ class ProSubscription(BigIntAuditBase):
             "starts_at < expires_at",
             name="check_subscription_dates"
         ),
+        # incremental refresh of the entitlement snapshot
+        Index("ix_pro_subscription_updated_at", "updated_at"),
         {"comment": "Pro subscription records"}
     )
 
-    user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), nullable=False, index=True)
     starts_at: Mapped[datetime.datetime] = mapped_column(
         DateTimeUTC(timezone=True),
         default=lambda: datetime.datetime.now(datetime.timezone.utc)
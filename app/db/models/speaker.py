@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 from advanced_alchemy.base import BigIntAuditBase
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 if TYPE_CHECKING:
@@ -11,7 +11,10 @@ if TYPE_CHECKING:
 
 class Speaker(BigIntAuditBase):
     __tablename__ = "speaker"
-    __table_args__ = {"comment": "Speakers who conduct events"}
+    __table_args__ = (
+        Index("ix_speaker_updated_at", "updated_at"),
+        {"comment": "Speakers who conduct events"}
+    )
 
     # Может быть null, если спикер регистрируется без создания аккаунта
     user_id: Mapped[int | None] = mapped_column(ForeignKey("user.id"), nullable=True)
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from advanced_alchemy.base import BigIntAuditBase
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class TableVersion(BigIntAuditBase):
+    """Bumped by a statement-level trigger on every insert and delete, see ``ETagService.TRIGGER_SQL``."""
+    __tablename__ = "table_version"
+    __table_args__ = {"comment": "Change counter per table for collection ETags"}
+
+    table_name: Mapped[str] = mapped_column(String(63), nullable=False, unique=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
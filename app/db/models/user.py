@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING
 import datetime
 from advanced_alchemy.base import BigIntAuditBase
 from advanced_alchemy.types import DateTimeUTC
-from sqlalchemy import UniqueConstraint, CheckConstraint
+from sqlalchemy import UniqueConstraint, CheckConstraint, Index, and_, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 
@@ -20,11 +20,14 @@ class User(BigIntAuditBase):
     __table_args__ = (
         UniqueConstraint("email", name="uq_user_email"),
         UniqueConstraint("telegram_id", name="uq_user_telegram"),
+        # no CURRENT_TIMESTAMP here: an expired Pro user has to stay updatable until the expiry job demotes them
         CheckConstraint(
             "(is_pro = false AND pro_expired_at IS NULL) OR "
-            "(is_pro = true AND pro_expired_at > CURRENT_TIMESTAMP)",
+            "(is_pro = true AND pro_expired_at IS NOT NULL)",
             name="check_pro_status"
         ),
+        Index("ix_user_updated_at", "updated_at"),
+        Index("ix_user_pro_expired_at", "pro_expired_at", postgresql_where="is_pro"),
         {"comment": "Users of the application"}
     )
     __pii_columns__ = {"first_name", "last_name", "email", "telegram_id", "contact_info"}
@@ -35,7 +38,7 @@ class User(BigIntAuditBase):
     email: Mapped[str | None] = mapped_column(nullable=True)
     telegram_id: Mapped[str | None] = mapped_column(nullable=True)
     contact_info: Mapped[str | None] = mapped_column(nullable=True)
-    is_pro: Mapped[bool] = mapped_column(nullable=False, default=False)
+    pro_flag: Mapped[bool] = mapped_column("is_pro", nullable=False, default=False)
     pro_expired_at: Mapped[datetime.datetime | None] = mapped_column(
         DateTimeUTC(timezone=True),
         nullable=True
@@ -60,3 +63,21 @@ class User(BigIntAuditBase):
     @hybrid_property
     def full_name(self) -> str:
         return f"{self.first_name} {self.last_name}"
+
+    @hybrid_property
+    def is_pro(self) -> bool:
+        """Pro right now; the stored flag stays set until the expiry job demotes the user."""
+        return (
+            self.pro_flag
+            and self.pro_expired_at is not None
+            and self.pro_expired_at > datetime.datetime.now(datetime.timezone.utc)
+        )
+
+    @is_pro.inplace.expression
+    @classmethod
+    def _is_pro_expression(cls):
+        return and_(cls.pro_flag, cls.pro_expired_at > func.now())
+
+    @is_pro.inplace.setter
+    def _is_pro_setter(self, value: bool) -> None:
+        self.pro_flag = value
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import datetime
+from enum import StrEnum
+from advanced_alchemy.base import BigIntAuditBase
+from advanced_alchemy.types import DateTimeUTC
+from sqlalchemy import Enum, ForeignKey, Index, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+if TYPE_CHECKING:
+    from .event import Event
+    from .user import User
+
+
+class WaitlistStatus(StrEnum):
+    WAITING = "waiting"
+    PROMOTED = "promoted"
+    CANCELLED = "cancelled"
+
+
+class WaitlistEntry(BigIntAuditBase):
+    __tablename__ = "waitlist_entry"
+    __table_args__ = (
+        UniqueConstraint("event_id", "user_id", name="uq_waitlist_event_user"),
+        # FIFO scan of the waiting entries of an event
+        Index("ix_waitlist_entry_event_waiting", "event_id", "id", postgresql_where="status = 'waiting'"),
+        {"comment": "Users queued for seats of full events"}
+    )
+
+    event_id: Mapped[int] = mapped_column(ForeignKey("event.id", ondelete="CASCADE"), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    status: Mapped[WaitlistStatus] = mapped_column(
+        Enum(WaitlistStatus, native_enum=False, length=30),
+        nullable=False,
+        default=WaitlistStatus.WAITING
+    )
+    ticket_id: Mapped[int | None] = mapped_column(ForeignKey("event_ticket.id", ondelete="SET NULL"), nullable=True)
+    promoted_at: Mapped[datetime.datetime | None] = mapped_column(DateTimeUTC(timezone=True), nullable=True)
+    payment_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
+
+    event: Mapped["Event"] = relationship(lazy="noload")
+    user: Mapped["User"] = relationship(lazy="noload")
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import datetime
+
+__all__ = ("month_start", "monthly_partition_ddl", "monthly_partitions", "partition_name")
+
+
+def month_start(value: datetime.date) -> datetime.date:
+    return value.replace(day=1)
+
+
+def _next_month(value: datetime.date) -> datetime.date:
+    return (value.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+
+
+def partition_name(table_name: str, start: datetime.date) -> str:
+    """``payment`` + 2026-10-01 -> ``payment_p202610``."""
+    return f"{table_name}_p{start:%Y%m}"
+
+
+def monthly_partitions(since: datetime.date, until: datetime.date) -> list[tuple[datetime.date, datetime.date]]:
+    """Month bounds ``[start, end)`` covering ``since``..``until`` inclusive."""
+    bounds = []
+    start = month_start(since)
+    while start <= until:
+        end = _next_month(start)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def monthly_partition_ddl(
+    table_name: str, start: datetime.date, end: datetime.date, parent: str | None = None
+) -> str:
+    """``CREATE TABLE`` for the ``[start, end)`` partition of ``table_name`` (attached to ``parent`` if given)."""
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(table_name, start)}" '
+        f"PARTITION OF \"{parent or table_name}\" FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import datetime
+from decimal import Decimal
+from typing import Annotated
+
+from litestar import Controller, get, post
+from litestar.exceptions import ClientException, NotFoundException
+from litestar.params import Parameter
+
+from app.lib.deps import create_service_provider
+from app.db.models.funnel_event import FunnelStep
+from app.domain.analytics.schemas import DailyRevenueItem, EventStatsItem, FunnelSourceItem, RevenueReport
+from app.domain.analytics.services import AnalyticsService
+from app.services.funnel.funnel_service import FunnelService
+
+
+class AnalyticsController(Controller):
+    path = "/analytics"
+    tags = ["Analytics"]
+    dependencies = {
+        "analytics_service": create_service_provider(AnalyticsService),
+    }
+
+    @get("/events/{event_id:int}", operation_id="get_event_analytics")
+    async def get_event_analytics(
+        self,
+        analytics_service: AnalyticsService,
+        event_id: Annotated[int, Parameter(title="Event ID", description="The event to report on")],
+    ) -> EventStatsItem:
+        """Precomputed counters of the event, at most ``ANALYTICS_INTERVAL`` seconds old."""
+        stats = await analytics_service.get_one_or_none(event_id=event_id)
+        if stats is None:
+            raise NotFoundException(detail="No analytics for this event yet")
+        item = analytics_service.to_schema(data=stats, schema_type=EventStatsItem)
+        if stats.tickets_total:
+            item.conversion = stats.tickets_paid / stats.tickets_total
+        return item
+
+    @get("/revenue", operation_id="get_revenue")
+    async def get_revenue(
+        self,
+        analytics_service: AnalyticsService,
+        date_from: Annotated[datetime.date, Parameter(query="from", description="First day, UTC")],
+        date_to: Annotated[datetime.date, Parameter(query="to", description="Last day, UTC, inclusive")],
+    ) -> RevenueReport:
+        """Succeeded payments per day and payment type."""
+        if date_from > date_to:
+            raise ClientException(detail="`from` is after `to`")
+        days = [
+            analytics_service.to_schema(data=day, schema_type=DailyRevenueItem)
+            for day in await analytics_service.revenue(date_from, date_to)
+        ]
+        return RevenueReport(
+            date_from=date_from,
+            date_to=date_to,
+            payments=sum(day.payments for day in days),
+            revenue=sum((day.revenue for day in days), Decimal(0)),
+            days=days,
+        )
+
+    @get("/funnel", operation_id="get_funnel")
+    async def get_funnel(
+        self,
+        analytics_service: AnalyticsService,
+        event_id: Annotated[int | None, Parameter(query="eventId", description="Only this event")] = None,
+        date_from: Annotated[datetime.date | None, Parameter(query="from", description="First day, UTC")] = None,
+        date_to: Annotated[datetime.date | None, Parameter(query="to", description="Last day, UTC, inclusive")] = None,
+    ) -> list[FunnelSourceItem]:
+        """Registration funnel by source; steps recorded in the last ``FUNNEL_FLUSH_INTERVAL_MS`` may be missing."""
+        def midnight(day: datetime.date) -> datetime.datetime:
+            return datetime.datetime.combine(day, datetime.time(), datetime.timezone.utc)
+
+        rows = await FunnelService.rollup(
+            analytics_service.repository.session,
+            event_id=event_id,
+            since=midnight(date_from) if date_from else None,
+            until=midnight(date_to + datetime.timedelta(days=1)) if date_to else None,
+        )
+        sources: dict[str, FunnelSourceItem] = {}
+        for source, step, count in rows:
+            item = sources.setdefault(source, FunnelSourceItem(source=source, steps=dict.fromkeys(FunnelStep, 0)))
+            item.steps[step] = count
+        for item in sources.values():
+            if started := item.steps[FunnelStep.REGISTRATION_STARTED]:
+                item.conversion = item.steps[FunnelStep.PAYMENT_SUCCEEDED] / started
+        return list(sources.values())
+
+    @post("/refresh", operation_id="refresh_analytics", status_code=200)
+    async def refresh_analytics(
+        self,
+        analytics_service: AnalyticsService,
+        full: Annotated[bool, Parameter(description="Recompute all events and days")] = False,
+    ) -> dict[str, int]:
+        """Bring the aggregates up to date now instead of waiting for the scheduled refresh."""
+        return await AnalyticsService.refresh(analytics_service.repository.session, full=full)
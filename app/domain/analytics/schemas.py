@@ -0,0 +1,43 @@
+import datetime
+from decimal import Decimal
+
+from app.lib.schema import CamelizedBaseStruct
+from app.db.models.payment import PaymentType
+from app.db.models.funnel_event import FunnelStep
+
+
+class EventStatsItem(CamelizedBaseStruct):
+    event_id: int
+    tickets_total: int
+    tickets_waiting: int
+    tickets_paid: int
+    tickets_refunded: int
+    tickets_expired: int
+    checked_in: int
+    revenue: Decimal
+    refunded_amount: Decimal
+    updated_at: datetime.datetime
+    # paid / all tickets
+    conversion: float = 0.0
+
+
+class DailyRevenueItem(CamelizedBaseStruct):
+    day: datetime.date
+    payment_type: PaymentType
+    payments: int
+    revenue: Decimal
+
+
+class RevenueReport(CamelizedBaseStruct):
+    date_from: datetime.date
+    date_to: datetime.date
+    payments: int
+    revenue: Decimal
+    days: list[DailyRevenueItem]
+
+
+class FunnelSourceItem(CamelizedBaseStruct):
+    source: str
+    steps: dict[FunnelStep, int]
+    # payment_succeeded / registration_started
+    conversion: float = 0.0
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING
+
+import structlog
+from advanced_alchemy.repository import (
+    SQLAlchemyAsyncRepository
+)
+from advanced_alchemy.service import (
+    SQLAlchemyAsyncRepositoryService
+)
+from sqlalchemy import Date, cast, func, or_, select, true, union, union_all
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config.settings import get_settings
+from app.db import models
+from app.db.models.event_ticket import EventTicketStatus
+from app.db.models.payment import PaymentStatus
+
+if TYPE_CHECKING:
+    from sqlalchemy import Subquery
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+__all__ = ("AnalyticsService",)
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+
+class AnalyticsService(SQLAlchemyAsyncRepositoryService[models.EventStats]):
+    """Dashboard aggregates: ``event_stats`` per event and ``daily_revenue`` per day and payment type.
+
+    A refresh recomputes only the events and days whose tickets or payments changed since the
+    previous refresh (``updated_at``, indexed), each with one ``INSERT ... SELECT ... ON CONFLICT``.
+    Archived rows are included, so counters of past events stay put after archiving.
+    """
+    class EventStatsRepository(SQLAlchemyAsyncRepository[models.EventStats]):
+        model_type = models.EventStats
+    repository_type = EventStatsRepository
+
+    logger = logger.bind(service="analytics_service")
+    # per worker; the first refresh of a worker starts from the last one written by any worker
+    _watermark: datetime.datetime | None = None
+
+    @staticmethod
+    def _tickets() -> Subquery:
+        live, archived = models.EventTicket.__table__, models.event_ticket_archive
+        return union_all(
+            select(live.c.id, live.c.event_id, live.c.status, live.c.checked_in_at),
+            select(archived.c.id, archived.c.event_id, archived.c.status, archived.c.checked_in_at),
+        ).subquery("tickets")
+
+    @staticmethod
+    def _payments() -> Subquery:
+        live, archived = models.Payment.__table__, models.payment_archive
+        return union_all(*(
+            select(table.c.ticket_id, table.c.amount, table.c.payment_type, table.c.created_at)
+            # refused payments (YooKassaService._refuse_payment) are refunded right away
+            .where(table.c.payment_status == PaymentStatus.SUCCEEDED, ~table.c.payment_metadata.has_key("refused"))
+            for table in (live, archived)
+        )).subquery("payments")
+
+    @classmethod
+    def event_stats_statement(cls, event_ids: list[int] | None):
+        """Upsert counters of ``event_ids``, of all events when ``None``."""
+        stats = models.EventStats.__table__
+        tickets, payments = cls._tickets(), cls._payments()
+
+        def count(status: EventTicketStatus):
+            return func.count().filter(tickets.c.status == status)
+
+        scope = tickets.c.event_id.in_(event_ids) if event_ids is not None else true()
+        money = (
+            select(
+                tickets.c.event_id,
+                func.coalesce(func.sum(payments.c.amount), 0).label("revenue"),
+                func.coalesce(
+                    func.sum(payments.c.amount).filter(tickets.c.status == EventTicketStatus.REFUNDED), 0
+                ).label("refunded_amount"),
+            )
+            .join(payments, payments.c.ticket_id == tickets.c.id)
+            .where(scope)
+            .group_by(tickets.c.event_id)
+            .subquery("money")
+        )
+        counters = (
+            select(
+                tickets.c.event_id,
+                func.count().label("tickets_total"),
+                count(EventTicketStatus.WAITING_PAYMENT).label("tickets_waiting"),
+                count(EventTicketStatus.PAID).label("tickets_paid"),
+                count(EventTicketStatus.REFUNDED).label("tickets_refunded"),
+                count(EventTicketStatus.EXPIRED).label("tickets_expired"),
+                func.count(tickets.c.checked_in_at).label("checked_in"),
+            )
+            .where(scope)
+            .group_by(tickets.c.event_id)
+            .subquery("counters")
+        )
+        now = func.now()
+        columns = [
+            "tickets_total", "tickets_waiting", "tickets_paid", "tickets_refunded", "tickets_expired", "checked_in",
+        ]
+        statement = insert(stats).from_select(
+            ["id", "event_id", *columns, "revenue", "refunded_amount", "created_at", "updated_at"],
+            select(
+                func.nextval(f"{stats.name}_id_seq"),
+                counters.c.event_id,
+                *(counters.c[column] for column in columns),
+                func.coalesce(money.c.revenue, 0),
+                func.coalesce(money.c.refunded_amount, 0),
+                now,
+                now,
+            ).outerjoin(money, money.c.event_id == counters.c.event_id),
+        )
+        return statement.on_conflict_do_update(
+            constraint="uq_event_stats_event",
+            set_={
+                **{column: statement.excluded[column] for column in [*columns, "revenue", "refunded_amount"]},
+                "updated_at": now,
+            },
+        )
+
+    @classmethod
+    def daily_revenue_statement(cls, days: list[datetime.date] | None):
+        """Upsert revenue of ``days``, of all days when ``None``."""
+        revenue = models.DailyRevenue.__table__
+        payments = cls._payments()
+        day = cast(func.timezone("UTC", payments.c.created_at), Date)
+        scope = true()
+        if days is not None:
+            # ranges of created_at prune payment partitions, a cast of it would not
+            scope = or_(*(
+                payments.c.created_at.between(
+                    datetime.datetime.combine(value, datetime.time(), datetime.timezone.utc),
+                    datetime.datetime.combine(value, datetime.time.max, datetime.timezone.utc),
+                )
+                for value in days
+            ))
+        now = func.now()
+        statement = insert(revenue).from_select(
+            ["id", "day", "payment_type", "payments", "revenue", "created_at", "updated_at"],
+            select(
+                func.nextval(f"{revenue.name}_id_seq"),
+                day,
+                payments.c.payment_type,
+                func.count(),
+                func.sum(payments.c.amount),
+                now,
+                now,
+            )
+            .where(scope)
+            .group_by(day, payments.c.payment_type),
+        )
+        return statement.on_conflict_do_update(
+            constraint="uq_daily_revenue_day_type",
+            set_={"payments": statement.excluded.payments, "revenue": statement.excluded.revenue, "updated_at": now},
+        )
+
+    @classmethod
+    async def refresh(cls, session: AsyncSession, full: bool = False) -> dict[str, int]:
+        """Recompute aggregates touched since the watermark, everything when ``full`` or on an empty table."""
+        ticket, payment = models.EventTicket, models.Payment
+        started_at = await session.scalar(select(func.now()))
+        since = None if full else cls._watermark
+        if since is None and not full:
+            since = await session.scalar(select(func.max(models.EventStats.updated_at)))
+        if since is not None:
+            since -= datetime.timedelta(seconds=settings.analytics.OVERLAP)
+
+        event_ids: list[int] | None = None
+        days: list[datetime.date] | None = None
+        if since is not None:
+            event_ids = list(await session.scalars(union(
+                select(ticket.event_id).where(ticket.updated_at > since),
+                select(ticket.event_id)
+                .join(payment, payment.ticket_id == ticket.id)
+                .where(payment.updated_at > since),
+            )))
+            days = list(await session.scalars(
+                select(cast(func.timezone("UTC", payment.created_at), Date))
+                .where(payment.updated_at > since)
+                .distinct()
+            ))
+
+        events = revenue_days = 0
+        if event_ids is None or event_ids:
+            events = (await session.execute(cls.event_stats_statement(event_ids))).rowcount
+        if days is None or days:
+            revenue_days = (await session.execute(cls.daily_revenue_statement(days))).rowcount
+        await session.commit()
+        cls._watermark = started_at
+        return {"events": events, "days": revenue_days}
+
+    @classmethod
+    async def run(cls, session: AsyncSession) -> None:
+        """Scheduler job: bring the aggregates up to date."""
+        refreshed = await cls.refresh(session)
+        if any(refreshed.values()):
+            await cls.logger.ainfo("Analytics refreshed", **refreshed)
+
+    async def revenue(self, date_from: datetime.date, date_to: datetime.date) -> list[models.DailyRevenue]:
+        return list(
+            await self.repository.session.scalars(
+                select(models.DailyRevenue)
+                .where(models.DailyRevenue.day.between(date_from, date_to))
+                .order_by(models.DailyRevenue.day, models.DailyRevenue.payment_type)
+            )
+        )
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Annotated
+
+from litestar import Controller, post
+from litestar.params import Parameter
+
+from app.lib.deps import create_service_provider
+from app.domain.registrations.services import EventTicketService
+from app.domain.checkin.schemas import (
+    AttendeeIndexInfo,
+    CheckInResult,
+    CheckInScan,
+    CheckInSyncResult,
+    OfflineCheckInScan,
+)
+from app.services.checkin.checkin_service import CheckInService, CheckInStatus
+
+
+class CheckInController(Controller):
+    path = "/events/{event_id:int}/check-in"
+    tags = ["Check-in"]
+    dependencies = {
+        "event_ticket_service": create_service_provider(EventTicketService),
+    }
+
+    @post("/", operation_id="check_in", status_code=200)
+    async def check_in(
+        self,
+        event_ticket_service: EventTicketService,
+        event_id: Annotated[int, Parameter(title="Event ID", description="The event being checked in")],
+        data: CheckInScan,
+    ) -> CheckInResult:
+        """Validate a scanned ticket token; repeated scans of a ticket return ``already_checked_in``."""
+        status, ticket_id = await CheckInService.check_in(event_ticket_service.repository.session, event_id, data.token)
+        return CheckInResult(status=status, ticket_id=ticket_id)
+
+    @post("/sync", operation_id="sync_check_ins", status_code=200)
+    async def sync_check_ins(
+        self,
+        event_ticket_service: EventTicketService,
+        event_id: Annotated[int, Parameter(title="Event ID", description="The event being checked in")],
+        data: list[OfflineCheckInScan],
+    ) -> CheckInSyncResult:
+        """Upload scans made while the scanner was offline, the earliest scan of a ticket is kept."""
+        session = event_ticket_service.repository.session
+        items = []
+        for scan in sorted(data, key=lambda scan: scan.scanned_at):
+            status, ticket_id = await CheckInService.check_in(session, event_id, scan.token, scan.scanned_at)
+            items.append(CheckInResult(status=status, ticket_id=ticket_id))
+        return CheckInSyncResult(
+            checked_in=sum(item.status == CheckInStatus.CHECKED_IN for item in items),
+            items=items,
+        )
+
+    @post("/preload", operation_id="preload_check_in", status_code=200)
+    async def preload_check_in(
+        self,
+        event_ticket_service: EventTicketService,
+        event_id: Annotated[int, Parameter(title="Event ID", description="The event being checked in")],
+    ) -> AttendeeIndexInfo:
+        """(Re)load the attendee index of this worker before the doors open."""
+        index = await CheckInService.preload(event_ticket_service.repository.session, event_id)
+        return AttendeeIndexInfo(event_id=event_id, tickets=len(index.ticket_ids), checked_in=sum(index.checked_in))
@@ -0,0 +1,29 @@
+import datetime
+
+from app.lib.schema import CamelizedBaseStruct
+from app.services.checkin.checkin_service import CheckInStatus
+
+
+class CheckInScan(CamelizedBaseStruct):
+    token: str
+
+
+class OfflineCheckInScan(CamelizedBaseStruct):
+    token: str
+    scanned_at: datetime.datetime
+
+
+class CheckInResult(CamelizedBaseStruct):
+    status: CheckInStatus
+    ticket_id: int | None = None
+
+
+class CheckInSyncResult(CamelizedBaseStruct):
+    checked_in: int
+    items: list[CheckInResult]
+
+
+class AttendeeIndexInfo(CamelizedBaseStruct):
+    event_id: int
+    tickets: int
+    checked_in: int
@@ -1,75 +1,139 @@
 from __future__ import annotations
 
-from http.client import HTTPException
-from typing import Annotated, TYPE_CHECKING
+from typing import Annotated, Any, Literal, TYPE_CHECKING
 
 from advanced_alchemy.service import FilterTypeT
-from litestar import Controller, get, post, delete
+from litestar import Controller, MediaType, Request, Response, get, post, delete
+from litestar.datastructures import CacheControlHeader
+from litestar.exceptions import NotFoundException, ServiceUnavailableException
 from litestar.params import Parameter
+from litestar.response import ServerSentEvent, Stream
+from litestar.serialization import encode_json
 
+from app.config.alchemy import alchemy
+from app.config.settings import get_settings
 from app.lib.deps import create_service_dependencies
 from app.domain.events.services import EventService
-from app.db.models import Event
-from app.domain.events.schemas import EventItem, CreateEvent
+from app.db.models import Event, EventMaterial, EventSpeaker, EventTicket, Speaker
+from app.domain.events.schemas import EventItem, CreateEvent, ImportEvent
+from app.services.availability.availability_service import AvailabilityService
+from app.services.bulk.bulk_service import BulkImportResult, BulkService
+from app.services.compression.compression_service import CompressionService
+from app.services.etag.etag_service import ETagService
+from app.services.export.export_service import ExportService
+from app.services.single_flight.single_flight_service import SingleFlight
 
 if TYPE_CHECKING:
     from advanced_alchemy.service.pagination import OffsetPagination
     from litestar.params import Dependency, Parameter
 
+settings = get_settings()
+
 
 class EventController(Controller):
     path = "/events"
     tags = ["Events"]
+    LOAD = [
+        Event.speakers,
+        Event.materials,
+        Event.registrations
+    ]
     dependencies = create_service_dependencies(
         EventService,
         key="event_service",
-        load=[
-            Event.speakers,
-            Event.materials,
-            Event.registrations
-        ]
+        load=LOAD
     )
 
-    @get(path="/", operation_id="get_events")
+    @get(
+        path="/",
+        operation_id="get_events",
+        cache_control=CacheControlHeader.from_header(settings.http_cache.EVENTS),
+    )
     async def get_events(
             self,
+            request: Request,
             event_service: EventService,
             filters: Annotated[list[FilterTypeT], Dependency(skip_validation=True)],
-    ) -> OffsetPagination[EventItem]:
+    ) -> Response[OffsetPagination[EventItem]]:
+        etag = await ETagService.compute(
+            event_service.repository.session, Event, EventSpeaker, Speaker, EventMaterial, EventTicket
+        )
+        if ETagService.matches(request, etag):
+            return ETagService.not_modified(etag)
+        if cached := CompressionService.cached(request, etag):
+            return cached
         results, total = await event_service.list_and_count(*filters)
-        return event_service.to_schema(
-            data=results,
-            total=total,
-            schema_type=EventItem,
-            filters=filters
+        return CompressionService.respond(
+            request,
+            etag,
+            event_service.to_schema(
+                data=results,
+                total=total,
+                schema_type=EventItem,
+                filters=filters
+            ),
         )
 
     @get("/slug/{slug:str}", operation_id="get_event_by_slug")
     async def get_event_by_slug(
         self,
-        event_service: EventService,
         slug: Annotated[str, Parameter(title="Event Slug", description="The slug of the event to retrieve")]
-    ) -> EventItem:
-        result = await event_service.get_one_or_none(slug=slug)
-        if not result:
-            raise HTTPException(status_code=404, detail="Event not found")
-        return event_service.to_schema(
-            data=result,
-            schema_type=EventItem
-        )
+    ) -> Response[EventItem]:
+        return await self._shared_item(("events/slug", slug), slug=slug)
     
     @get("/{event_id:int}", operation_id="get_event")
     async def get_event(
         self,
-        event_service: EventService,
         event_id: Annotated[int, Parameter(title="Event ID", description="The ID of the event to retrieve")]
-    ) -> EventItem:
-        result = await event_service.get_one_or_none(id=event_id)
-        if not result:
-            raise HTTPException(status_code=404, detail="Event not found")
-        return event_service.to_schema(
-            data=result,
-            schema_type=EventItem
+    ) -> Response[EventItem]:
+        return await self._shared_item(("events/id", event_id), id=event_id)
+
+    @classmethod
+    async def _shared_item(cls, key: tuple, **filters: Any) -> Response[EventItem]:
+        """One query and one encoding for all concurrent requests of the same event (launch-day bursts).
+
+        The shared read opens its own session, so no request-scoped session is opened for it.
+        """
+        async def load() -> bytes | None:
+            async with alchemy.get_session() as session:
+                event_service = EventService(session=session, load=cls.LOAD)
+                result = await event_service.get_one_or_none(**filters)
+                if result is None:
+                    return None
+                return encode_json(event_service.to_schema(data=result, schema_type=EventItem))
+
+        try:
+            body = await SingleFlight.do(key, load)
+        except TimeoutError:
+            raise ServiceUnavailableException(detail="Event is temporarily unavailable")
+        if body is None:
+            raise NotFoundException(detail="Event not found")
+        return Response(content=body, media_type=MediaType.JSON)
+
+    @get("/{event_id:int}/availability", operation_id="stream_event_availability", opt={"skip_compression": True})
+    async def stream_event_availability(
+        self,
+        event_service: EventService,
+        event_id: Annotated[int, Parameter(title="Event ID", description="The event to watch")]
+    ) -> ServerSentEvent:
+        """Seats remaining as Server-Sent Events, sent when ticket changes alter them."""
+        if not await event_service.exists(id=event_id):
+            raise NotFoundException(detail="Event not found")
+        return ServerSentEvent(AvailabilityService.stream(event_id))
+
+    @get("/{event_id:int}/attendees.csv", operation_id="export_event_attendees")
+    async def export_event_attendees(
+        self,
+        event_service: EventService,
+        event_id: Annotated[int, Parameter(title="Event ID", description="The ID of the event to export attendees of")]
+    ) -> Stream:
+        """Attendees of the event as CSV, streamed batch by batch."""
+        if not await event_service.exists(id=event_id):
+            raise NotFoundException(detail="Event not found")
+        return Stream(
+            ExportService.attendees_csv(event_id),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="event-{event_id}-attendees.csv"'},
         )
 
     @post(path="/", operation_id="create_event")
@@ -85,6 +149,18 @@ class EventController(Controller):
             schema_type=EventItem
         )
 
+    @post(path="/bulk", operation_id="bulk_import_events")
+    async def bulk_import_events(
+        self,
+        request: Request,
+        event_service: EventService,
+        mode: Annotated[Literal["create", "upsert"], Parameter(query="mode", required=False)] = "create",
+    ) -> BulkImportResult:
+        """Create (or, with ``mode=upsert``, update by title) events from a JSON array or NDJSON body."""
+        items, errors = BulkService.decode(await request.body(), request.headers.get("content-type", ""), ImportEvent)
+        results = await event_service.import_many(items, upsert=mode == "upsert")
+        return BulkImportResult.from_items(errors + results)
+
     @delete(path="/{event_id:int}", operation_id="delete_event")
     async def delete_event(
         self,
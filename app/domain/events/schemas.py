@@ -1,4 +1,5 @@
 import datetime
+from typing import Annotated
 
 import msgspec
 
@@ -52,3 +53,20 @@ class CreateEvent(BaseStruct):
     location: str | msgspec.UnsetType = msgspec.UNSET
     max_participants: int | None | msgspec.UnsetType = msgspec.UNSET
     chat_link: str | None | msgspec.UnsetType = msgspec.UNSET
+
+
+class ImportEvent(BaseStruct):
+    """Item of ``POST /events/bulk``: required fields and table checks are validated while decoding."""
+    title: Annotated[str, msgspec.Meta(min_length=1)]
+    price: Annotated[float, msgspec.Meta(ge=0)]
+    pro_price: Annotated[float, msgspec.Meta(ge=0)]
+    event_date: datetime.datetime
+    location: Annotated[str, msgspec.Meta(max_length=255)]
+    description: Annotated[str, msgspec.Meta(max_length=500)] | None = None
+    cover_url: Annotated[str, msgspec.Meta(max_length=255)] | None = None
+    max_participants: Annotated[int, msgspec.Meta(gt=0)] | None = None
+    chat_link: Annotated[str, msgspec.Meta(max_length=255)] | None = None
+
+    def __post_init__(self) -> None:
+        if self.pro_price > self.price:
+            raise ValueError("pro_price must not exceed price")
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import re
+from collections import Counter
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from advanced_alchemy.repository import (
@@ -12,13 +15,84 @@ from advanced_alchemy.service import (
     schema_dump,
 )
 from slugify import slugify
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
 
 from app.db import models
+from app.services.bulk.bulk_service import BulkItemResult, BulkItemStatus, BulkService
 
 if TYPE_CHECKING:
+    from typing import Any
+
     from advanced_alchemy.service import ModelDictT
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.domain.events.schemas import ImportEvent
+
+__all__ = ("EventService", "SlugAllocator")
+
+
+class SlugAllocator:
+    """Hands out unique event slugs from ``event_slug_counter`` in one statement per batch.
+
+    Titles map to a base slug, the n-th event with that base gets ``base-n``
+    (``base`` itself for the first one).  Bases already ending with a number are
+    always suffixed, so ``meetup-2`` from "Meetup" never clashes with "Meetup 2".
+    """
+    ENDS_WITH_NUMBER = re.compile(r"-\d+$")
+    # Run once from the revision creating event_slug_counter, continues numbering of existing slugs
+    SEED_SQL = text(r"""
+        INSERT INTO event_slug_counter (id, base, last_suffix, created_at, updated_at)
+        SELECT nextval('event_slug_counter_id_seq'), base, max(suffix), now(), now()
+        FROM (
+            SELECT
+                CASE WHEN slug ~ '-\d+$' THEN regexp_replace(slug, '-\d+$', '') ELSE slug END AS base,
+                CASE WHEN slug ~ '-\d+$' THEN substring(slug FROM '-(\d+)$')::int ELSE 1 END AS suffix
+            FROM event
+        ) AS slugs
+        GROUP BY base
+        ON CONFLICT (base) DO UPDATE SET last_suffix = greatest(event_slug_counter.last_suffix, excluded.last_suffix)
+    """)
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def base_for(title: str) -> str:
+        """``slugify`` is comparatively slow and event titles repeat a lot."""
+        return slugify(text=title)
+
+    @classmethod
+    def format(cls, base: str, suffix: int) -> str:
+        if suffix == 1 and not cls.ENDS_WITH_NUMBER.search(base):
+            return base
+        return f"{base}-{suffix}"
+
+    @classmethod
+    async def allocate(cls, session: AsyncSession, titles: list[str]) -> list[str]:
+        """Reserve one slug per title, in order."""
+        if not titles:
+            return []
+        bases = [cls.base_for(title) for title in titles]
+        counts = Counter(bases)
 
-__all__ = ("EventService",)
+        statement = insert(models.EventSlugCounter).values([
+            # sorted, so concurrent batches lock counter rows in the same order
+            {"base": base, "last_suffix": count} for base, count in sorted(counts.items())
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=[models.EventSlugCounter.base],
+            set_={
+                "last_suffix": models.EventSlugCounter.last_suffix + statement.excluded.last_suffix,
+                "updated_at": func.now(),
+            },
+        ).returning(models.EventSlugCounter.base, models.EventSlugCounter.last_suffix)
+        last = dict((await session.execute(statement)).tuples().all())
+
+        next_suffix = {base: last[base] - count + 1 for base, count in counts.items()}
+        slugs = []
+        for base in bases:
+            slugs.append(cls.format(base, next_suffix[base]))
+            next_suffix[base] += 1
+        return slugs
 
 
 class EventService(SQLAlchemyAsyncRepositoryService[models.Event]):
@@ -33,14 +107,55 @@ class EventService(SQLAlchemyAsyncRepositoryService[models.Event]):
         return await self._populate_slug(data)
     
     async def to_model_on_update(self, data: ModelDictT[models.Event]) -> ModelDictT[models.Event]:
-        data = schema_dump(data)
-        return await self._populate_slug(data)
+        # the slug is kept when the title changes: allocating would move the event's URL on every edit
+        return schema_dump(data)
     
     async def to_model_on_upsert(self, data: ModelDictT[models.Event]) -> ModelDictT[models.Event]:
         data = schema_dump(data)
+        if is_dict_with_field(data, "title") and await self.repository.session.scalar(
+            select(models.Event.id).where(models.Event.title == data["title"]).limit(1)
+        ) is not None:
+            # matched by title (``match_fields``): an update, the event keeps its slug
+            return data
         return await self._populate_slug(data)
 
     async def _populate_slug(self, data: ModelDictT[models.Event]) -> ModelDictT[models.Event]:
         if is_dict_without_field(data, "slug") and is_dict_with_field(data, "title"):
-            data["slug"] = slugify(text=data["title"])
+            [data["slug"]] = await SlugAllocator.allocate(self.repository.session, [data["title"]])
         return data
+
+    async def import_many(
+        self, items: list[tuple[int, ImportEvent]], upsert: bool = False
+    ) -> list[BulkItemResult]:
+        """Create events in one multi-row insert; with ``upsert`` events matched by title are updated."""
+        session = self.repository.session
+        rows = [(index, item.to_dict()) for index, item in items]
+
+        existing: dict[str, int] = {}
+        if upsert and rows:
+            titles = {row["title"] for _, row in rows}
+            existing = dict((await session.execute(
+                select(models.Event.title, models.Event.id).where(models.Event.title.in_(titles))
+            )).tuples().all())
+
+        to_update = [(index, {**row, "id": existing[row["title"]]}) for index, row in rows if row["title"] in existing]
+        to_create = [(index, row) for index, row in rows if row["title"] not in existing]
+
+        await self._populate_slugs([row for _, row in to_create])
+        ids = await BulkService.insert_many(session, models.Event, [row for _, row in to_create])
+        await BulkService.update_many(session, models.Event, [row for _, row in to_update])
+
+        return [
+            BulkItemResult(index=index, status=BulkItemStatus.CREATED, id=id_)
+            for (index, _), id_ in zip(to_create, ids)
+        ] + [
+            BulkItemResult(index=index, status=BulkItemStatus.UPDATED, id=row["id"])
+            for index, row in to_update
+        ]
+
+    async def _populate_slugs(self, rows: list[dict[str, Any]]) -> None:
+        """Assign unique slugs to a batch with a single allocation statement."""
+        rows = [row for row in rows if "slug" not in row]
+        slugs = await SlugAllocator.allocate(self.repository.session, [row["title"] for row in rows])
+        for row, slug in zip(rows, slugs):
+            row["slug"] = slug
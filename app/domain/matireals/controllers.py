@@ -3,16 +3,30 @@ from __future__ import annotations
 from typing import Annotated, TYPE_CHECKING
 
 from advanced_alchemy.service import FilterTypeT
-from litestar import Controller, get, post, delete, patch
+from litestar import Controller, Request, Response, get, post, delete, patch
+from litestar.datastructures import CacheControlHeader
 
+from app.config.settings import get_settings
+from app.db.models import EventMaterial
 from app.lib.deps import create_service_dependencies
 from app.domain.matireals.services import EventMaterialService
-from app.domain.matireals.schemas import CreateEventMaterial, EventMaterialItem, UpdateEventMaterial
+from app.domain.matireals.schemas import (
+    CreateEventMaterial,
+    EventMaterialItem,
+    ImportEventMaterial,
+    UpdateEventMaterial,
+)
+from app.services.bulk.bulk_service import BulkImportResult, BulkService
+from app.services.compression.compression_service import CompressionService
+from app.services.entitlement.entitlement_service import EntitlementService
+from app.services.etag.etag_service import ETagService
 
 if TYPE_CHECKING:
     from advanced_alchemy.service.pagination import OffsetPagination
     from litestar.params import Dependency, Parameter
 
+settings = get_settings()
+
 
 class EventMaterialController(Controller):
     tags = ["Event Materials"]
@@ -21,18 +35,41 @@ class EventMaterialController(Controller):
         key="event_material_service"
     )
 
-    @get("/materials", operation_id="get_event_materials")
+    @get(
+        "/materials",
+        operation_id="get_event_materials",
+        cache_control=CacheControlHeader.from_header(settings.http_cache.MATERIALS),
+    )
     async def get_event_materials(
             self,
+            request: Request,
             event_material_service: EventMaterialService,
             filters: Annotated[list[FilterTypeT], Dependency(skip_validation=True)],
-    ) -> OffsetPagination[EventMaterialItem]:
+            user_id: Annotated[
+                int | None,
+                Parameter(query="userId", required=False, description="Pro users also see pro-only materials")
+            ] = None,
+    ) -> Response[OffsetPagination[EventMaterialItem]]:
+        session = event_material_service.repository.session
+        await EntitlementService.ensure_loaded(session)
+        is_pro = EntitlementService.is_pro(user_id)
+        etag = await ETagService.compute(session, EventMaterial, variant="pro" if is_pro else "")
+        if ETagService.matches(request, etag):
+            return ETagService.not_modified(etag)
+        if cached := CompressionService.cached(request, etag):
+            return cached
+        if not is_pro:
+            filters = [*filters, EventMaterial.is_pro_only.is_(False)]
         results, total = await event_material_service.list_and_count(*filters)
-        return event_material_service.to_schema(
-            data=results,
-            total=total,
-            schema_type=EventMaterialItem,
-            filters=filters
+        return CompressionService.respond(
+            request,
+            etag,
+            event_material_service.to_schema(
+                data=results,
+                total=total,
+                schema_type=EventMaterialItem,
+                filters=filters
+            ),
         )
 
     @post("/materials", operation_id="create_event_material")
@@ -48,6 +85,19 @@ class EventMaterialController(Controller):
             schema_type=EventMaterialItem
         )
 
+    @post("/materials/bulk", operation_id="bulk_import_event_materials")
+    async def bulk_import_event_materials(
+        self,
+        request: Request,
+        event_material_service: EventMaterialService,
+    ) -> BulkImportResult:
+        """Create event materials from a JSON array or NDJSON body."""
+        items, errors = BulkService.decode(
+            await request.body(), request.headers.get("content-type", ""), ImportEventMaterial
+        )
+        results = await event_material_service.import_many(items)
+        return BulkImportResult.from_items(errors + results)
+
     @patch("/materials/{material_id:int}", operation_id="update_event_material")
     async def update_event_material(
         self,
@@ -1,3 +1,5 @@
+from typing import Annotated
+
 import msgspec
 
 from app.lib.schema import CamelizedBaseStruct
@@ -22,4 +24,10 @@ class UpdateEventMaterial(CamelizedBaseStruct):
     title: str | None
     url: str | None
     is_pro_only: bool | None
-    
\ No newline at end of file
+    
+
+class ImportEventMaterial(CamelizedBaseStruct):
+    title: Annotated[str, msgspec.Meta(min_length=1)]
+    url: Annotated[str, msgspec.Meta(max_length=255)]
+    event_id: int
+    is_pro_only: bool = False
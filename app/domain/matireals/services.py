@@ -9,11 +9,16 @@ from advanced_alchemy.service import (
     SQLAlchemyAsyncRepositoryService
 )
 
+from sqlalchemy import select
+
 from app.db import models
+from app.services.bulk.bulk_service import BulkItemResult, BulkItemStatus, BulkService
 
 if TYPE_CHECKING:
     from advanced_alchemy.service import ModelDictT
 
+    from app.domain.matireals.schemas import ImportEventMaterial
+
 __all__ = ("EventMaterialService",)
 
 
@@ -21,4 +26,24 @@ class EventMaterialService(SQLAlchemyAsyncRepositoryService[models.EventMaterial
     class EventMaterialRepository(SQLAlchemyAsyncRepository[models.EventMaterial]):
         model_type = models.EventMaterial
     repository_type = EventMaterialRepository
-    
\ No newline at end of file
+
+    async def import_many(self, items: list[tuple[int, ImportEventMaterial]]) -> list[BulkItemResult]:
+        """Create materials in one multi-row insert, rejecting items with unknown ``event_id``."""
+        session = self.repository.session
+        event_ids = {item.event_id for _, item in items}
+        known = set(await session.scalars(select(models.Event.id).where(models.Event.id.in_(event_ids)))) if event_ids else set()
+
+        results: list[BulkItemResult] = []
+        to_create = []
+        for index, item in items:
+            if item.event_id not in known:
+                results.append(BulkItemResult(index=index, status=BulkItemStatus.ERROR, error="Event not found"))
+            else:
+                to_create.append((index, item.to_dict()))
+
+        ids = await BulkService.insert_many(session, models.EventMaterial, [row for _, row in to_create])
+        results.extend(
+            BulkItemResult(index=index, status=BulkItemStatus.CREATED, id=id_)
+            for (index, _), id_ in zip(to_create, ids)
+        )
+        return results
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import datetime
+from typing import Annotated
+
+from litestar import Controller, get
+from litestar.params import Parameter
+from litestar.response import Stream
+
+from app.services.export.export_service import ExportService
+
+
+class PaymentExportController(Controller):
+    path = "/payments"
+    tags = ["Payments"]
+
+    @get("/export.ndjson", operation_id="export_payments")
+    async def export_payments(
+        self,
+        created_after: Annotated[datetime.datetime | None, Parameter(query="createdAfter", required=False)] = None,
+        created_before: Annotated[datetime.datetime | None, Parameter(query="createdBefore", required=False)] = None,
+        event_id: Annotated[int | None, Parameter(query="eventId", required=False)] = None,
+    ) -> Stream:
+        """Payments as newline delimited JSON, streamed batch by batch."""
+        return Stream(
+            ExportService.payments_ndjson(
+                created_after=created_after,
+                created_before=created_before,
+                event_id=event_id,
+            ),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": 'attachment; filename="payments.ndjson"'},
+        )
@@ -3,7 +3,9 @@ from litestar import Controller, post
 from app.domain.events.services import EventService
 from app.domain.payments.services import PaymentService
 from app.domain.registrations.services import EventTicketService
+from app.domain.waitlist.services import WaitlistService
 from app.lib.deps import create_service_provider
+from app.server import rate_limit
 from app.services.yookassa import YooKassaService
 
 
@@ -14,15 +16,17 @@ class WebhookController(Controller):
     dependencies = {
         "event_ticket_service": create_service_provider(EventTicketService),
         "event_service": create_service_provider(EventService),
-        "payment_service": create_service_provider(PaymentService)
+        "payment_service": create_service_provider(PaymentService),
+        "waitlist_service": create_service_provider(WaitlistService)
     }
 
-    @post(operation_id="new_payment")
+    @post(operation_id="new_payment", middleware=[rate_limit.webhook])
     async def new_payment(
             self,
             event_ticket_service: EventTicketService,
             event_service: EventService,
             payment_service: PaymentService,
+            waitlist_service: WaitlistService,
             data: dict
     ) -> None:
         if data["event"] == "payment.succeeded":
@@ -32,4 +36,8 @@ class WebhookController(Controller):
                 payment_service,
                 data
             )
+        if data["event"] == "refund.succeeded":
+            event_id = await YooKassaService.refund_succeeded(event_ticket_service, payment_service, data)
+            if event_id is not None:
+                await waitlist_service.promote(event_id)
 
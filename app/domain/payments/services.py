@@ -8,6 +8,7 @@ from advanced_alchemy.repository import (
 from advanced_alchemy.service import (
     SQLAlchemyAsyncRepositoryService
 )
+from sqlalchemy import func, select
 
 from app.db import models
 
@@ -21,4 +22,18 @@ class PaymentService(SQLAlchemyAsyncRepositoryService[models.Payment]):
     class PaymentRepository(SQLAlchemyAsyncRepository[models.Payment]):
         model_type = models.Payment
     repository_type = PaymentRepository
-    
\ No newline at end of file
+
+    async def record(self, data: ModelDictT[models.Payment]) -> bool:
+        """Store a YooKassa payment once: repeated notifications of ``yookassa_id`` are skipped.
+
+        ``payment`` is partitioned by ``created_at``, so ``yookassa_id`` cannot be unique;
+        concurrent notifications of one payment are serialized by an advisory lock instead.
+        Returns whether the payment was stored.
+        """
+        session = self.repository.session
+        yookassa_id = data["yookassa_id"]
+        await session.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"payment:{yookassa_id}"))))
+        if await self.exists(yookassa_id=yookassa_id):
+            return False
+        await self.create(data=data)
+        return True
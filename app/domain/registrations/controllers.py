@@ -2,28 +2,40 @@ from __future__ import annotations
 
 from typing import Annotated, TYPE_CHECKING
 
-from litestar import Controller, post
+from litestar import Controller, Response, get, post
+from litestar.exceptions import ClientException, NotFoundException
 from litestar.params import Body
 from litestar.openapi.spec import Example
 from litestar.di import Provide
 
+from app.config.settings import get_settings
 from app.lib.deps import create_service_provider
 from app.domain.registrations.services import EventTicketService
 from app.db.models import EventTicket
 from app.domain.registrations.schemas \
     import UnregisteredUserRegistrationSchema, \
+        RegisteredUserRegistrationSchema, \
         RegistrationResponseSchema
 from app.db.models.user import User
 from app.db.models.event import Event
 from app.domain.accounts.services import UserService
 from app.domain.events.services import EventService
 from app.services.yookassa import YooKassaClient, Payment, CreatePayment, Amount, Confirmation
+from app.services.yookassa.models.payment import PaymentStatus as YooKassaPaymentStatus
 from app.db.models.event_ticket import EventTicketStatus
+from app.services.checkin.checkin_service import TicketToken
+from app.services.entitlement.entitlement_service import EntitlementService
+from app.services.funnel.funnel_service import FunnelService
+from app.db.models.funnel_event import FunnelStep
+from app.services.qr.qr_service import QrService
+from app.server import rate_limit
 
 if TYPE_CHECKING:
     from advanced_alchemy.service.pagination import OffsetPagination
     from litestar.params import Dependency, Parameter
 
+settings = get_settings()
+
 
 class RegistrationController(Controller):
     tags = ["Registrations"]
@@ -42,12 +54,11 @@ class RegistrationController(Controller):
         )
     }
 
-    @post("/register/unregistered")
+    @post("/register/unregistered", middleware=[rate_limit.registration])
     async def register_unregistered(
         self,
         event_ticket_service: EventTicketService,
         user_service: UserService,
-        event_service: EventService,
         data: Annotated[
             UnregisteredUserRegistrationSchema, 
             Body(
@@ -67,49 +78,120 @@ class RegistrationController(Controller):
             )
         ]
     ) -> RegistrationResponseSchema:
-        # 1. Создаем пользователя
-        user = await user_service.create({
-            "email": data.email,
-            "first_name": data.first_name,
-            "last_name": data.last_name,
-            "contact_info": data.contact_info
-        })
-        
-        # Получаем событие по id
-        event = await event_service.get_one(
-            id=data.event_id
-        )
-        
-        # 2. Создаем билет
-        ticket = await event_ticket_service.create({
-            "event_id": event.id,
-            "user_id": user.id,
-            "status": EventTicketStatus.WAITING_PAYMENT,
-            "amount_paid": event.price
-        })
-        
-        # 3. Создаем платеж и получаем ссылку на оплату
+        # 1. Находим пользователя по email (повторная попытка) или создаем
+        user = await user_service.get_one_or_none(email=data.email)
+        if user is None:
+            user = await user_service.create({
+                "email": data.email,
+                "first_name": data.first_name,
+                "last_name": data.last_name,
+                "contact_info": data.contact_info
+            })
+
+        # 2. Билет (Pro-пользователи платят pro_price) и ссылка на оплату
+        return await self._checkout(event_ticket_service, user.id, data.event_id, data.source)
+
+    @post("/register/registered", middleware=[rate_limit.registration])
+    async def register_registered(
+        self,
+        event_ticket_service: EventTicketService,
+        data: Annotated[
+            RegisteredUserRegistrationSchema,
+            Body(
+                examples=[
+                    Example(
+                        description="Регистрация существующего пользователя (например, из Telegram-бота)",
+                        value=RegisteredUserRegistrationSchema(user_id=1, event_id=5, source="telegram")
+                    )
+                ]
+            )
+        ]
+    ) -> RegistrationResponseSchema:
+        """Ticket for an existing user; repeated calls return the payment link of the unpaid ticket."""
+        return await self._checkout(event_ticket_service, data.user_id, data.event_id, data.source)
+
+    async def _checkout(
+        self, event_ticket_service: EventTicketService, user_id: int, event_id: int, source: str
+    ) -> RegistrationResponseSchema:
+        """Issue or reuse the ticket and return its payment link.
+
+        A stored link is returned without calling YooKassa. Past its TTL the stored payment
+        is looked up and reused while it is still pending; only a cancelled one is replaced.
+        A new payment is created with an idempotence key of the ticket revision, so a retry
+        after a lost response gets the same payment instead of a second one.
+        """
+        await EntitlementService.ensure_loaded(event_ticket_service.repository.session)
+        is_pro = EntitlementService.is_pro(user_id)
+        reservation = await event_ticket_service.reserve(user_id, event_id, is_pro)
+        if reservation is not None and reservation.user_found and reservation.ticket_id is None:
+            # a concurrent registration of the same user committed after our snapshot
+            reservation = await event_ticket_service.reserve(user_id, event_id, is_pro)
+        if reservation is None or not reservation.user_found:
+            raise NotFoundException(detail="Event or user not found")
+        if reservation.status == EventTicketStatus.PAID:
+            raise ClientException(status_code=409, detail="User already has a paid ticket for this event")
+        if reservation.payment_url:
+            return RegistrationResponseSchema(payment_url=reservation.payment_url)
+        if reservation.yookassa_payment_id:
+            # the stored link expired here, not necessarily in YooKassa: a payment still open
+            # is handed out again, so the user never holds two payable links for one ticket
+            previous = await YooKassaClient.get_payment(reservation.yookassa_payment_id)
+            if previous.status in (YooKassaPaymentStatus.WAITING_FOR_CAPTURE, YooKassaPaymentStatus.SUCCEEDED):
+                raise ClientException(status_code=409, detail="The ticket payment is being processed")
+            payment_url = (previous.confirmation or {}).get("confirmation_url")
+            if previous.status == YooKassaPaymentStatus.PENDING and payment_url:
+                await event_ticket_service.attach_payment(reservation.ticket_id, previous.id, payment_url)
+                return RegistrationResponseSchema(payment_url=payment_url)
+
+        funnel = {"event_id": event_id, "user_id": user_id, "ticket_id": reservation.ticket_id}
+        FunnelService.record(FunnelStep.REGISTRATION_STARTED, source, **funnel)
         payment: Payment = await YooKassaClient.create_payment(
             payment=CreatePayment(
                 amount=Amount(
-                    value=float(event.price),
+                    value=float(reservation.amount_paid),
                     currency="RUB"
                 ),
                 confirmation=Confirmation(
                     type="redirect",
-                    return_url="https://example.com"
+                    return_url=settings.yookassa.RETURN_URL or "https://example.com"
                 ),
                 save_payment_method=False,
                 capture=True,
-                description=f"Оплата участия в мероприятии {event.title}",
+                description=f"Оплата участия в мероприятии {reservation.title}",
                 metadata={
-                    "ticket_id": str(ticket.id),
-                    "event_id": str(event.id),
-                    "user_id": str(user.id),
-                    "source": data.source
+                    "ticket_id": str(reservation.ticket_id),
+                    "event_id": str(event_id),
+                    "user_id": str(user_id),
+                    "source": source
                 }
-            )
+            ),
+            idempotence_key=YooKassaClient.idempotence_key(
+                "ticket", reservation.ticket_id, reservation.revision.isoformat(), reservation.amount_paid
+            ),
+        )
+        FunnelService.record(FunnelStep.PAYMENT_CREATED, source, **funnel)
+        await event_ticket_service.attach_payment(
+            reservation.ticket_id, payment.id, payment.confirmation["confirmation_url"]
         )
-        
         return RegistrationResponseSchema(payment_url=payment.confirmation["confirmation_url"])
-        
\ No newline at end of file
+
+
+class TicketController(Controller):
+    path = "/tickets"
+    tags = ["Registrations"]
+
+    @get("/{ticket_id:int}/qr.png", operation_id="get_ticket_qr", opt={"skip_compression": True})
+    async def get_ticket_qr(
+        self,
+        ticket_id: Annotated[int, Parameter(title="Ticket ID", description="The ticket to render")],
+        token: Annotated[str, Parameter(query="token", description="Check-in token of the ticket")],
+    ) -> Response[bytes]:
+        """QR code of the ticket check-in token; the token itself authorizes the download."""
+        verified = TicketToken.verify(token)
+        if verified is None or verified[1] != ticket_id:
+            raise NotFoundException(detail="Ticket not found")
+        return Response(
+            await QrService.ticket_png(*verified),
+            media_type="image/png",
+            headers={"Cache-Control": "private, max-age=86400, immutable"},
+        )
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import datetime
 from typing import TYPE_CHECKING
 
 from advanced_alchemy.repository import (
@@ -8,16 +9,142 @@ from advanced_alchemy.repository import (
 from advanced_alchemy.service import (
     SQLAlchemyAsyncRepositoryService,
 )
-    
+from sqlalchemy import case, exists, func, literal, or_, select, true, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config.settings import get_settings
 from app.db import models
+from app.db.models.event_ticket import EventTicketStatus
 
 if TYPE_CHECKING:
     from advanced_alchemy.service import ModelDictT
+    from sqlalchemy.engine import Row
 
 __all__ = ("EventTicketService",)
 
+settings = get_settings()
+
 
 class EventTicketService(SQLAlchemyAsyncRepositoryService[models.EventTicket]):
     class EventTicketRepository(SQLAlchemyAsyncRepository[models.EventTicket]):
         model_type = models.EventTicket
     repository_type = EventTicketRepository
+
+    @classmethod
+    def reservation_statement(cls, user_id: int, event_id: int, is_pro: bool):
+        """Check the user and the event and issue a ticket in one round trip.
+
+        Returns no row for a missing event. A refunded or expired ticket of the user is
+        reissued; an unpaid or paid one is returned as is, with its stored payment link while
+        it is valid and its YooKassa payment id. ``revision`` changes whenever the ticket is
+        reissued or gets a new link.
+        """
+        user, event, ticket = models.User.__table__, models.Event.__table__, models.EventTicket.__table__
+        now = func.now()
+        users = select(user.c.id).where(user.c.id == user_id).cte("users")
+        events = select(event.c.id, event.c.title).where(event.c.id == event_id).cte("events")
+        existing = (
+            select(
+                ticket.c.id,
+                ticket.c.status,
+                ticket.c.amount_paid,
+                ticket.c.updated_at,
+                case((ticket.c.payment_url_expires_at > now, ticket.c.payment_url)).label("payment_url"),
+                ticket.c.yookassa_payment_id,
+            )
+            .where(ticket.c.event_id == event_id, ticket.c.user_id == user_id)
+            .cte("existing")
+        )
+        issue = insert(ticket).from_select(
+            ["id", "event_id", "user_id", "amount_paid", "status", "reserved_at", "created_at", "updated_at"],
+            select(
+                func.nextval(f"{ticket.name}_id_seq"),
+                event.c.id,
+                users.c.id,
+                case((literal(is_pro), event.c.pro_price), else_=event.c.price),
+                literal(EventTicketStatus.WAITING_PAYMENT, ticket.c.status.type),
+                now,
+                now,
+                now,
+            ).select_from(users).join(event, event.c.id == event_id),
+        )
+        issued = (
+            issue.on_conflict_do_update(
+                constraint="uq_event_user",
+                set_={
+                    "status": issue.excluded.status,
+                    "amount_paid": issue.excluded.amount_paid,
+                    "reserved_at": now,
+                    "checked_in_at": None,
+                    "yookassa_payment_id": None,
+                    "payment_url": None,
+                    "payment_url_expires_at": None,
+                    "updated_at": now,
+                },
+                where=ticket.c.status.in_((EventTicketStatus.REFUNDED, EventTicketStatus.EXPIRED)),
+            )
+            .returning(ticket.c.id, ticket.c.status, ticket.c.amount_paid, ticket.c.updated_at)
+            .cte("issued")
+        )
+        return (
+            select(
+                events.c.title,
+                exists(select(users.c.id)).label("user_found"),
+                func.coalesce(issued.c.id, existing.c.id).label("ticket_id"),
+                func.coalesce(issued.c.status, existing.c.status).label("status"),
+                func.coalesce(issued.c.amount_paid, existing.c.amount_paid).label("amount_paid"),
+                func.coalesce(issued.c.updated_at, existing.c.updated_at).label("revision"),
+                case((issued.c.id.is_(None), existing.c.payment_url)).label("payment_url"),
+                case((issued.c.id.is_(None), existing.c.yookassa_payment_id)).label("yookassa_payment_id"),
+            )
+            .select_from(events)
+            .outerjoin(issued, true())
+            .outerjoin(existing, true())
+        )
+
+    async def reserve(self, user_id: int, event_id: int, is_pro: bool) -> Row | None:
+        """Issue or find the ticket of the user; committed, so the payment call holds no row lock."""
+        session = self.repository.session
+        row = (await session.execute(self.reservation_statement(user_id, event_id, is_pro))).one_or_none()
+        await session.commit()
+        return row
+
+    async def attach_payment(self, ticket_id: int, yookassa_payment_id: str, payment_url: str) -> None:
+        """Store the link handed out to retries for ``YOOKASSA_PAYMENT_LINK_TTL`` seconds."""
+        now = func.now()
+        await self.repository.session.execute(
+            update(models.EventTicket.__table__)
+            .where(models.EventTicket.__table__.c.id == ticket_id)
+            .values(
+                yookassa_payment_id=yookassa_payment_id,
+                payment_url=payment_url,
+                payment_url_expires_at=now + datetime.timedelta(seconds=settings.yookassa.PAYMENT_LINK_TTL),
+                updated_at=now,
+            )
+        )
+
+    async def mark_paid(self, ticket_id: int, yookassa_payment_id: str, amount_paid: str) -> bool:
+        """Move an unpaid ticket to PAID by this payment; ``False`` when nothing changed.
+
+        Nothing changes for a ticket already paid (a repeated notification), a reservation
+        that expired or was refunded meanwhile (the seat may be with the waitlist already), or
+        a ticket holding another payment. Checked in the UPDATE itself, so a payment racing the
+        expiry job or a second payment cannot take the seat.
+        """
+        ticket = models.EventTicket.__table__
+        result = await self.repository.session.execute(
+            update(ticket)
+            .where(
+                ticket.c.id == ticket_id,
+                ticket.c.status == EventTicketStatus.WAITING_PAYMENT,
+                or_(ticket.c.yookassa_payment_id.is_(None), ticket.c.yookassa_payment_id == yookassa_payment_id),
+            )
+            .values(
+                status=EventTicketStatus.PAID,
+                amount_paid=amount_paid,
+                yookassa_payment_id=yookassa_payment_id,
+                updated_at=func.now(),
+            )
+            .returning(ticket.c.id)
+        )
+        return result.first() is not None
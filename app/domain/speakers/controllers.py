@@ -3,16 +3,24 @@ from __future__ import annotations
 from typing import Annotated, TYPE_CHECKING
 
 from advanced_alchemy.service import FilterTypeT
-from litestar import Controller, get, post, delete, patch
+from litestar import Controller, Request, Response, get, post, delete, patch
+from litestar.datastructures import CacheControlHeader
 
+from app.config.settings import get_settings
+from app.db.models import Speaker
 from app.lib.deps import create_service_dependencies
 from app.domain.speakers.services import SpeakerService
-from app.domain.speakers.schemas import CreateSpeaker, SpeakerItem, UpdateSpeaker
+from app.domain.speakers.schemas import CreateSpeaker, ImportSpeaker, SpeakerItem, UpdateSpeaker
+from app.services.bulk.bulk_service import BulkImportResult, BulkService
+from app.services.compression.compression_service import CompressionService
+from app.services.etag.etag_service import ETagService
 
 if TYPE_CHECKING:
     from advanced_alchemy.service.pagination import OffsetPagination
     from litestar.params import Dependency, Parameter
 
+settings = get_settings()
+
 
 class SpeakerController(Controller):
     tags = ["Speakers"]
@@ -21,18 +29,32 @@ class SpeakerController(Controller):
         key="speaker_service"
     )
 
-    @get("/speakers", operation_id="get_speakers")
+    @get(
+        "/speakers",
+        operation_id="get_speakers",
+        cache_control=CacheControlHeader.from_header(settings.http_cache.SPEAKERS),
+    )
     async def get_speakers(
             self,
+            request: Request,
             speaker_service: SpeakerService,
             filters: Annotated[list[FilterTypeT], Dependency(skip_validation=True)],
-    ) -> OffsetPagination[SpeakerItem]:
+    ) -> Response[OffsetPagination[SpeakerItem]]:
+        etag = await ETagService.compute(speaker_service.repository.session, Speaker)
+        if ETagService.matches(request, etag):
+            return ETagService.not_modified(etag)
+        if cached := CompressionService.cached(request, etag):
+            return cached
         results, total = await speaker_service.list_and_count(*filters)
-        return speaker_service.to_schema(
-            data=results,
-            total=total,
-            schema_type=SpeakerItem,
-            filters=filters
+        return CompressionService.respond(
+            request,
+            etag,
+            speaker_service.to_schema(
+                data=results,
+                total=total,
+                schema_type=SpeakerItem,
+                filters=filters
+            ),
         )
 
     @post("/speakers", operation_id="create_speaker")
@@ -48,6 +70,17 @@ class SpeakerController(Controller):
             schema_type=SpeakerItem
         )
 
+    @post("/speakers/bulk", operation_id="bulk_import_speakers")
+    async def bulk_import_speakers(
+        self,
+        request: Request,
+        speaker_service: SpeakerService,
+    ) -> BulkImportResult:
+        """Create speakers from a JSON array or NDJSON body."""
+        items, errors = BulkService.decode(await request.body(), request.headers.get("content-type", ""), ImportSpeaker)
+        results = await speaker_service.import_many(items)
+        return BulkImportResult.from_items(errors + results)
+
     @patch("/speakers/{speaker_id:int}", operation_id="update_speaker")
     async def update_speaker(
         self,
@@ -1,3 +1,5 @@
+from typing import Annotated
+
 import msgspec
 
 from app.lib.schema import CamelizedBaseStruct
@@ -23,4 +25,10 @@ class UpdateSpeaker(CamelizedBaseStruct):
     description: str | None
     contacts: str | None
     user_id: int | None
-    
\ No newline at end of file
+    
+
+class ImportSpeaker(CamelizedBaseStruct):
+    name: Annotated[str, msgspec.Meta(min_length=1)]
+    description: Annotated[str, msgspec.Meta(max_length=500)] | None = None
+    user_id: int | None = None
+    contacts: Annotated[str, msgspec.Meta(max_length=500)] | None = None
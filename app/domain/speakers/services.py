@@ -9,11 +9,16 @@ from advanced_alchemy.service import (
     SQLAlchemyAsyncRepositoryService
 )
 
+from sqlalchemy import select
+
 from app.db import models
+from app.services.bulk.bulk_service import BulkItemResult, BulkItemStatus, BulkService
 
 if TYPE_CHECKING:
     from advanced_alchemy.service import ModelDictT
 
+    from app.domain.speakers.schemas import ImportSpeaker
+
 __all__ = ("SpeakerService",)
 
 
@@ -21,4 +26,24 @@ class SpeakerService(SQLAlchemyAsyncRepositoryService[models.Speaker]):
     class SpeakerRepository(SQLAlchemyAsyncRepository[models.Speaker]):
         model_type = models.Speaker
     repository_type = SpeakerRepository
-    
\ No newline at end of file
+
+    async def import_many(self, items: list[tuple[int, ImportSpeaker]]) -> list[BulkItemResult]:
+        """Create speakers in one multi-row insert, rejecting items with unknown ``user_id``."""
+        session = self.repository.session
+        user_ids = {item.user_id for _, item in items if item.user_id is not None}
+        known = set(await session.scalars(select(models.User.id).where(models.User.id.in_(user_ids)))) if user_ids else set()
+
+        results: list[BulkItemResult] = []
+        to_create = []
+        for index, item in items:
+            if item.user_id is not None and item.user_id not in known:
+                results.append(BulkItemResult(index=index, status=BulkItemStatus.ERROR, error="User not found"))
+            else:
+                to_create.append((index, item.to_dict()))
+
+        ids = await BulkService.insert_many(session, models.Speaker, [row for _, row in to_create])
+        results.extend(
+            BulkItemResult(index=index, status=BulkItemStatus.CREATED, id=id_)
+            for (index, _), id_ in zip(to_create, ids)
+        )
+        return results
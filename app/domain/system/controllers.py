@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from litestar import Controller, MediaType, get
+
+from app.services.http.http_client import HttpClient
+from app.services.http.tracing import HttpMetrics
+
+
+class MetricsController(Controller):
+    path = "/metrics"
+    tags = ["System"]
+
+    @get("/", operation_id="get_metrics", media_type=MediaType.TEXT, include_in_schema=False)
+    async def get_metrics(self) -> str:
+        """Upstream HTTP call metrics of this worker in the Prometheus text format."""
+        return HttpMetrics.render(pool=HttpClient.pool_state())
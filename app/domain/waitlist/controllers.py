@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from typing import Annotated
+
+from advanced_alchemy.filters import OrderBy
+from litestar import Controller, delete, get, post
+from litestar.exceptions import ClientException, NotFoundException
+from litestar.params import Parameter
+from sqlalchemy import func, select
+
+from app.lib.deps import create_service_provider
+from app.db.models import EventTicket, WaitlistEntry
+from app.db.models.waitlist_entry import WaitlistStatus
+from app.domain.accounts.services import UserService
+from app.domain.events.services import EventService
+from app.domain.waitlist.schemas import JoinWaitlist, WaitlistEntryItem
+from app.domain.waitlist.services import WaitlistService
+
+
+class WaitlistController(Controller):
+    path = "/events/{event_id:int}/waitlist"
+    tags = ["Waitlist"]
+    dependencies = {
+        "waitlist_service": create_service_provider(WaitlistService),
+        "event_service": create_service_provider(EventService),
+        "user_service": create_service_provider(UserService),
+    }
+
+    @get("/", operation_id="get_waitlist")
+    async def get_waitlist(
+        self,
+        waitlist_service: WaitlistService,
+        event_id: Annotated[int, Parameter(title="Event ID", description="The event of the waitlist")],
+    ) -> list[WaitlistEntryItem]:
+        """Waiting entries in promotion order."""
+        entries = await waitlist_service.list(
+            WaitlistEntry.event_id == event_id,
+            WaitlistEntry.status == WaitlistStatus.WAITING,
+            OrderBy(field_name="id", sort_order="asc"),
+        )
+        return [
+            waitlist_service.to_schema(data=entry, schema_type=WaitlistEntryItem) for entry in entries
+        ]
+
+    @post("/", operation_id="join_waitlist")
+    async def join_waitlist(
+        self,
+        waitlist_service: WaitlistService,
+        event_service: EventService,
+        user_service: UserService,
+        event_id: Annotated[int, Parameter(title="Event ID", description="The event to wait for")],
+        data: JoinWaitlist,
+    ) -> WaitlistEntryItem:
+        """Queue the user; if a seat is already free the entry is promoted right away."""
+        if not await event_service.exists(id=event_id) or not await user_service.exists(id=data.user_id):
+            raise NotFoundException(detail="Event or user not found")
+        session = waitlist_service.repository.session
+        has_seat = await session.scalar(
+            select(
+                select(EventTicket.id)
+                .where(
+                    EventTicket.event_id == event_id,
+                    EventTicket.user_id == data.user_id,
+                    EventTicket.status.in_(WaitlistService.SEAT_STATUSES),
+                )
+                .exists()
+            )
+        )
+        if has_seat:
+            raise ClientException(status_code=409, detail="User already has a ticket for this event")
+
+        entry = await waitlist_service.get_one_or_none(event_id=event_id, user_id=data.user_id)
+        if entry is not None and entry.status != WaitlistStatus.WAITING:
+            # rejoining goes to the end of the queue
+            await waitlist_service.delete(entry.id)
+            entry = None
+        if entry is None:
+            entry = await waitlist_service.create({"event_id": event_id, "user_id": data.user_id})
+        await waitlist_service.promote(event_id)
+
+        entry = await waitlist_service.get(entry.id)
+        item = waitlist_service.to_schema(data=entry, schema_type=WaitlistEntryItem)
+        if entry.status == WaitlistStatus.WAITING:
+            item.position = await session.scalar(
+                select(func.count()).where(
+                    WaitlistEntry.event_id == event_id,
+                    WaitlistEntry.status == WaitlistStatus.WAITING,
+                    WaitlistEntry.id <= entry.id,
+                )
+            )
+        return item
+
+    @delete("/{user_id:int}", operation_id="leave_waitlist")
+    async def leave_waitlist(
+        self,
+        waitlist_service: WaitlistService,
+        event_id: Annotated[int, Parameter(title="Event ID", description="The event of the waitlist")],
+        user_id: Annotated[int, Parameter(title="User ID", description="The user leaving the waitlist")],
+    ) -> None:
+        entry = await waitlist_service.get_one_or_none(
+            event_id=event_id, user_id=user_id, status=WaitlistStatus.WAITING
+        )
+        if entry is None:
+            raise NotFoundException(detail="Waitlist entry not found")
+        await waitlist_service.update(item_id=entry.id, data={"status": WaitlistStatus.CANCELLED})
+
+    @post("/promote", operation_id="promote_waitlist", status_code=200)
+    async def promote_waitlist(
+        self,
+        waitlist_service: WaitlistService,
+        event_id: Annotated[int, Parameter(title="Event ID", description="The event of the waitlist")],
+    ) -> list[WaitlistEntryItem]:
+        """Fill currently free seats, e.g. after ``max_participants`` was raised."""
+        entries = await waitlist_service.promote(event_id)
+        return [
+            waitlist_service.to_schema(data=entry, schema_type=WaitlistEntryItem) for entry in entries
+        ]
@@ -0,0 +1,19 @@
+import datetime
+
+from app.lib.schema import CamelizedBaseStruct
+from app.db.models.waitlist_entry import WaitlistStatus
+
+
+class JoinWaitlist(CamelizedBaseStruct):
+    user_id: int
+
+
+class WaitlistEntryItem(CamelizedBaseStruct):
+    id: int
+    event_id: int
+    user_id: int
+    status: WaitlistStatus
+    ticket_id: int | None = None
+    promoted_at: datetime.datetime | None = None
+    payment_url: str | None = None
+    position: int | None = None
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import zlib
+from typing import TYPE_CHECKING
+
+import structlog
+from advanced_alchemy.repository import (
+    SQLAlchemyAsyncRepository
+)
+from advanced_alchemy.service import (
+    SQLAlchemyAsyncRepositoryService
+)
+from sqlalchemy import bindparam, case, exists, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config.settings import get_settings
+from app.db import models
+from app.db.models.event_ticket import EventTicketStatus
+from app.db.models.waitlist_entry import WaitlistStatus
+from app.domain.registrations.services import EventTicketService
+from app.services.email.email_service import EmailService
+from app.services.funnel.funnel_service import FunnelService
+from app.db.models.funnel_event import FunnelStep
+from app.services.yookassa import Amount, Confirmation, CreatePayment, Payment, YooKassaClient
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+__all__ = ("WaitlistService",)
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+
+class WaitlistService(SQLAlchemyAsyncRepositoryService[models.WaitlistEntry]):
+    """FIFO waitlist: free seats are handed to the oldest waiting entries in one statement."""
+    class WaitlistEntryRepository(SQLAlchemyAsyncRepository[models.WaitlistEntry]):
+        model_type = models.WaitlistEntry
+    repository_type = WaitlistEntryRepository
+
+    SEAT_STATUSES = (EventTicketStatus.WAITING_PAYMENT, EventTicketStatus.PAID)
+    logger = logger.bind(service="waitlist_service")
+
+    @classmethod
+    def promotion_statement(cls, event_id: int):
+        """Tickets for the first ``free seats`` waiting entries, skipping entries locked by another promotion.
+
+        Users whose earlier ticket was refunded or expired get that ticket back; entries of
+        users that already hold a seat are cancelled.
+        """
+        entry, ticket, event = models.WaitlistEntry.__table__, models.EventTicket.__table__, models.Event.__table__
+        taken = (
+            select(func.count())
+            .select_from(ticket)
+            .where(ticket.c.event_id == event_id, ticket.c.status.in_(cls.SEAT_STATUSES))
+            .scalar_subquery()
+        )
+        free_seats = (
+            select(func.greatest(func.coalesce(event.c.max_participants - taken, 2_147_483_647), 0))
+            .where(event.c.id == event_id)
+            .scalar_subquery()
+        )
+        candidates = (
+            select(entry.c.id, entry.c.user_id)
+            .where(entry.c.event_id == event_id, entry.c.status == WaitlistStatus.WAITING)
+            .order_by(entry.c.id)
+            .limit(free_seats)
+            .with_for_update(skip_locked=True)
+            .cte("candidates")
+        )
+        now = func.now()
+        issue = insert(ticket).from_select(
+            ["id", "event_id", "user_id", "amount_paid", "status", "reserved_at", "created_at", "updated_at"],
+            select(
+                func.nextval(f"{ticket.name}_id_seq"),
+                event.c.id,
+                candidates.c.user_id,
+                # Pro price as on registration, by the user's Pro status at promotion time
+                case((models.User.is_pro, event.c.pro_price), else_=event.c.price),
+                literal(EventTicketStatus.WAITING_PAYMENT, ticket.c.status.type),
+                now,
+                now,
+                now,
+            )
+            .select_from(candidates)
+            .join(event, event.c.id == event_id)
+            .join(models.User, models.User.id == candidates.c.user_id),
+        )
+        tickets = (
+            issue.on_conflict_do_update(
+                constraint="uq_event_user",
+                set_={
+                    "status": issue.excluded.status,
+                    "amount_paid": issue.excluded.amount_paid,
+                    "reserved_at": now,
+                    "checked_in_at": None,
+                    "yookassa_payment_id": None,
+                    "payment_url": None,
+                    "payment_url_expires_at": None,
+                    "updated_at": now,
+                },
+                where=ticket.c.status.in_((EventTicketStatus.REFUNDED, EventTicketStatus.EXPIRED)),
+            )
+            .returning(ticket.c.id, ticket.c.user_id, ticket.c.amount_paid, ticket.c.updated_at)
+            .cte("tickets")
+        )
+        promoted = (
+            update(entry)
+            .where(entry.c.event_id == event_id, entry.c.user_id == tickets.c.user_id)
+            .values(status=WaitlistStatus.PROMOTED, ticket_id=tickets.c.id, promoted_at=now, updated_at=now)
+            .returning(
+                entry.c.user_id,
+                tickets.c.id.label("ticket_id"),
+                tickets.c.amount_paid,
+                tickets.c.updated_at.label("revision"),
+            )
+            .cte("promoted")
+        )
+        skipped = (
+            update(entry)
+            .where(
+                entry.c.id == candidates.c.id,
+                ~exists().where(tickets.c.user_id == candidates.c.user_id),
+            )
+            .values(status=WaitlistStatus.CANCELLED, updated_at=now)
+            .cte("skipped")
+        )
+        return select(
+            promoted.c.user_id, promoted.c.ticket_id, promoted.c.amount_paid, promoted.c.revision
+        ).add_cte(skipped)
+
+    async def promote(self, event_id: int) -> list[models.WaitlistEntry]:
+        """Fill the free seats of the event from its waitlist and send payment links to the promoted users.
+
+        Commits: the promotion is persisted before payment links are requested.
+        """
+        session = self.repository.session
+        # one promotion per event at a time, so free seats are counted once
+        await session.execute(select(func.pg_advisory_xact_lock(zlib.crc32(f"waitlist:{event_id}".encode()))))
+        rows = (await session.execute(self.promotion_statement(event_id))).all()
+        await session.commit()
+        if not rows:
+            return []
+        await self.logger.ainfo("Waitlist promoted", event_id=event_id, promoted=len(rows))
+        await self._offer(session, event_id, rows)
+        return list(
+            await self.list(
+                models.WaitlistEntry.event_id == event_id,
+                models.WaitlistEntry.ticket_id.in_([row.ticket_id for row in rows]),
+            )
+        )
+
+    async def _offer(self, session: AsyncSession, event_id: int, rows: list) -> None:
+        """Create payment links with at most ``WAITLIST_PAYMENT_CONCURRENCY`` requests in flight, then email them."""
+        event = await session.get_one(models.Event, event_id)
+        semaphore = asyncio.Semaphore(settings.waitlist.PAYMENT_CONCURRENCY)
+
+        async def create_payment(row) -> Payment | None:
+            async with semaphore:
+                try:
+                    payment = await YooKassaClient.create_payment(
+                        payment=CreatePayment(
+                            amount=Amount(value=float(row.amount_paid), currency="RUB"),
+                            confirmation=Confirmation(
+                                type="redirect",
+                                return_url=settings.yookassa.RETURN_URL or "https://example.com"
+                            ),
+                            save_payment_method=False,
+                            capture=True,
+                            description=f"Оплата участия в мероприятии {event.title}",
+                            metadata={
+                                "ticket_id": str(row.ticket_id),
+                                "event_id": str(event_id),
+                                "user_id": str(row.user_id),
+                                "source": "waitlist"
+                            }
+                        ),
+                        # per ticket revision, as on registration: a ticket promoted again gets a new payment
+                        idempotence_key=YooKassaClient.idempotence_key(
+                            "ticket", row.ticket_id, row.revision.isoformat(), row.amount_paid
+                        ),
+                    )
+                except Exception as e:
+                    await self.logger.aerror("Payment link failed", ticket_id=row.ticket_id, error=str(e))
+                    return None
+                FunnelService.record(
+                    FunnelStep.PAYMENT_CREATED, "waitlist",
+                    event_id=event_id, user_id=row.user_id, ticket_id=row.ticket_id,
+                )
+                return payment
+
+        payments = await asyncio.gather(*(create_payment(row) for row in rows))
+        offers = [(row, payment) for row, payment in zip(rows, payments) if payment is not None]
+        if not offers:
+            return
+        # stored on the ticket too: registering again hands out this payment instead of a second one
+        tickets = EventTicketService(session=session)
+        for row, payment in offers:
+            await tickets.attach_payment(row.ticket_id, payment.id, payment.confirmation["confirmation_url"])
+        offers = [(row, payment.confirmation["confirmation_url"]) for row, payment in offers]
+        await session.execute(
+            update(models.WaitlistEntry.__table__)
+            .where(models.WaitlistEntry.__table__.c.ticket_id == bindparam("b_ticket_id"))
+            .values(payment_url=bindparam("b_payment_url")),
+            [{"b_ticket_id": row.ticket_id, "b_payment_url": url} for row, url in offers],
+        )
+        await session.commit()
+
+        users = {
+            user.id: user
+            for user in await session.scalars(
+                select(models.User).where(models.User.id.in_([row.user_id for row, _ in offers]))
+            )
+        }
+        for row, url in offers:
+            try:
+                await EmailService.send_waitlist_offer(users[row.user_id], event, url)
+            except Exception:
+                # already logged by EmailService, the link stays on the entry
+                continue
+            FunnelService.record(
+                FunnelStep.EMAIL_SENT, "waitlist", event_id=event_id, user_id=row.user_id, ticket_id=row.ticket_id
+            )
+
+    async def expire_reservations(self) -> set[int]:
+        """Release tickets unpaid ``WAITLIST_RESERVATION_TTL`` after their (re)issue, of events with a waitlist."""
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(
+            seconds=settings.waitlist.RESERVATION_TTL
+        )
+        ticket, entry = models.EventTicket.__table__, models.WaitlistEntry.__table__
+        result = await self.repository.session.execute(
+            update(ticket)
+            .where(
+                ticket.c.status == EventTicketStatus.WAITING_PAYMENT,
+                ticket.c.reserved_at < cutoff,
+                ticket.c.event_id.in_(select(entry.c.event_id).where(entry.c.status == WaitlistStatus.WAITING)),
+            )
+            .values(status=EventTicketStatus.EXPIRED, updated_at=func.now())
+            .returning(ticket.c.event_id)
+        )
+        event_ids = set(result.scalars())
+        await self.repository.session.commit()
+        return event_ids
+
+    @classmethod
+    async def run(cls, session: AsyncSession) -> None:
+        """Scheduler job: expire stale reservations and promote the waitlists of affected events."""
+        service = cls(session=session)
+        for event_id in await service.expire_reservations():
+            await service.promote(event_id)
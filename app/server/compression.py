@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal
+
+from litestar.config.compression import CompressionConfig
+from litestar.datastructures import MutableScopeHeaders
+from litestar.enums import CompressionEncoding
+from litestar.middleware.compression import CompressionMiddleware
+
+from app.config.settings import get_settings
+from app.services.compression.compression_service import BROTLI_AVAILABLE, is_compressible
+
+if TYPE_CHECKING:
+    from litestar.types import Message, Scope, Send
+
+settings = get_settings()
+
+
+class ContentTypeCompressionMiddleware(CompressionMiddleware):
+    """Compresses only text-like media types and leaves already encoded (precompressed) responses alone.
+
+    Streamed responses (exports) are compressed chunk by chunk.
+    """
+
+    def create_compression_send_wrapper(
+        self,
+        send: Send,
+        compression_encoding: Literal[CompressionEncoding.BROTLI, CompressionEncoding.GZIP] | str,
+        scope: Scope,
+    ) -> Send:
+        compressing_send = super().create_compression_send_wrapper(send, compression_encoding, scope)
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal passthrough
+            if message["type"] == "http.response.start":
+                headers = MutableScopeHeaders(message)
+                passthrough = "content-encoding" in headers or not is_compressible(headers.get("content-type", ""))
+            if passthrough:
+                await send(message)
+            else:
+                await compressing_send(message)
+
+        return send_wrapper
+
+
+config = CompressionConfig(
+    backend="brotli" if BROTLI_AVAILABLE and settings.compression.BACKEND == "brotli" else "gzip",
+    minimum_size=settings.compression.MINIMUM_SIZE,
+    gzip_compress_level=settings.compression.GZIP_LEVEL,
+    brotli_quality=settings.compression.BROTLI_QUALITY,
+    brotli_gzip_fallback=True,
+    middleware_class=ContentTypeCompressionMiddleware,
+    exclude_opt_key="skip_compression",
+)
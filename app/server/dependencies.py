@@ -21,6 +21,7 @@ from app.config import constants
 
 __all__ = [
     "create_collection_dependencies",
+    "provide_collection_filters",
     "provide_created_filter",
     "provide_filter_dependencies",
     "provide_id_filter",
@@ -234,6 +235,61 @@ def provide_filter_dependencies(
     return filters
 
 
+def provide_collection_filters(
+    ids: list[UUID] | None = Parameter(query="ids", default=None, required=False),
+    created_before: DTorNone = Parameter(query="createdBefore", default=None, required=False),
+    created_after: DTorNone = Parameter(query="createdAfter", default=None, required=False),
+    updated_before: DTorNone = Parameter(query="updatedBefore", default=None, required=False),
+    updated_after: DTorNone = Parameter(query="updatedAfter", default=None, required=False),
+    current_page: int = Parameter(ge=1, query="currentPage", default=1, required=False),
+    page_size: int = Parameter(
+        query="pageSize",
+        ge=1,
+        default=constants.DEFAULT_PAGINATION_SIZE,
+        required=False,
+    ),
+    search_field: StringOrNone = Parameter(title="Field to search", query="searchField", default=None, required=False),
+    search_string: StringOrNone = Parameter(title="Field to search", query="searchString", default=None, required=False),
+    search_ignore_case: BooleanOrNone = Parameter(
+        title="Search should be case sensitive",
+        query="searchIgnoreCase",
+        default=None,
+        required=False,
+    ),
+    order_by_field: StringOrNone = Parameter(title="Order by field", query="orderBy", default=None, required=False),
+    sort_order: SortOrderOrNone = Parameter(title="Field to search", query="sortOrder", default="desc", required=False),
+    select_in_field: StringOrNone = Parameter(query="selectInField", default=None, required=False),
+    select_in_values: StringOrNone = Parameter(query="selectInValues", default=None, required=False),
+) -> list[FilterTypes]:
+    """Provide collection route filters from a single dependency.
+
+    Accepts the same query parameters as the individual ``provide_*`` providers combined by
+    :func:`provide_filter_dependencies`, but the query string is parsed in one kwargs model
+    instead of resolving seven providers, and filters that would not change the query
+    (``BeforeAfter`` without dates, empty collections) are left out, so no redundant SQL
+    clauses are rendered.
+
+    Returns:
+        list[FilterTypes]: List of filters parsed from connection.
+    """
+    filters: list[FilterTypes] = []
+    if ids:
+        filters.append(CollectionFilter(field_name="id", values=ids))
+    if created_before is not None or created_after is not None:
+        filters.append(BeforeAfter("created_at", created_before, created_after))
+    if updated_before is not None or updated_after is not None:
+        filters.append(BeforeAfter("updated_at", updated_before, updated_after))
+    filters.append(LimitOffset(page_size, page_size * (current_page - 1)))
+    if search_field is not None and search_string is not None:
+        filters.append(SearchFilter(field_name=search_field, value=search_string, ignore_case=search_ignore_case or False))
+    if order_by_field is not None:
+        filters.append(OrderBy(field_name=order_by_field, sort_order=sort_order))  # type: ignore[arg-type]
+    if select_in_field is not None and select_in_values:
+        values = [value.strip() for value in select_in_values.split(",") if value != ""]
+        filters.append(CollectionFilter(field_name=select_in_field, values=values))
+    return filters
+
+
 def create_collection_dependencies() -> dict[str, Provide]:
     """Create ORM dependencies.
 
@@ -250,5 +306,5 @@ def create_collection_dependencies() -> dict[str, Provide]:
         SELECT_IN_STR_FILTER_DEPENDENCY_KEY: Provide(provide_select_in_str_filter, sync_to_thread=False),
         SEARCH_FILTER_DEPENDENCY_KEY: Provide(provide_search_filter, sync_to_thread=False),
         ORDER_BY_DEPENDENCY_KEY: Provide(provide_order_by, sync_to_thread=False),
-        FILTERS_DEPENDENCY_KEY: Provide(provide_filter_dependencies, sync_to_thread=False),
+        FILTERS_DEPENDENCY_KEY: Provide(provide_collection_filters, sync_to_thread=False),
     }
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Any
+
+import msgspec
+from litestar.datastructures import Headers
+from litestar.enums import ScopeType
+from litestar.exceptions import TooManyRequestsException
+from litestar.middleware import ASGIMiddleware
+
+from app.config.settings import get_settings
+from app.services.rate_limit.rate_limit_service import Limit, RateLimitService
+
+if TYPE_CHECKING:
+    from litestar.types import ASGIApp, Message, Receive, Scope, Send
+
+settings = get_settings()
+
+
+class RateLimitMiddleware(ASGIMiddleware):
+    """Token buckets of a route, checked before its dependencies (and the database session) are resolved.
+
+    Buckets are keyed by the client IP and by ``body_keys``, fields of the JSON body.
+    Routes sharing a ``name`` share their buckets. Over the limit the request is answered
+    with 429 and ``Retry-After``.
+    """
+    scopes = (ScopeType.HTTP,)
+    # larger bodies are not read ahead, only the IP is limited
+    MAX_BODY = 64 * 1024
+
+    def __init__(self, name: str, per_ip: str, body_keys: dict[str, str] | None = None) -> None:
+        self.name = name
+        self.per_ip = Limit.parse(per_ip)
+        self.body_keys = {field: Limit.parse(limit) for field, limit in (body_keys or {}).items()}
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send, next_app: ASGIApp) -> None:
+        if not settings.rate_limit.ENABLED:
+            await next_app(scope, receive, send)
+            return
+        checks = [(f"rate_limit:{self.name}:ip:{self.client_ip(scope)}", self.per_ip)]
+        if self.body_keys:
+            messages, complete = await self._read_body(receive)
+            if complete:
+                checks += self._body_checks(b"".join(message.get("body", b"") for message in messages))
+            # the rest of a larger body is left in the stream for the handler
+            receive = self._replay(messages, receive)
+
+        retry_after = await RateLimitService.acquire(checks)
+        if retry_after:
+            raise TooManyRequestsException(headers={"Retry-After": str(math.ceil(retry_after))})
+        await next_app(scope, receive, send)
+
+    @classmethod
+    def client_ip(cls, scope: Scope) -> str:
+        if settings.rate_limit.TRUST_FORWARDED:
+            forwarded = Headers.from_scope(scope).get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _body_checks(self, body: bytes) -> list[tuple[str, Limit]]:
+        try:
+            data: Any = msgspec.json.decode(body)
+        except msgspec.DecodeError:
+            # the handler rejects it without touching the database
+            return []
+        if not isinstance(data, dict):
+            return []
+        checks = []
+        for field, limit in self.body_keys.items():
+            value = data.get(field)
+            if isinstance(value, (str, int)) and not isinstance(value, bool):
+                checks.append((f"rate_limit:{self.name}:{field}:{str(value).strip().lower()}", limit))
+        return checks
+
+    async def _read_body(self, receive: Receive) -> tuple[list[Message], bool]:
+        """Messages of the body up to ``MAX_BODY`` bytes, and whether that is the whole (small enough) body.
+
+        Reading stops past ``MAX_BODY``: the limit is checked before a client can make
+        this worker buffer an arbitrarily large body.
+        """
+        messages, size = [], 0
+        while True:
+            message = await receive()
+            messages.append(message)
+            size += len(message.get("body", b""))
+            if message["type"] != "http.request" or not message.get("more_body", False):
+                return messages, size <= self.MAX_BODY
+            if size > self.MAX_BODY:
+                return messages, False
+
+    @staticmethod
+    def _replay(messages: list[Message], receive: Receive) -> Receive:
+        pending = list(messages)
+
+        async def replay() -> Message:
+            return pending.pop(0) if pending else await receive()
+
+        return replay
+
+
+registration = RateLimitMiddleware(
+    "register",
+    per_ip=settings.rate_limit.REGISTER_PER_IP,
+    body_keys={
+        "email": settings.rate_limit.REGISTER_PER_EMAIL,
+        "userId": settings.rate_limit.REGISTER_PER_USER,
+        "eventId": settings.rate_limit.REGISTER_PER_EVENT,
+    },
+)
+webhook = RateLimitMiddleware("webhook", per_ip=settings.rate_limit.WEBHOOK_PER_IP)
@@ -6,9 +6,14 @@ from typing import TYPE_CHECKING
 from app.domain.events.controllers import EventController
 from app.domain.speakers.controllers import SpeakerController
 from app.domain.matireals.controllers import EventMaterialController
-from app.domain.registrations.controllers import RegistrationController
+from app.domain.registrations.controllers import RegistrationController, TicketController
 from app.domain.accounts.controllers.user_controller import UserController
 from app.domain.payments.controllers.webhook import WebhookController
+from app.domain.payments.controllers.export import PaymentExportController
+from app.domain.checkin.controllers import CheckInController
+from app.domain.waitlist.controllers import WaitlistController
+from app.domain.analytics.controllers import AnalyticsController
+from app.domain.system.controllers import MetricsController
 
 if TYPE_CHECKING:
     from litestar.types import ControllerRouterHandler
@@ -19,8 +24,14 @@ route_handlers: list[ControllerRouterHandler] = [
     SpeakerController,
     EventMaterialController,
     RegistrationController,
+    TicketController,
     UserController,
-    WebhookController
+    WebhookController,
+    PaymentExportController,
+    CheckInController,
+    WaitlistController,
+    AnalyticsController,
+    MetricsController,
 ]
 
 api_v1_router = Router(path="/api/v1", route_handlers=route_handlers)
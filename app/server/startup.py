@@ -1,8 +1,78 @@
+import structlog
+
+from app.config.alchemy import alchemy
+from app.config.settings import get_settings
 from app.services.http.http_client import HttpClient
 from app.services.email.email_service import EmailService
+from app.services.archive.archive_service import ArchiveService
+from app.services.availability.availability_service import AvailabilityService
+from app.services.checkin.checkin_service import CheckInService
+from app.services.etag.etag_service import ETagService
+from app.services.entitlement.entitlement_service import EntitlementService
+from app.services.funnel.funnel_service import FunnelService
+from app.services.pro_expiry.pro_expiry_service import ProExpiryService
+from app.services.rate_limit.rate_limit_service import RateLimitService
+from app.services.scheduler.scheduler import Scheduler
+from app.domain.waitlist.services import WaitlistService
+from app.domain.analytics.services import AnalyticsService
+
+settings = get_settings()
+logger = structlog.get_logger()
 
 
 async def start_http_session():
     HttpClient.inizialize_session()
+    await HttpClient.warm_up(settings.yookassa.API_URL, *settings.http_client.WARMUP_URLS)
     # SMTP connection removed - will connect on-demand when sending emails
     # await EmailService.get_smtp()
+
+
+async def ensure_partitions():
+    """``payment`` is partitioned: without the current month's partition no payment can be stored."""
+    try:
+        async with alchemy.get_session() as session:
+            await ArchiveService.ensure_payment_partitions(session)
+            await session.commit()
+    except Exception as e:
+        # the archive job retries right after startup
+        await logger.aerror("Payment partitions not created", error=str(e))
+
+
+async def ensure_availability_trigger():
+    """``/events/{id}/availability`` is fed by NOTIFY from a trigger on ``event_ticket``."""
+    try:
+        async with alchemy.get_session() as session:
+            await AvailabilityService.ensure_trigger(session)
+            await session.commit()
+    except Exception as e:
+        await logger.aerror("Availability trigger not installed", error=str(e))
+
+
+async def ensure_table_versions():
+    """Collection ETags read the ``table_version`` rows bumped by triggers on their tables."""
+    try:
+        async with alchemy.get_session() as session:
+            await ETagService.ensure_triggers(session)
+            await session.commit()
+    except Exception as e:
+        await logger.aerror("Table version triggers not installed", error=str(e))
+
+
+async def start_background_jobs():
+    Scheduler.register("archive", interval=settings.archive.INTERVAL, func=ArchiveService.run)
+    Scheduler.register("waitlist", interval=settings.waitlist.INTERVAL, func=WaitlistService.run)
+    Scheduler.register("analytics", interval=settings.analytics.INTERVAL, func=AnalyticsService.run)
+    Scheduler.register("pro_expiry", interval=settings.pro.EXPIRY_INTERVAL, func=ProExpiryService.run)
+    Scheduler.start()
+    CheckInService.start()
+    EntitlementService.start()
+    FunnelService.start()
+
+
+async def stop_background_jobs():
+    await Scheduler.stop()
+    await CheckInService.stop()
+    await EntitlementService.stop()
+    await FunnelService.stop()
+    await AvailabilityService.stop()
+    await RateLimitService.close()
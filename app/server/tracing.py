@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import structlog
+from litestar.datastructures import Headers, MutableScopeHeaders
+from litestar.enums import ScopeType
+from litestar.middleware import ASGIMiddleware
+
+from app.services.http.tracing import SpanContext, current_span
+
+if TYPE_CHECKING:
+    from litestar.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class TraceContextMiddleware(ASGIMiddleware):
+    """Server span of the request: continues an incoming ``traceparent`` or starts a trace.
+
+    Upstream calls made while handling the request become its child spans, and log records
+    carry ``trace_id``/``span_id``. The trace id is returned in ``X-Trace-Id``.
+    """
+    scopes = (ScopeType.HTTP,)
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send, next_app: ASGIApp) -> None:
+        parent = SpanContext.from_traceparent(Headers.from_scope(scope).get("traceparent"))
+        span = SpanContext.new(parent)
+        token = current_span.set(span)
+        bound = structlog.contextvars.bind_contextvars(trace_id=span.trace_id, span_id=span.span_id)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableScopeHeaders(message)["x-trace-id"] = span.trace_id
+            await send(message)
+
+        try:
+            await next_app(scope, receive, send_wrapper)
+        finally:
+            structlog.contextvars.reset_contextvars(**bound)
+            current_span.reset(token)
+
+
+middleware = TraceContextMiddleware()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import gzip
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import msgspec
+import structlog
+from sqlalchemy import delete, exists, func, insert, select, text
+
+from app.config.settings import get_settings
+from app.db.models import Event, EventTicket, Payment, event_ticket_archive, payment_archive
+from app.db.partitions import monthly_partition_ddl, monthly_partitions
+
+if TYPE_CHECKING:
+    from sqlalchemy import ColumnElement, Table
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+
+class ArchiveService:
+    """Keeps ``payment``/``event_ticket`` small: rows of past events go to ``*_archive`` tables."""
+    logger = logger.bind(service="archive_service")
+    PARTITIONS_LOCK_KEY = zlib.crc32(b"payment_partitions")
+    _encoder = msgspec.json.Encoder()
+
+    @classmethod
+    async def ensure_payment_partitions(cls, session: AsyncSession) -> None:
+        """Create monthly ``payment`` partitions for the current and the next months.
+
+        Runs at startup and from the archive job; concurrent callers are serialized by a transaction lock.
+        """
+        await session.execute(select(func.pg_advisory_xact_lock(cls.PARTITIONS_LOCK_KEY)))
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        until = today + datetime.timedelta(days=31 * settings.archive.PARTITION_MONTHS_AHEAD)
+        for start, end in monthly_partitions(today, until):
+            await session.execute(text(monthly_partition_ddl(Payment.__tablename__, start, end)))
+
+    @classmethod
+    async def archive_past_events(cls, session: AsyncSession) -> dict[str, int]:
+        """Move tickets and payments of events older than ``ARCHIVE_AFTER_DAYS`` to the archive tables.
+
+        Events are processed in batches of ``ARCHIVE_EVENT_BATCH_SIZE``, each batch is committed
+        separately and, when ``ARCHIVE_EXPORT_DIR`` is set, also written there as gzipped NDJSON.
+        """
+        cutoff = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=settings.archive.AFTER_DAYS)
+        moved = {"events": 0, "tickets": 0, "payments": 0}
+        while True:
+            event_ids = (await session.scalars(
+                select(Event.id)
+                .where(Event.event_date < cutoff, exists().where(EventTicket.event_id == Event.id))
+                .order_by(Event.event_date)
+                .limit(settings.archive.EVENT_BATCH_SIZE)
+            )).all()
+            if not event_ids:
+                break
+
+            ticket_ids = select(EventTicket.id).where(EventTicket.event_id.in_(event_ids)).scalar_subquery()
+            payments = await cls._move(session, Payment.__table__, payment_archive, Payment.ticket_id.in_(ticket_ids))
+            tickets = await cls._move(
+                session, EventTicket.__table__, event_ticket_archive, EventTicket.event_id.in_(event_ids)
+            )
+            await session.commit()
+
+            await cls._export(payment_archive.name, payments)
+            await cls._export(event_ticket_archive.name, tickets)
+            moved["events"] += len(event_ids)
+            moved["tickets"] += len(tickets)
+            moved["payments"] += len(payments)
+
+        if moved["events"]:
+            await cls.logger.ainfo("Archived past events", cutoff=cutoff.isoformat(), **moved)
+        return moved
+
+    @classmethod
+    async def run(cls, session: AsyncSession) -> None:
+        await cls.ensure_payment_partitions(session)
+        await session.commit()
+        await cls.archive_past_events(session)
+
+    @classmethod
+    async def _move(
+        cls, session: AsyncSession, source: Table, archive: Table, where: ColumnElement[bool]
+    ) -> list[dict[str, Any]]:
+        """``DELETE ... RETURNING`` into ``INSERT ... SELECT`` in one statement."""
+        names = [column.name for column in source.columns]
+        removed = delete(source).where(where).returning(*source.columns).cte("removed")
+        statement = (
+            insert(archive)
+            .from_select(names, select(*(removed.c[name] for name in names)))
+            .returning(*archive.columns)
+        )
+        return [dict(row._mapping) for row in await session.execute(statement)]
+
+    @classmethod
+    async def _export(cls, table_name: str, rows: list[dict[str, Any]]) -> None:
+        if not rows or not settings.archive.EXPORT_DIR:
+            return
+        path = Path(settings.archive.EXPORT_DIR) / (
+            f"{table_name}-{datetime.datetime.now(datetime.timezone.utc):%Y%m%dT%H%M%S}-{rows[0]['id']}.ndjson.gz"
+        )
+        data = cls._encoder.encode_lines(rows)
+        await asyncio.to_thread(cls._write_gzip, path, data)
+
+    @staticmethod
+    def _write_gzip(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "wb", compresslevel=6) as file:
+            file.write(data)
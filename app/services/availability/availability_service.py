@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import zlib
+from typing import TYPE_CHECKING
+
+import asyncpg
+import msgspec
+import structlog
+from litestar.response import ServerSentEventMessage
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import make_url
+
+from app.config.alchemy import alchemy
+from app.config.settings import get_settings
+from app.db.models import Event, EventTicket
+from app.db.models.event_ticket import EventTicketStatus
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+
+class EventAvailability(msgspec.Struct, rename="camel"):
+    event_id: int
+    max_participants: int | None
+    taken: int
+    remaining: int | None
+
+
+class AvailabilityService:
+    """Seats remaining of events pushed to SSE subscribers.
+
+    Each worker holds one ``LISTEN event_availability`` connection. A notification only
+    marks the event dirty; the count is re-read at most ``AVAILABILITY_MAX_UPDATES_PER_SECOND``
+    times per second per event and the result is shared by all its subscribers.
+    """
+    CHANNEL = "event_availability"
+    # Installed at startup by ``ensure_trigger``; seats change with every ticket insert/status/delete
+    TRIGGER_SQL = (
+        text("""
+            CREATE OR REPLACE FUNCTION notify_event_availability() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_notify('event_availability', COALESCE(NEW.event_id, OLD.event_id)::text);
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """),
+        # created once: dropping it on every start would lock event_ticket exclusively
+        text("""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT FROM pg_trigger
+                    WHERE tgname = 'event_ticket_availability' AND tgrelid = 'event_ticket'::regclass
+                ) THEN
+                    CREATE TRIGGER event_ticket_availability
+                    AFTER INSERT OR DELETE OR UPDATE OF status ON event_ticket
+                    FOR EACH ROW EXECUTE FUNCTION notify_event_availability();
+                END IF;
+            END
+            $$
+        """),
+    )
+    TRIGGER_LOCK_KEY = zlib.crc32(b"event_availability_trigger")
+    SEAT_STATUSES = (EventTicketStatus.WAITING_PAYMENT, EventTicketStatus.PAID)
+    logger = logger.bind(service="availability_service")
+
+    _subscribers: dict[int, set[asyncio.Queue[EventAvailability]]] = {}
+    _latest: dict[int, EventAvailability] = {}
+    _last_refresh: dict[int, float] = {}
+    _scheduled: dict[int, asyncio.TimerHandle] = {}
+    # the loop keeps only weak references to tasks
+    _refresh_tasks: set[asyncio.Task] = set()
+    _listener: asyncio.Task | None = None
+    _encoder = msgspec.json.Encoder()
+
+    @classmethod
+    async def ensure_trigger(cls, session: AsyncSession) -> None:
+        """Install the notification trigger; without it subscribers only get the first snapshot."""
+        # workers start together
+        await session.execute(select(func.pg_advisory_xact_lock(cls.TRIGGER_LOCK_KEY)))
+        for statement in cls.TRIGGER_SQL:
+            await session.execute(statement)
+
+    @classmethod
+    async def stream(cls, event_id: int) -> AsyncIterator[ServerSentEventMessage]:
+        queue: asyncio.Queue[EventAvailability] = asyncio.Queue(maxsize=1)
+        cls._subscribers.setdefault(event_id, set()).add(queue)
+        cls._ensure_listener()
+        try:
+            current = cls._latest.get(event_id) or await cls._refresh(event_id)
+            yield cls._message(current)
+            while True:
+                try:
+                    current = await asyncio.wait_for(queue.get(), timeout=settings.availability.KEEPALIVE)
+                except TimeoutError:
+                    yield ServerSentEventMessage(comment="keepalive")
+                    continue
+                yield cls._message(current)
+        finally:
+            subscribers = cls._subscribers.get(event_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del cls._subscribers[event_id]
+                    cls._latest.pop(event_id, None)
+
+    @classmethod
+    def _message(cls, availability: EventAvailability) -> ServerSentEventMessage:
+        return ServerSentEventMessage(data=cls._encoder.encode(availability).decode(), event="availability")
+
+    @classmethod
+    async def availability(cls, event_id: int) -> EventAvailability:
+        taken = (
+            select(func.count())
+            .where(EventTicket.event_id == event_id, EventTicket.status.in_(cls.SEAT_STATUSES))
+            .scalar_subquery()
+        )
+        async with alchemy.get_session() as session:
+            max_participants, taken = (
+                await session.execute(select(Event.max_participants, taken).where(Event.id == event_id))
+            ).one()
+        remaining = None if max_participants is None else max(max_participants - taken, 0)
+        return EventAvailability(
+            event_id=event_id, max_participants=max_participants, taken=taken, remaining=remaining
+        )
+
+    @classmethod
+    async def _refresh(cls, event_id: int) -> EventAvailability:
+        cls._last_refresh[event_id] = time.monotonic()
+        current = await cls.availability(event_id)
+        previous = cls._latest.get(event_id)
+        if event_id in cls._subscribers:
+            cls._latest[event_id] = current
+        if previous is not None and previous != current:
+            for queue in cls._subscribers.get(event_id, ()):
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(current)
+        return current
+
+    @classmethod
+    def _notified(cls, event_id: int) -> None:
+        if event_id not in cls._subscribers or event_id in cls._scheduled:
+            return
+        interval = 1 / settings.availability.MAX_UPDATES_PER_SECOND
+        delay = max(0.0, cls._last_refresh.get(event_id, 0.0) + interval - time.monotonic())
+        cls._scheduled[event_id] = asyncio.get_running_loop().call_later(delay, cls._start_refresh, event_id)
+
+    @classmethod
+    def _start_refresh(cls, event_id: int) -> None:
+        task = asyncio.create_task(cls._scheduled_refresh(event_id))
+        cls._refresh_tasks.add(task)
+        task.add_done_callback(cls._refresh_tasks.discard)
+
+    @classmethod
+    async def _scheduled_refresh(cls, event_id: int) -> None:
+        # notifications arriving during the refresh schedule the next one
+        cls._scheduled.pop(event_id, None)
+        try:
+            await cls._refresh(event_id)
+        except Exception as e:
+            await cls.logger.aerror("Availability refresh failed", event_id=event_id, error=str(e))
+
+    @classmethod
+    def _ensure_listener(cls) -> None:
+        if cls._listener is None or cls._listener.done():
+            cls._listener = asyncio.create_task(cls._listen(), name="availability:listen")
+
+    @classmethod
+    async def _listen(cls) -> None:
+        dsn = make_url(settings.postgres.DSN).set(drivername="postgresql").render_as_string(hide_password=False)
+
+        def on_notification(connection: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+            cls._notified(int(payload))
+
+        backoff = 1.0
+        while cls._subscribers:
+            try:
+                connection = await asyncpg.connect(dsn)
+                try:
+                    await connection.add_listener(cls.CHANNEL, on_notification)
+                    backoff = 1.0
+                    # changes missed while reconnecting
+                    for event_id in list(cls._subscribers):
+                        cls._notified(event_id)
+                    while cls._subscribers and not connection.is_closed():
+                        await asyncio.sleep(settings.availability.KEEPALIVE)
+                finally:
+                    await cls._close(connection)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # the listener outlives any failure, otherwise subscribers silently stop getting updates
+                await cls.logger.aerror("Availability listener failed", error=str(e), retry_in=backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    @staticmethod
+    async def _close(connection: asyncpg.Connection) -> None:
+        try:
+            await connection.close(timeout=5)
+        except Exception:
+            # a broken connection may fail to close gracefully
+            connection.terminate()
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._listener is not None:
+            cls._listener.cancel()
+            await asyncio.gather(cls._listener, return_exceptions=True)
+            cls._listener = None
+        for handle in cls._scheduled.values():
+            handle.cancel()
+        cls._scheduled.clear()
+        for task in list(cls._refresh_tasks):
+            task.cancel()
+        await asyncio.gather(*cls._refresh_tasks, return_exceptions=True)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+import msgspec
+from litestar.exceptions import ClientException
+from sqlalchemy import insert, update
+
+from app.lib.schema import CamelizedBaseStruct
+
+if TYPE_CHECKING:
+    from advanced_alchemy.base import ModelProtocol
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+NDJSON_MEDIA_TYPES = frozenset({"application/x-ndjson", "application/ndjson", "application/jsonl"})
+
+
+class BulkItemStatus(StrEnum):
+    CREATED = "created"
+    UPDATED = "updated"
+    ERROR = "error"
+
+
+class BulkItemResult(CamelizedBaseStruct):
+    index: int
+    status: BulkItemStatus
+    id: int | None = None
+    error: str | None = None
+
+
+class BulkImportResult(CamelizedBaseStruct):
+    created: int
+    updated: int
+    failed: int
+    items: list[BulkItemResult]
+
+    @classmethod
+    def from_items(cls, items: list[BulkItemResult]) -> BulkImportResult:
+        items.sort(key=lambda item: item.index)
+        return cls(
+            created=sum(item.status == BulkItemStatus.CREATED for item in items),
+            updated=sum(item.status == BulkItemStatus.UPDATED for item in items),
+            failed=sum(item.status == BulkItemStatus.ERROR for item in items),
+            items=items,
+        )
+
+
+class BulkService:
+    """Decoding and multi-row writes shared by the ``/bulk`` endpoints."""
+    _array_decoder = msgspec.json.Decoder(list[msgspec.Raw])
+    _decoders: dict[type, msgspec.json.Decoder] = {}
+
+    @classmethod
+    def decode[T](cls, body: bytes, content_type: str, type_: type[T]) -> tuple[list[tuple[int, T]], list[BulkItemResult]]:
+        """Split a JSON array or NDJSON body into valid items and per-item errors.
+
+        Returns:
+            ``(index, item)`` pairs for valid items and error results for the rest.
+
+        Raises:
+            ClientException: The body is not a JSON array.
+        """
+        decoder = cls._decoders.get(type_)
+        if decoder is None:
+            decoder = cls._decoders[type_] = msgspec.json.Decoder(type_)
+
+        if content_type.split(";")[0].strip() in NDJSON_MEDIA_TYPES:
+            chunks: list[bytes | msgspec.Raw] = [line for line in body.splitlines() if line.strip()]
+        else:
+            try:
+                chunks = cls._array_decoder.decode(body)
+            except msgspec.DecodeError as e:
+                raise ClientException(status_code=400, detail=f"Expected a JSON array: {e}") from e
+
+        items: list[tuple[int, T]] = []
+        errors: list[BulkItemResult] = []
+        for index, chunk in enumerate(chunks):
+            try:
+                items.append((index, decoder.decode(chunk)))
+            except msgspec.DecodeError as e:
+                # malformed JSON (a broken NDJSON line) as well as invalid fields
+                errors.append(BulkItemResult(index=index, status=BulkItemStatus.ERROR, error=str(e)))
+        return items, errors
+
+    @classmethod
+    async def insert_many(
+        cls, session: AsyncSession, model: type[ModelProtocol], rows: list[dict[str, Any]]
+    ) -> list[int]:
+        """Multi-row ``INSERT ... RETURNING id``; ids come back in the order of ``rows``."""
+        if not rows:
+            return []
+        result = await session.execute(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            rows,
+        )
+        return list(result.scalars())
+
+    @classmethod
+    async def update_many(cls, session: AsyncSession, model: type[ModelProtocol], rows: list[dict[str, Any]]) -> None:
+        """Executemany ``UPDATE`` by primary key, every row must contain ``id``."""
+        if rows:
+            await session.execute(update(model), rows)
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import bisect
+import datetime
+import hashlib
+import hmac
+import struct
+import time
+from array import array
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+import structlog
+from sqlalchemy import bindparam, func, or_, select, update
+
+from app.config.alchemy import alchemy
+from app.config.settings import get_settings
+from app.db.models import EventTicket
+from app.db.models.event_ticket import EventTicketStatus
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+
+class TicketToken:
+    """``base64url(event_id, ticket_id, HMAC-SHA256[:16])``: verified without the database."""
+    _payload = struct.Struct(">QQ")
+    _mac_size = 16
+    _key = (
+        settings.checkin.SECRET.encode()
+        or hashlib.sha256(b"checkin:" + settings.yookassa.SECRET_KEY.encode()).digest()
+    )
+
+    @classmethod
+    def sign(cls, event_id: int, ticket_id: int) -> str:
+        payload = cls._payload.pack(event_id, ticket_id)
+        mac = hmac.digest(cls._key, payload, "sha256")[:cls._mac_size]
+        return base64.urlsafe_b64encode(payload + mac).rstrip(b"=").decode()
+
+    @classmethod
+    def verify(cls, token: str) -> tuple[int, int] | None:
+        """``(event_id, ticket_id)`` of a valid token, ``None`` otherwise."""
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        except (ValueError, TypeError):
+            return None
+        if len(raw) != cls._payload.size + cls._mac_size:
+            return None
+        payload, mac = raw[:cls._payload.size], raw[cls._payload.size:]
+        if not hmac.compare_digest(mac, hmac.digest(cls._key, payload, "sha256")[:cls._mac_size]):
+            return None
+        return cls._payload.unpack(payload)
+
+
+class CheckInStatus(StrEnum):
+    CHECKED_IN = "checked_in"
+    ALREADY_CHECKED_IN = "already_checked_in"
+    INVALID_TOKEN = "invalid_token"
+    WRONG_EVENT = "wrong_event"
+    NOT_PAID = "not_paid"
+
+
+@dataclass
+class AttendeeIndex:
+    """PAID ticket ids of one event as a sorted ``array('q')`` with a parallel check-in flag per ticket."""
+    ticket_ids: array
+    checked_in: bytearray
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    def position(self, ticket_id: int) -> int | None:
+        position = bisect.bisect_left(self.ticket_ids, ticket_id)
+        if position < len(self.ticket_ids) and self.ticket_ids[position] == ticket_id:
+            return position
+        return None
+
+    def add(self, ticket_id: int) -> None:
+        if self.position(ticket_id) is None:
+            position = bisect.bisect_left(self.ticket_ids, ticket_id)
+            self.ticket_ids.insert(position, ticket_id)
+            self.checked_in.insert(position, 0)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() - self.loaded_at > settings.checkin.INDEX_TTL
+
+
+class CheckInService:
+    """Door scanning: token check without the database, check-ins arbitrated by the database.
+
+    A check-in is a conditional UPDATE of ``checked_in_at`` of a PAID ticket, so it succeeds
+    once across all workers and a refunded ticket is refused right away. The per-worker
+    in-memory index only answers repeated scans of tickets already checked in. Earlier
+    offline scans of those are buffered and written every ``CHECKIN_FLUSH_INTERVAL``
+    seconds; the earliest ``checked_in_at`` of a ticket wins.
+    """
+    logger = logger.bind(service="checkin_service")
+    _indexes: dict[int, AttendeeIndex] = {}
+    _loading: dict[int, asyncio.Lock] = {}
+    _pending: dict[int, datetime.datetime] = {}
+    _task: asyncio.Task | None = None
+
+    @classmethod
+    async def check_in(
+        cls, session: AsyncSession, event_id: int, token: str, scanned_at: datetime.datetime | None = None
+    ) -> tuple[CheckInStatus, int | None]:
+        """Validate a scanned token for ``event_id`` and record the check-in; idempotent per ticket."""
+        verified = TicketToken.verify(token)
+        if verified is None:
+            return CheckInStatus.INVALID_TOKEN, None
+        token_event_id, ticket_id = verified
+        if token_event_id != event_id:
+            return CheckInStatus.WRONG_EVENT, ticket_id
+
+        index = await cls._index(session, event_id)
+        position = index.position(ticket_id)
+        if position is not None and index.checked_in[position]:
+            if scanned_at is not None:
+                # an offline scan may be earlier than the recorded one
+                cls._remember(ticket_id, scanned_at)
+            return CheckInStatus.ALREADY_CHECKED_IN, ticket_id
+
+        # the database decides: one winner across workers, and refunds are seen at once
+        ticket = EventTicket.__table__
+        checked_in = await session.scalar(
+            update(ticket)
+            .where(
+                ticket.c.id == ticket_id,
+                ticket.c.event_id == event_id,
+                ticket.c.status == EventTicketStatus.PAID,
+                ticket.c.checked_in_at.is_(None),
+            )
+            .values(checked_in_at=scanned_at or func.now())
+            .returning(ticket.c.id)
+        )
+        if checked_in is None:
+            status = await session.scalar(
+                select(ticket.c.status).where(ticket.c.id == ticket_id, ticket.c.event_id == event_id)
+            )
+            if status != EventTicketStatus.PAID:
+                return CheckInStatus.NOT_PAID, ticket_id
+            if scanned_at is not None:
+                cls._remember(ticket_id, scanned_at)
+        index.add(ticket_id)
+        index.checked_in[index.position(ticket_id)] = 1
+        if checked_in is None:
+            return CheckInStatus.ALREADY_CHECKED_IN, ticket_id
+        return CheckInStatus.CHECKED_IN, ticket_id
+
+    @classmethod
+    def _remember(cls, ticket_id: int, scanned_at: datetime.datetime) -> None:
+        current = cls._pending.get(ticket_id)
+        if current is None or scanned_at < current:
+            cls._pending[ticket_id] = scanned_at
+
+    @classmethod
+    def ticket_paid(cls, event_id: int, ticket_id: int) -> None:
+        """Add a freshly paid ticket to the index of this worker, if the event is loaded."""
+        if (index := cls._indexes.get(event_id)) is not None:
+            index.add(ticket_id)
+
+    @classmethod
+    async def preload(cls, session: AsyncSession, event_id: int) -> AttendeeIndex:
+        cls._indexes.pop(event_id, None)
+        return await cls._index(session, event_id)
+
+    @classmethod
+    async def _index(cls, session: AsyncSession, event_id: int) -> AttendeeIndex:
+        index = cls._indexes.get(event_id)
+        if index is not None and not index.expired:
+            return index
+        async with cls._loading.setdefault(event_id, asyncio.Lock()):
+            index = cls._indexes.get(event_id)
+            if index is not None and not index.expired:
+                return index
+            rows = await session.execute(
+                select(EventTicket.id, EventTicket.checked_in_at.is_not(None))
+                .where(EventTicket.event_id == event_id, EventTicket.status == EventTicketStatus.PAID)
+                .order_by(EventTicket.id)
+            )
+            ticket_ids, checked_in = array("q"), bytearray()
+            for ticket_id, is_checked_in in rows:
+                ticket_ids.append(ticket_id)
+                checked_in.append(is_checked_in or ticket_id in cls._pending)
+            index = cls._indexes[event_id] = AttendeeIndex(ticket_ids=ticket_ids, checked_in=checked_in)
+            await cls.logger.ainfo("Attendee index loaded", event_id=event_id, tickets=len(ticket_ids))
+            return index
+
+    @classmethod
+    async def flush(cls) -> int:
+        """Write buffered check-ins; returns how many were written."""
+        if not cls._pending:
+            return 0
+        pending, cls._pending = cls._pending, {}
+        statement = (
+            update(EventTicket.__table__)
+            .where(
+                EventTicket.__table__.c.id == bindparam("ticket_id"),
+                or_(
+                    EventTicket.__table__.c.checked_in_at.is_(None),
+                    EventTicket.__table__.c.checked_in_at > bindparam("scanned_at"),
+                ),
+            )
+            .values(checked_in_at=bindparam("scanned_at"))
+        )
+        rows = [{"ticket_id": ticket_id, "scanned_at": scanned_at} for ticket_id, scanned_at in pending.items()]
+        try:
+            async with alchemy.get_session() as session:
+                for offset in range(0, len(rows), settings.checkin.FLUSH_BATCH_SIZE):
+                    await session.execute(statement, rows[offset:offset + settings.checkin.FLUSH_BATCH_SIZE])
+                await session.commit()
+        except Exception:
+            for ticket_id, scanned_at in pending.items():
+                cls._remember(ticket_id, scanned_at)
+            raise
+        return len(rows)
+
+    @classmethod
+    def start(cls) -> None:
+        if cls._task is None:
+            cls._task = asyncio.create_task(cls._loop(), name="checkin:flush")
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            await asyncio.gather(cls._task, return_exceptions=True)
+            cls._task = None
+        await cls.flush()
+
+    @classmethod
+    async def _loop(cls) -> None:
+        while True:
+            await asyncio.sleep(settings.checkin.FLUSH_INTERVAL)
+            try:
+                await cls.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await cls.logger.aerror("Check-in flush failed", pending=len(cls._pending), error=str(e))
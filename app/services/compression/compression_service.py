@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import gzip
+import importlib.util
+from collections import OrderedDict
+from typing import Any
+
+from litestar import Request, Response
+from litestar.enums import MediaType
+from litestar.serialization import encode_json
+
+from app.config.settings import get_settings
+
+settings = get_settings()
+
+BROTLI_AVAILABLE = importlib.util.find_spec("brotli") is not None
+COMPRESSIBLE_MEDIA_TYPES = frozenset({
+    "application/json",
+    "application/problem+json",
+    "application/x-ndjson",
+    "application/vnd.oai.openapi+json",
+    "application/javascript",
+    "image/svg+xml",
+})
+
+
+def is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_MEDIA_TYPES
+
+
+class CompressionService:
+    """Compressed bodies stored once per ``(url, ETag, encoding)`` and served until the ETag changes.
+
+    Responses built here already carry ``Content-Encoding``, the compression middleware
+    passes them through untouched.
+    """
+    _entries: OrderedDict[tuple[str, str, str], bytes] = OrderedDict()
+
+    @classmethod
+    def negotiate(cls, request: Request) -> str | None:
+        """``br`` or ``gzip`` if the client accepts it, ``None`` for identity."""
+        accepted: dict[str, float] = {}
+        for item in request.headers.get("accept-encoding", "").split(","):
+            name, _, params = item.partition(";")
+            quality = 1.0
+            if params.strip().startswith("q="):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            accepted[name.strip().lower()] = quality
+        if BROTLI_AVAILABLE and settings.compression.BACKEND == "brotli" and accepted.get("br", 0) > 0:
+            return "br"
+        if accepted.get("gzip", 0) > 0:
+            return "gzip"
+        return None
+
+    @classmethod
+    def compress(cls, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            import brotli
+
+            return brotli.compress(
+                body, mode=brotli.MODE_TEXT, quality=settings.compression.PRECOMPRESSED_BROTLI_QUALITY
+            )
+        return gzip.compress(body, compresslevel=settings.compression.PRECOMPRESSED_GZIP_LEVEL, mtime=0)
+
+    @classmethod
+    def cached(cls, request: Request, etag: str) -> Response[Any] | None:
+        """The stored compressed response for this URL and ETag, if any."""
+        encoding = cls.negotiate(request)
+        if encoding is None:
+            return None
+        key = (str(request.url), etag, encoding)
+        body = cls._entries.get(key)
+        if body is None:
+            return None
+        cls._entries.move_to_end(key)
+        return cls._response(body, etag, encoding)
+
+    @classmethod
+    def respond(cls, request: Request, etag: str, data: Any) -> Response[Any]:
+        """Encode ``data`` as JSON, compress and store it when the client accepts compression."""
+        body = encode_json(data)
+        encoding = cls.negotiate(request)
+        if encoding is None or len(body) < settings.compression.MINIMUM_SIZE:
+            return cls._response(body, etag, None)
+
+        body = cls.compress(body, encoding)
+        cls._entries[(str(request.url), etag, encoding)] = body
+        while len(cls._entries) > settings.compression.PRECOMPRESSED_ENTRIES:
+            cls._entries.popitem(last=False)
+        return cls._response(body, etag, encoding)
+
+    @classmethod
+    def _response(cls, body: bytes, etag: str, encoding: str | None) -> Response[Any]:
+        headers = {"ETag": etag, "Vary": "Accept-Encoding"}
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=MediaType.JSON, headers=headers)
@@ -3,10 +3,13 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 import aiosmtplib
 from email.message import EmailMessage
+from email.utils import make_msgid
 import structlog
 
 from app.config.settings import get_settings
 from app.db.models.event_ticket import EventTicket, EventTicketStatus
+from app.services.checkin.checkin_service import TicketToken
+from app.services.qr.qr_service import QrService
 
 if TYPE_CHECKING:
     from app.db.models.event import Event
@@ -26,13 +29,14 @@ class EmailService:
             cls._smtp = aiosmtplib.SMTP(
                 hostname=settings.email.SMTP_HOST,
                 port=settings.email.SMTP_PORT,
-                use_tls=True
+                use_tls=settings.email.SMTP_USE_TLS
             )
             await cls._smtp.connect()
-            await cls._smtp.login(
-                settings.email.SMTP_USER,
-                settings.email.SMTP_PASSWORD
-            )
+            if settings.email.SMTP_USER:
+                await cls._smtp.login(
+                    settings.email.SMTP_USER,
+                    settings.email.SMTP_PASSWORD
+                )
         return cls._smtp
 
     @classmethod
@@ -48,8 +52,14 @@ class EmailService:
         event = ticket.event
         user = ticket.user
         
+        # QR-код для входа (из кэша, если билет уже отправлялся)
+        qr_png, qr_cid = None, None
+        if ticket.status == EventTicketStatus.PAID:
+            qr_png = await QrService.ticket_png(event.id, ticket.id)
+            qr_cid = make_msgid(domain="ticket")
+
         # Создаем HTML шаблон письма
-        html = cls._get_ticket_template(event, user, ticket)
+        html = cls._get_ticket_template(event, user, ticket, qr_cid)
         
         # Создаем сообщение
         message = EmailMessage()
@@ -57,6 +67,10 @@ class EmailService:
         message["From"] = settings.email.SMTP_USER
         message["To"] = user.email
         message.set_content(html, subtype="html")
+        if qr_png is not None:
+            message.add_related(
+                qr_png, maintype="image", subtype="png", cid=qr_cid, filename=f"ticket-{ticket.id}.png"
+            )
         
         # Получаем SMTP соединение и отправляем
         smtp = await cls.get_smtp()
@@ -83,12 +97,68 @@ class EmailService:
             raise e
 
     @classmethod
-    def _get_ticket_template(cls, event: Event, user: User, ticket: EventTicket) -> str:
+    async def send_waitlist_offer(cls, user: User, event: Event, payment_url: str) -> None:
+        """Письмо из листа ожидания: место освободилось, ссылка на оплату"""
+        message = EmailMessage()
+        message["Subject"] = f"Освободилось место на мероприятие \"{event.title}\""
+        message["From"] = settings.email.SMTP_USER
+        message["To"] = user.email
+        message.set_content(
+            f"""
+            <p>{user.first_name}, на мероприятие «{event.title}» освободилось место.</p>
+            <p>Бронь действует {settings.waitlist.RESERVATION_TTL // 60} мин.:
+            <a href="{payment_url}">перейти к оплате</a>.</p>
+            """,
+            subtype="html"
+        )
+
+        smtp = await cls.get_smtp()
+        try:
+            await smtp.send_message(message)
+            await cls.logger.ainfo("Waitlist offer sent", event_id=event.id, user_id=user.id, email=user.email)
+        except Exception as e:
+            await cls.logger.aerror(
+                "Failed to send waitlist offer",
+                event_id=event.id,
+                user_id=user.id,
+                email=user.email,
+                error=str(e)
+            )
+            await cls.close_smtp()
+            raise e
+
+    @classmethod
+    async def send_pro_expired(cls, user_id: int, email: str, first_name: str) -> None:
+        """Уведомление об окончании Pro-доступа"""
+        message = EmailMessage()
+        message["Subject"] = "Pro-доступ закончился"
+        message["From"] = settings.email.SMTP_USER
+        message["To"] = email
+        message.set_content(
+            f"""
+            <p>{first_name}, срок вашего Pro-доступа истек.</p>
+            <p>Материалы для Pro и цены для Pro снова станут доступны после продления подписки.</p>
+            """,
+            subtype="html"
+        )
+
+        smtp = await cls.get_smtp()
+        try:
+            await smtp.send_message(message)
+            await cls.logger.ainfo("Pro expiry notice sent", user_id=user_id, email=email)
+        except Exception as e:
+            await cls.logger.aerror("Failed to send pro expiry notice", user_id=user_id, email=email, error=str(e))
+            await cls.close_smtp()
+            raise e
+
+    @classmethod
+    def _get_ticket_template(cls, event: Event, user: User, ticket: EventTicket, qr_cid: str | None = None) -> str:
         """Генерация HTML шаблона письма"""
         status_text = {
             EventTicketStatus.WAITING_PAYMENT: "Ожидает оплаты",
             EventTicketStatus.PAID: "Оплачен",
-            EventTicketStatus.REFUNDED: "Возвращен"
+            EventTicketStatus.REFUNDED: "Возвращен",
+            EventTicketStatus.EXPIRED: "Бронь истекла"
         }[ticket.status]
 
         status_color = '#22c55e' if ticket.status == EventTicketStatus.PAID else '#dc2626'
@@ -190,6 +260,19 @@ class EmailService:
                                             </tr>
                                         </table>
 
+                                        {f'''
+                                        <!-- Код для входа -->
+                                        <table width="100%" cellpadding="0" cellspacing="0" style="margin-bottom: 30px;">
+                                            <tr>
+                                                <td align="center">
+                                                    <div style="color: #64748b; font-size: 12px; text-transform: uppercase; letter-spacing: 1px; margin-bottom: 8px;">Код для входа</div>
+                                                    {f'<img src="cid:{qr_cid[1:-1]}" width="240" height="240" alt="QR-код билета" style="display: block; margin: 0 auto 12px;">' if qr_cid else ''}
+                                                    <div style="color: #0f172a; font-size: 14px; font-family: monospace; word-break: break-all;">{TicketToken.sign(event.id, ticket.id)}</div>
+                                                </td>
+                                            </tr>
+                                        </table>
+                                        ''' if ticket.status == EventTicketStatus.PAID else ''}
+
                                         {f'''
                                         <!-- Ссылка на чат -->
                                         <table width="100%" cellpadding="0" cellspacing="0" style="margin-bottom: 30px;">
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import time
+from typing import TYPE_CHECKING
+
+import structlog
+from sqlalchemy import func, literal, select, union
+
+from app.config.alchemy import alchemy
+from app.config.settings import get_settings
+from app.db.models import ProSubscription, User
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from decimal import Decimal
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.db.models import Event
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class EntitlementService:
+    """Who is Pro: a per-worker snapshot ``user_id -> (starts_at, expires_at)`` of current Pro windows.
+
+    Built from unexpired ``ProSubscription`` rows and the ``User.pro_flag`` column, refreshed in
+    the background every ``ENTITLEMENT_REFRESH_INTERVAL`` seconds for users whose rows changed
+    since the last refresh (``updated_at``), fully every ``ENTITLEMENT_FULL_REFRESH_INTERVAL``.
+    Checks are a dict lookup.
+    """
+    logger = logger.bind(service="entitlement_service")
+    # catch rows committed with an ``updated_at`` slightly older than the watermark
+    WATERMARK_OVERLAP = datetime.timedelta(seconds=5)
+
+    _windows: dict[int, tuple[datetime.datetime, datetime.datetime]] = {}
+    _watermark: datetime.datetime | None = None
+    _full_refresh_at: float = 0.0
+    _lock = asyncio.Lock()
+    _task: asyncio.Task | None = None
+
+    @classmethod
+    def is_pro(cls, user_id: int | None, at: datetime.datetime | None = None) -> bool:
+        window = cls._windows.get(user_id) if user_id is not None else None
+        if window is None:
+            return False
+        at = at or datetime.datetime.now(datetime.timezone.utc)
+        return window[0] <= at < window[1]
+
+    @classmethod
+    def price_for(cls, event: Event, user_id: int | None) -> Decimal:
+        return event.pro_price if cls.is_pro(user_id) else event.price
+
+    @classmethod
+    async def ensure_loaded(cls, session: AsyncSession) -> None:
+        """Load the snapshot on first use in this worker, later calls return immediately."""
+        if cls._watermark is None:
+            await cls.refresh(session)
+
+    @classmethod
+    def grant(cls, user_id: int, starts_at: datetime.datetime, expires_at: datetime.datetime) -> None:
+        """Apply a subscription written by this worker without waiting for the next refresh."""
+        current = cls._windows.get(user_id)
+        if current is not None:
+            starts_at, expires_at = min(current[0], starts_at), max(current[1], expires_at)
+        cls._windows[user_id] = (starts_at, expires_at)
+
+    @classmethod
+    def revoke(cls, user_ids: Iterable[int]) -> None:
+        """Drop users demoted by this worker; their subscriptions come back with the next refresh."""
+        for user_id in user_ids:
+            cls._windows.pop(user_id, None)
+
+    @classmethod
+    async def refresh(cls, session: AsyncSession) -> None:
+        async with cls._lock:
+            now = datetime.datetime.now(datetime.timezone.utc)
+            full = cls._watermark is None or time.monotonic() - cls._full_refresh_at > settings.entitlement.FULL_REFRESH_INTERVAL
+            watermark = await session.scalar(
+                select(func.greatest(
+                    select(func.max(ProSubscription.updated_at)).scalar_subquery(),
+                    select(func.max(User.updated_at)).scalar_subquery(),
+                ))
+            )
+
+            subscriptions = (
+                select(
+                    ProSubscription.user_id,
+                    func.min(ProSubscription.starts_at),
+                    func.max(ProSubscription.expires_at),
+                )
+                .where(ProSubscription.expires_at > now)
+                .group_by(ProSubscription.user_id)
+            )
+            flags = select(User.id, literal(EPOCH), User.pro_expired_at).where(
+                User.pro_flag.is_(True), User.pro_expired_at > now
+            )
+            touched: list[int] = []
+            if not full:
+                if watermark is None or watermark <= cls._watermark:
+                    return
+                since = cls._watermark - cls.WATERMARK_OVERLAP
+                touched = list(await session.scalars(union(
+                    select(ProSubscription.user_id).where(ProSubscription.updated_at > since),
+                    select(User.id).where(User.updated_at > since),
+                )))
+                subscriptions = subscriptions.where(ProSubscription.user_id.in_(touched))
+                flags = flags.where(User.id.in_(touched))
+
+            windows: dict[int, tuple[datetime.datetime, datetime.datetime]] = {}
+            for user_id, starts_at, expires_at in (await session.execute(union(subscriptions, flags))).all():
+                current = windows.get(user_id)
+                if current is not None:
+                    starts_at, expires_at = min(current[0], starts_at), max(current[1], expires_at)
+                windows[user_id] = (starts_at, expires_at)
+
+            if full:
+                cls._windows = windows
+                cls._full_refresh_at = time.monotonic()
+            else:
+                for user_id in touched:
+                    cls._windows.pop(user_id, None)
+                cls._windows.update(windows)
+            cls._watermark = watermark or EPOCH
+
+    @classmethod
+    def start(cls) -> None:
+        if cls._task is None:
+            cls._task = asyncio.create_task(cls._loop(), name="entitlement:refresh")
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            await asyncio.gather(cls._task, return_exceptions=True)
+            cls._task = None
+
+    @classmethod
+    async def _loop(cls) -> None:
+        while True:
+            try:
+                async with alchemy.get_session() as session:
+                    await cls.refresh(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await cls.logger.aerror("Entitlement refresh failed", error=str(e))
+            await asyncio.sleep(settings.entitlement.REFRESH_INTERVAL)
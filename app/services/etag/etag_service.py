@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import hashlib
+import zlib
+from typing import TYPE_CHECKING, Any
+
+from litestar import Request, Response
+from litestar.status_codes import HTTP_304_NOT_MODIFIED
+from sqlalchemy import func, select, text
+
+from app.db.models import Event, EventMaterial, EventSpeaker, EventTicket, Speaker, TableVersion
+
+if TYPE_CHECKING:
+    from advanced_alchemy.base import ModelProtocol
+    from sqlalchemy import TextClause
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class ETagService:
+    """Weak validators of collection endpoints.
+
+    A validator is derived from ``max(updated_at)`` and the ``table_version`` of the tables a
+    response is built from: any insert, update or delete changes it. The version row is
+    bumped once per statement by a trigger, so reading it costs one index lookup however
+    large the table grows. Everything is read in one statement, ``updated_at`` is indexed
+    on each table.
+    """
+    TABLES: tuple[type[ModelProtocol], ...] = (Event, EventSpeaker, Speaker, EventMaterial, EventTicket)
+    TRIGGER_LOCK_KEY = zlib.crc32(b"table_version_triggers")
+    # Installed at startup by ``ensure_triggers``; updates are seen through ``updated_at``
+    VERSION_FUNCTION_SQL = text("""
+        CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO table_version (id, table_name, version, created_at, updated_at)
+            VALUES (nextval('table_version_id_seq'), TG_TABLE_NAME, 1, now(), now())
+            ON CONFLICT (table_name) DO UPDATE SET version = table_version.version + 1, updated_at = now();
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    @classmethod
+    def trigger_sql(cls, table_name: str) -> TextClause:
+        # created once: dropping it on every start would lock the table exclusively
+        return text(f"""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT FROM pg_trigger WHERE tgname = '{table_name}_version' AND tgrelid = '{table_name}'::regclass
+                ) THEN
+                    CREATE TRIGGER {table_name}_version
+                    AFTER INSERT OR DELETE OR TRUNCATE ON {table_name}
+                    FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version();
+                END IF;
+            END
+            $$
+        """)
+
+    @classmethod
+    async def ensure_triggers(cls, session: AsyncSession) -> None:
+        # workers start together
+        await session.execute(select(func.pg_advisory_xact_lock(cls.TRIGGER_LOCK_KEY)))
+        await session.execute(cls.VERSION_FUNCTION_SQL)
+        for model in cls.TABLES:
+            await session.execute(cls.trigger_sql(model.__tablename__))
+
+    @classmethod
+    async def compute(cls, session: AsyncSession, *models: type[ModelProtocol], variant: str = "") -> str:
+        """``variant`` tells apart responses of the same URL built for different audiences.
+
+        ``models`` must be in ``TABLES``, the only tables with a version trigger.
+        """
+        columns = []
+        for model in models:
+            columns.append(select(func.max(model.updated_at)).scalar_subquery())
+            columns.append(
+                select(TableVersion.version).where(TableVersion.table_name == model.__tablename__).scalar_subquery()
+            )
+        row = (await session.execute(select(*columns))).one()
+        digest = hashlib.blake2b(repr((variant, *row)).encode(), digest_size=12).hexdigest()
+        return f'W/"{digest}"'
+
+    @classmethod
+    def matches(cls, request: Request, etag: str) -> bool:
+        """Weak comparison against ``If-None-Match``."""
+        header = request.headers.get("if-none-match")
+        if not header:
+            return False
+        if header.strip() == "*":
+            return True
+        opaque = etag.removeprefix("W/")
+        return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+    @classmethod
+    def not_modified(cls, etag: str) -> Response[Any]:
+        return Response(content=None, status_code=HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import csv
+import datetime
+import io
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import msgspec
+from sqlalchemy import select
+
+from app.config.alchemy import alchemy
+from app.config.settings import get_settings
+from app.db.models import EventTicket, Payment, User
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from sqlalchemy import Select
+
+settings = get_settings()
+
+
+class PaymentExportRow(msgspec.Struct):
+    id: int
+    yookassa_id: str
+    amount: Decimal
+    payment_status: str
+    payment_type: str
+    payment_source: str
+    ticket_id: int | None
+    subscription_id: int | None
+    event_id: int | None
+    user_id: int | None
+    created_at: datetime.datetime
+    metadata: dict
+
+
+class ExportService:
+    """Streaming exports read through a server-side cursor, one ``EXPORT_BATCH_SIZE`` batch at a time.
+
+    Exports open their own session: the request session is closed as soon as the
+    response starts, before the body is streamed.
+    """
+    ATTENDEE_COLUMNS = (
+        "ticket_id", "status", "amount_paid", "registered_at",
+        "user_id", "first_name", "last_name", "email", "telegram_id", "contact_info",
+    )
+    _encoder = msgspec.json.Encoder(decimal_format="number")
+
+    @classmethod
+    async def attendees_csv(cls, event_id: int) -> AsyncIterator[bytes]:
+        statement = (
+            select(
+                EventTicket.id,
+                EventTicket.status,
+                EventTicket.amount_paid,
+                EventTicket.created_at,
+                User.id,
+                User.first_name,
+                User.last_name,
+                User.email,
+                User.telegram_id,
+                User.contact_info,
+            )
+            .join(User, User.id == EventTicket.user_id)
+            .where(EventTicket.event_id == event_id)
+            .order_by(EventTicket.id)
+        )
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(cls.ATTENDEE_COLUMNS)
+        async for batch in cls._batches(statement):
+            writer.writerows(batch)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    @classmethod
+    async def payments_ndjson(
+        cls,
+        created_after: datetime.datetime | None = None,
+        created_before: datetime.datetime | None = None,
+        event_id: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        statement = (
+            select(
+                Payment.id,
+                Payment.yookassa_id,
+                Payment.amount,
+                Payment.payment_status,
+                Payment.payment_type,
+                Payment.payment_source,
+                Payment.ticket_id,
+                Payment.subscription_id,
+                EventTicket.event_id,
+                EventTicket.user_id,
+                Payment.created_at,
+                Payment.payment_metadata,
+            )
+            .outerjoin(EventTicket, EventTicket.id == Payment.ticket_id)
+            .order_by(Payment.created_at, Payment.id)
+        )
+        # created_at bounds prune payment partitions
+        if created_after is not None:
+            statement = statement.where(Payment.created_at >= created_after)
+        if created_before is not None:
+            statement = statement.where(Payment.created_at < created_before)
+        if event_id is not None:
+            statement = statement.where(EventTicket.event_id == event_id)
+
+        async for batch in cls._batches(statement):
+            yield cls._encoder.encode_lines([PaymentExportRow(*row) for row in batch])
+
+    @classmethod
+    async def _batches(cls, statement: Select) -> AsyncIterator[list]:
+        async with alchemy.get_session() as session:
+            result = await session.stream(
+                statement.execution_options(yield_per=settings.app.EXPORT_BATCH_SIZE)
+            )
+            async for partition in result.partitions():
+                yield partition
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+from typing import TYPE_CHECKING
+
+import structlog
+from sqlalchemy import func, insert, select
+
+from app.config.alchemy import alchemy
+from app.config.settings import get_settings
+from app.db.models import FunnelEvent
+from app.db.models.funnel_event import FunnelStep
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+
+class FunnelService:
+    """Registration funnel log.
+
+    ``record`` only appends to a per-worker buffer; the buffer is written every
+    ``FUNNEL_FLUSH_INTERVAL_MS`` (or as soon as ``FUNNEL_FLUSH_BATCH_SIZE`` rows are waiting)
+    with multi-row ``INSERT ... VALUES`` statements.
+    """
+    logger = logger.bind(service="funnel_service")
+    SOURCE_LENGTH = 100
+
+    _buffer: list[dict] = []
+    _dropped: int = 0
+    _wakeup: asyncio.Event | None = None
+    _task: asyncio.Task | None = None
+
+    @classmethod
+    def record(
+        cls,
+        step: FunnelStep,
+        source: str | None,
+        event_id: int | None = None,
+        user_id: int | None = None,
+        ticket_id: int | None = None,
+    ) -> None:
+        if len(cls._buffer) >= settings.funnel.MAX_BUFFER:
+            cls._dropped += 1
+            return
+        cls._buffer.append({
+            "step": step,
+            "source": cls.normalize_source(source),
+            "event_id": event_id,
+            "user_id": user_id,
+            "ticket_id": ticket_id,
+            "occurred_at": datetime.datetime.now(datetime.timezone.utc),
+        })
+        if len(cls._buffer) >= settings.funnel.FLUSH_BATCH_SIZE and cls._wakeup is not None:
+            cls._wakeup.set()
+
+    @classmethod
+    def normalize_source(cls, source: str | None) -> str:
+        return (source or "").strip().lower()[:cls.SOURCE_LENGTH] or "unknown"
+
+    @classmethod
+    async def flush(cls) -> int:
+        """Write buffered events; returns how many were written."""
+        if not cls._buffer:
+            return 0
+        rows, cls._buffer = cls._buffer, []
+        try:
+            async with alchemy.get_session() as session:
+                for offset in range(0, len(rows), settings.funnel.FLUSH_BATCH_SIZE):
+                    # one multi-row VALUES statement per batch
+                    await session.execute(
+                        insert(FunnelEvent.__table__).values(rows[offset:offset + settings.funnel.FLUSH_BATCH_SIZE])
+                    )
+                await session.commit()
+        except Exception:
+            # keep them for the next flush, newest first to go if the buffer is full
+            cls._buffer = [*rows, *cls._buffer][:settings.funnel.MAX_BUFFER]
+            raise
+        if cls._dropped:
+            await cls.logger.awarning("Funnel events dropped", dropped=cls._dropped)
+            cls._dropped = 0
+        return len(rows)
+
+    @classmethod
+    async def rollup(
+        cls,
+        session: AsyncSession,
+        event_id: int | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+    ) -> list[tuple[str, FunnelStep, int]]:
+        """``(source, step, count)`` over the given event and period."""
+        statement = (
+            select(FunnelEvent.source, FunnelEvent.step, func.count())
+            .group_by(FunnelEvent.source, FunnelEvent.step)
+            .order_by(FunnelEvent.source)
+        )
+        if event_id is not None:
+            statement = statement.where(FunnelEvent.event_id == event_id)
+        if since is not None:
+            statement = statement.where(FunnelEvent.occurred_at >= since)
+        if until is not None:
+            statement = statement.where(FunnelEvent.occurred_at < until)
+        return [tuple(row) for row in await session.execute(statement)]
+
+    @classmethod
+    def start(cls) -> None:
+        if cls._task is None:
+            cls._wakeup = asyncio.Event()
+            cls._task = asyncio.create_task(cls._loop(), name="funnel:flush")
+
+    @classmethod
+    async def stop(cls) -> None:
+        if cls._task is not None:
+            cls._task.cancel()
+            await asyncio.gather(cls._task, return_exceptions=True)
+            cls._task = None
+        await cls.flush()
+
+    @classmethod
+    async def _loop(cls) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(cls._wakeup.wait(), timeout=settings.funnel.FLUSH_INTERVAL_MS / 1000)
+            except TimeoutError:
+                pass
+            cls._wakeup.clear()
+            try:
+                await cls.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await cls.logger.aerror("Funnel flush failed", pending=len(cls._buffer), error=str(e))
+                await asyncio.sleep(settings.funnel.FLUSH_INTERVAL_MS / 1000)
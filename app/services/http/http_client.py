@@ -1,4 +1,5 @@
 import asyncio
+from collections.abc import AsyncIterator
 from typing import Any, Type, List, Callable
 from aiohttp import ClientSession, TCPConnector, ClientTimeout, ClientResponse, ClientError
 import socket
@@ -6,6 +7,7 @@ import socket
 import msgspec
 import structlog
 
+from app.config.settings import get_settings
 from app.lib.utils.exceptions import (
     BaseServiceException,
     ErrorBaseServiceBadRequest,
@@ -13,20 +15,81 @@ from app.lib.utils.exceptions import (
     ErrorBaseServiceUnavailable
 )
 from app.lib.utils.serialization import encode
+from app.services.http.json_stream import JsonItemStream
+from app.services.http.tracing import HttpTracing
 
+settings = get_settings()
 logger = structlog.get_logger()
 
 
 class HttpClient:
     _session: ClientSession | None = None
+    _encoder = msgspec.json.Encoder()
+    # one decoder per response type and shape: the type is validated and compiled once
+    _decoders: dict[tuple[Any, bool], msgspec.json.Decoder] = {}
+    STREAM_CHUNK_SIZE = 64 * 1024
+    # timeouts are retried, the last one is raised
+    ATTEMPTS = 2
     logger = logger.bind(service="http_client")
 
     @classmethod
     def inizialize_session(cls) -> None:
         if not cls._session:
             timeout = ClientTimeout(total=30)
-            connector = TCPConnector(family=socket.AF_INET, limit_per_host=100)
-            cls._session = ClientSession(timeout=timeout, connector=connector, json_serialize=encode)
+            connector = TCPConnector(
+                family=socket.AF_INET,
+                limit=settings.http_client.LIMIT,
+                limit_per_host=settings.http_client.LIMIT_PER_HOST,
+                ttl_dns_cache=settings.http_client.DNS_CACHE_TTL,
+                keepalive_timeout=settings.http_client.KEEPALIVE_TIMEOUT,
+            )
+            cls._session = ClientSession(
+                timeout=timeout, connector=connector, json_serialize=encode,
+                trace_configs=[HttpTracing.trace_config()]
+            )
+
+    @classmethod
+    async def warm_up(cls, *urls: str, connections: int | None = None) -> None:
+        """Open ``connections`` keep-alive connections to each upstream before the first real request.
+
+        DNS, TCP and TLS are paid here instead of by the first registrations after a deploy.
+        The responses are discarded; failures are logged and leave the pool cold.
+        """
+        connections = settings.http_client.WARMUP_CONNECTIONS if connections is None else connections
+
+        async def connect(url: str) -> None:
+            call = HttpTracing.start("HEAD", url, attempt=1)
+            try:
+                # concurrent requests hold their connections, so each one opens a new connection
+                async with cls._session.head(url, allow_redirects=False, trace_request_ctx=call) as response:
+                    call.status = response.status
+            except (ClientError, asyncio.TimeoutError) as e:
+                call.error = type(e).__name__
+            finally:
+                await HttpTracing.finish(call)
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(connect(url) for url in urls for _ in range(connections))),
+                timeout=settings.http_client.WARMUP_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            await cls.logger.awarning("Connection warm-up timed out", urls=list(urls))
+        await cls.logger.ainfo("Connection pool warmed up", pool=cls.pool_state())
+
+    @classmethod
+    def pool_state(cls) -> dict[str, dict[str, int]]:
+        """Connections of the shared session per host: ``in_use`` and ``idle`` (kept alive)."""
+        if cls._session is None:
+            return {}
+        connector = cls._session.connector
+        state: dict[str, dict[str, int]] = {}
+        # aiohttp has no public accessor for the pool contents
+        for key, acquired in connector._acquired_per_host.items():
+            state.setdefault(key.host, {"in_use": 0, "idle": 0})["in_use"] += len(acquired)
+        for key, idle in connector._conns.items():
+            state.setdefault(key.host, {"in_use": 0, "idle": 0})["idle"] += len(idle)
+        return state
 
     @classmethod
     async def close_session(cls) -> None:
@@ -34,59 +97,123 @@ class HttpClient:
             await cls._session.close()
             cls._session = None
     
+    @classmethod
+    def decoder(cls, type_: Any, is_list: bool = False) -> msgspec.json.Decoder:
+        key = (type_, is_list)
+        decoder = cls._decoders.get(key)
+        if decoder is None:
+            decoder = cls._decoders[key] = msgspec.json.Decoder(List[type_] if is_list else type_)
+        return decoder
+
+    @classmethod
+    def encode_body(cls, body: bytes | msgspec.Struct) -> bytes:
+        """Structs are encoded straight to JSON bytes, bytes are sent as is."""
+        return body if isinstance(body, bytes) else cls._encoder.encode(body)
+
     @classmethod
     async def make_json_request[T](
         cls, url: str, method: str, type_: Type[T],
         is_list: bool = False, headers: dict[str, Any] = None,
         params: dict[str, Any] = None, data: dict[str, Any] = None,
-        json: dict[str, Any] = None
+        json: dict[str, Any] = None, body: bytes | msgspec.Struct | None = None
     ) -> T:
-        async def _parse_msgspec_response[T](response: ClientResponse, type__: Type[T]) -> T:
+        async def _parse_msgspec_response(response: ClientResponse) -> T:
             response_data = await response.read()
 
-            if type__ is None and 200 <= response.status < 300:
+            if type_ is None and 200 <= response.status < 300:
                 return None
 
-            return msgspec.json.decode(response_data, type=type__)
+            return cls.decoder(type_, is_list).decode(response_data)
+
+        if body is not None:
+            data = cls.encode_body(body)
+            headers = {"Content-Type": "application/json", **(headers or {})}
 
         return await cls._make_request(
             url, method, headers, params, data, json,
-            response_handler=lambda response: _parse_msgspec_response(
-                response=response,
-                type__=List[type_] if is_list else type_
-            )
+            response_handler=_parse_msgspec_response
         )
 
+    @classmethod
+    async def stream_json_items[T](
+        cls, url: str, method: str, type_: Type[T], items: JsonItemStream | None = None,
+        headers: dict[str, Any] = None, params: dict[str, Any] = None,
+        body: bytes | msgspec.Struct | None = None
+    ) -> AsyncIterator[T]:
+        """Decode the items of a list response while it is being received.
+
+        Only the item in flight is held in memory. Pass ``items`` to read the rest of
+        the response (e.g. the next page cursor) with ``items.envelope`` afterwards.
+        Not retried: items may already have been handed out when a transfer fails.
+        """
+        items = items or JsonItemStream()
+        items.decoder, items.list_decoder = cls.decoder(type_), cls.decoder(type_, is_list=True)
+        data = None
+        if body is not None:
+            data = cls.encode_body(body)
+            headers = {"Content-Type": "application/json", **(headers or {})}
+        call = HttpTracing.start(method, url, attempt=1)
+        try:
+            async with cls._session.request(
+                    method, url, headers=HttpTracing.inject(headers, call), params=params, data=data,
+                    trace_request_ctx=call
+            ) as response:
+                call.status = response.status
+                await cls._handle_response(response)
+                async for chunk in response.content.iter_chunked(cls.STREAM_CHUNK_SIZE):
+                    call.bytes_in += len(chunk)
+                    for item in items.feed(chunk):
+                        yield item
+        except asyncio.TimeoutError:
+            call.error = "timeout"
+            await cls.logger.aerror("Upstream request timed out", **call.context())
+            raise ErrorBaseServiceRequestTimeout
+        except ClientError as e:
+            call.error = type(e).__name__
+            await cls.logger.aerror("Upstream client error", detail=str(e), **call.context())
+            raise ErrorBaseServiceBadRequest(f"Client error: {e}")
+        finally:
+            await HttpTracing.finish(call)
+
     @classmethod
     async def _make_request(cls, url: str, method: str, headers: dict = None,
-                            params: dict = None, data: dict = None, json: dict = None,
+                            params: dict = None, data: dict | bytes = None, json: dict = None,
                             response_handler: Callable[[ClientResponse], Any] = None) -> Any:
-        for attempt in range(1, 3):
+        retry_reason = None
+        for attempt in range(1, cls.ATTEMPTS + 1):
+            call = HttpTracing.start(method, url, attempt, retry_reason)
             try:
                 async with cls._session.request(
                         method, url,
-                        headers=headers, params=params, data=data, json=json, timeout=ClientTimeout(total=60)
+                        headers=HttpTracing.inject(headers, call), params=params, data=data, json=json,
+                        timeout=ClientTimeout(total=60), trace_request_ctx=call
                 ) as response:
+                    call.status = response.status
                     response = await cls._handle_response(response)
                     return await response_handler(response) if response_handler else None
 
             except asyncio.TimeoutError:
-                await cls.logger.aerror("Request timed out")
-                if attempt == 3:
+                call.error = retry_reason = "timeout"
+                await cls.logger.aerror("Upstream request timed out", **call.context())
+                if attempt == cls.ATTEMPTS:
                     raise ErrorBaseServiceRequestTimeout
                 await asyncio.sleep(2 ** attempt)
 
             except ClientError as e:
-                await cls.logger.aerror(f"Client error: {e}")
+                call.error = type(e).__name__
+                await cls.logger.aerror("Upstream client error", detail=str(e), **call.context())
                 raise ErrorBaseServiceBadRequest(f"Client error: {e}")
 
             except Exception as e:
                 if isinstance(e, BaseServiceException):
-                    await cls.logger.aerror(f"Unexpected error: {e}")
+                    call.error = call.error or type(e).__name__
                     raise e
-                await cls.logger.aerror(f"Service error: {e}")
+                call.error = type(e).__name__
+                await cls.logger.aerror("Upstream call failed", detail=str(e), **call.context())
                 raise BaseServiceException
 
+            finally:
+                await HttpTracing.finish(call)
 
     @classmethod
     async def _handle_response(cls, response: ClientResponse) -> ClientResponse:
@@ -94,8 +221,10 @@ class HttpClient:
         if 200 <= response.status < 300:
             return response
         elif 400 <= response.status < 500:
-            await cls.logger.aerror(f"Client error: {response.status}, text: {await response.text()}")
+            await cls.logger.aerror(
+                "Upstream client error", url=str(response.url), status=response.status, text=await response.text()
+            )
             raise ErrorBaseServiceBadRequest(f"Client error: {response.status}")
         elif 500 <= response.status < 600:
-            await cls.logger.aerror(f"Server error: {response.status}")
+            await cls.logger.aerror("Upstream server error", url=str(response.url), status=response.status)
             raise ErrorBaseServiceUnavailable(f"Server error: {response.status}")
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING, Any
+
+import msgspec
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# complete strings and plain bytes are skipped by the regex engine; matching stops at the structural
+# bytes that matter on a level, or at the quote of a string that has not been received completely
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+_SHALLOW = re.compile(rb'[^"{}\[\],]*')
+_ITEMS = re.compile(rb'(?:"[^"\\]*(?:\\.[^"\\]*)*"|[^"{}\[\],])*')
+_NESTED = re.compile(rb'(?:"[^"\\]*(?:\\.[^"\\]*)*"|[^"{}\[\]])*')
+_WHITESPACE = b" \t\r\n"
+
+
+class JsonItemStream:
+    """Decodes the items of one array member of a JSON object (``{"items": [...], ...}``) as chunks arrive.
+
+    Only the chunk being received is buffered. The complete items of a chunk are decoded
+    with one ``list_decoder`` call: the chunk is cut at its last ``}, {`` and the cut is
+    right exactly when ``[`` + items + ``]`` decodes. Otherwise, and for the tail of the
+    array, items are delimited by a scanner that skips strings with regular expressions.
+    The rest of the object is kept with the array emptied for ``envelope``.
+    """
+
+    def __init__(
+        self,
+        key: str = "items",
+        decoder: msgspec.json.Decoder | None = None,
+        list_decoder: msgspec.json.Decoder | None = None,
+    ) -> None:
+        self._key = key.encode()
+        self.decoder = decoder or msgspec.json.Decoder()
+        self.list_decoder = list_decoder or msgspec.json.Decoder(list)
+        self._buffer = bytearray()
+        self._position = 0
+        self._depth = 0
+        self._last_string: bytes | None = None
+        self._item_start: int | None = None
+        self._prefix: bytes | None = None
+        self._done = False
+
+    def feed(self, chunk: bytes) -> Iterator[Any]:
+        buffer = self._buffer
+        buffer += chunk
+        if self._done:
+            return
+        if self._item_start is not None:
+            yield from self._complete_items()
+        position = self._position
+        while True:
+            if self._depth > 2:
+                index = _NESTED.match(buffer, position).end()
+            elif self._depth == 2 and self._item_start is not None:
+                index = _ITEMS.match(buffer, position).end()
+            else:
+                index = _SHALLOW.match(buffer, position).end()
+            if index >= len(buffer):
+                position = index
+                break
+            char = buffer[index]
+            if char == 0x22:
+                string = _STRING.match(buffer, index)
+                if string is None:
+                    # wait for the rest of the string
+                    position = index
+                    break
+                if self._depth == 1 and self._prefix is None:
+                    self._last_string = string.group()[1:-1]
+                position = string.end()
+                continue
+
+            if char in b"{[":
+                self._depth += 1
+                if char == 0x5B and self._depth == 2 and self._prefix is None and self._last_string == self._key:
+                    self._prefix = bytes(buffer[:index + 1])
+                    self._item_start = index + 1
+            elif char in b"}]":
+                if self._item_start is not None and self._depth == 2:
+                    yield from self._item(index)
+                    # the array is closed: keep ``]`` and the rest for the envelope
+                    del buffer[:index]
+                    self._item_start = None
+                    self._done = True
+                    return
+                self._depth -= 1
+            elif self._item_start is not None and self._depth == 2:
+                yield from self._item(index)
+                self._item_start = index + 1
+            position = index + 1
+        if self._item_start:
+            # drop the items handed out, once per chunk
+            del buffer[:self._item_start]
+            position -= self._item_start
+            self._item_start = 0
+        self._position = position
+
+    def _complete_items(self) -> Iterator[Any]:
+        buffer, start = self._buffer, self._item_start
+        # the last ``}, {``: between two objects of the array, unless inside an item or a string
+        end = len(buffer)
+        # an opening brace at ``start`` has no item before it; nothing below ``start`` is looked at
+        while (opening := buffer.rfind(b"{", start + 1, end)) != -1:
+            comma = self._skip_whitespace_back(opening - 1, start)
+            if comma > start and buffer[comma] == 0x2C:
+                close = self._skip_whitespace_back(comma - 1, start)
+                if buffer[close] == 0x7D:
+                    break
+            end = opening
+        else:
+            return
+        try:
+            items = self.list_decoder.decode(b"[" + buffer[start:close + 1] + b"]")
+        except msgspec.DecodeError:
+            # the cut is inside an item or a string, or an item is invalid: the scanner sorts it out
+            return
+        yield from items
+        self._item_start = self._position = comma + 1
+        self._depth = 2
+
+    def _skip_whitespace_back(self, index: int, start: int) -> int:
+        while index > start and self._buffer[index] in _WHITESPACE:
+            index -= 1
+        return index
+
+    def _item(self, end: int) -> Iterator[Any]:
+        item = bytes(self._buffer[self._item_start:end]).strip(_WHITESPACE)
+        if item:
+            yield self.decoder.decode(item)
+
+    def envelope(self, type_: Any = dict) -> Any:
+        """The object without the items, e.g. to read a pagination cursor."""
+        if self._prefix is None or not self._done:
+            raise ValueError(f"JSON array {self._key.decode()!r} was not received completely")
+        return msgspec.json.decode(self._prefix + bytes(self._buffer), type=type_)
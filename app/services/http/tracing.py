@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import random
+import secrets
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+import structlog
+from aiohttp import TraceConfig
+
+from app.config.settings import get_settings
+
+if TYPE_CHECKING:
+    from types import SimpleNamespace
+
+    from aiohttp import ClientSession
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """W3C trace context of the current span."""
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+
+    @classmethod
+    def new(cls, parent: SpanContext | None = None) -> SpanContext:
+        if parent is None:
+            return cls(trace_id=secrets.token_hex(16), span_id=secrets.token_hex(8))
+        return cls(trace_id=parent.trace_id, span_id=secrets.token_hex(8), sampled=parent.sampled)
+
+    @classmethod
+    def from_traceparent(cls, header: str | None) -> SpanContext | None:
+        parts = (header or "").strip().split("-")
+        if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or set(parts[1]) == {"0"}:
+            return None
+        try:
+            sampled = bool(int(parts[3], 16) & 1)
+        except ValueError:
+            return None
+        return cls(trace_id=parts[1].lower(), span_id=parts[2].lower(), sampled=sampled)
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+# span of the incoming request being handled, set by ``TraceContextMiddleware``
+current_span: ContextVar[SpanContext | None] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class UpstreamCall:
+    """One attempt of an outgoing request; filled by the aiohttp trace hooks."""
+    method: str
+    url: str
+    attempt: int
+    retry_reason: str | None = None
+    span: SpanContext = field(default_factory=SpanContext.new)
+    parent_span_id: str | None = None
+    started: float = field(default_factory=time.perf_counter)
+    duration: float = 0.0
+    status: int | None = None
+    error: str | None = None
+    reused_connection: bool = False
+    bytes_out: int = 0
+    bytes_in: int = 0
+    # seconds per phase: queue (pool wait), connect (DNS + TCP + TLS), dns (part of connect, on cache misses),
+    # upstream (request headers sent -> response headers received: the upstream processing time)
+    phases: dict[str, float] = field(default_factory=dict)
+    _marks: dict[str, float] = field(default_factory=dict, repr=False)
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.url).netloc
+
+    def mark(self, phase: str) -> None:
+        self._marks[phase] = time.perf_counter()
+
+    def measure(self, phase: str) -> None:
+        if (started := self._marks.pop(phase, None)) is not None:
+            self.phases[phase] = self.phases.get(phase, 0.0) + time.perf_counter() - started
+
+    def context(self) -> dict[str, Any]:
+        return {
+            "method": self.method,
+            "url": self.url.split("?", 1)[0],
+            "attempt": self.attempt,
+            "retry_reason": self.retry_reason,
+            "status": self.status,
+            "error": self.error,
+            "duration_ms": round(self.duration * 1e3, 2),
+            "phases_ms": {phase: round(seconds * 1e3, 2) for phase, seconds in self.phases.items()},
+            "reused_connection": self.reused_connection,
+            "bytes_out": self.bytes_out,
+            "bytes_in": self.bytes_in,
+            "trace_id": self.span.trace_id,
+            "span_id": self.span.span_id,
+            "parent_span_id": self.parent_span_id,
+        }
+
+
+class HttpMetrics:
+    """Per-worker aggregates of upstream calls, rendered in the Prometheus text format."""
+    BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    _requests: dict[tuple[str, str, str], int] = defaultdict(int)
+    _retries: dict[tuple[str, str], int] = defaultdict(int)
+    _duration_buckets: dict[str, list[int]] = {}
+    _duration_sum: dict[str, float] = defaultdict(float)
+    _phase_sum: dict[tuple[str, str], float] = defaultdict(float)
+    _reused: dict[str, int] = defaultdict(int)
+    _opened: dict[str, int] = defaultdict(int)
+    _bytes: dict[tuple[str, str], int] = defaultdict(int)
+
+    @classmethod
+    def observe(cls, call: UpstreamCall) -> None:
+        host = call.host
+        cls._requests[(host, call.method, str(call.status or call.error or "error"))] += 1
+        if call.retry_reason:
+            cls._retries[(host, call.retry_reason)] += 1
+        buckets = cls._duration_buckets.setdefault(host, [0] * (len(cls.BUCKETS) + 1))
+        buckets[bisect_left(cls.BUCKETS, call.duration)] += 1
+        cls._duration_sum[host] += call.duration
+        for phase, seconds in call.phases.items():
+            cls._phase_sum[(host, phase)] += seconds
+        cls._reused[host] += call.reused_connection
+        cls._opened[host] += "connect" in call.phases
+        cls._bytes[(host, "out")] += call.bytes_out
+        cls._bytes[(host, "in")] += call.bytes_in
+
+    @classmethod
+    def render(cls, pool: dict[str, dict[str, int]] | None = None) -> str:
+        """``pool`` is the connection pool state by host, see ``HttpClient.pool_state``."""
+        lines = ["# TYPE upstream_http_requests_total counter"]
+        for (host, method, status), count in cls._requests.items():
+            lines.append(f'upstream_http_requests_total{{host="{host}",method="{method}",status="{status}"}} {count}')
+        lines.append("# TYPE upstream_http_retries_total counter")
+        for (host, reason), count in cls._retries.items():
+            lines.append(f'upstream_http_retries_total{{host="{host}",reason="{reason}"}} {count}')
+        lines.append("# TYPE upstream_http_request_duration_seconds histogram")
+        for host, buckets in cls._duration_buckets.items():
+            cumulative = 0
+            for bound, count in zip((*cls.BUCKETS, "+Inf"), buckets):
+                cumulative += count
+                lines.append(f'upstream_http_request_duration_seconds_bucket{{host="{host}",le="{bound}"}} {cumulative}')
+            lines.append(f'upstream_http_request_duration_seconds_sum{{host="{host}"}} {cls._duration_sum[host]:.6f}')
+            lines.append(f'upstream_http_request_duration_seconds_count{{host="{host}"}} {cumulative}')
+        lines.append("# TYPE upstream_http_phase_seconds_total counter")
+        for (host, phase), seconds in cls._phase_sum.items():
+            lines.append(f'upstream_http_phase_seconds_total{{host="{host}",phase="{phase}"}} {seconds:.6f}')
+        lines.append("# TYPE upstream_http_reused_connections_total counter")
+        for host, count in cls._reused.items():
+            lines.append(f'upstream_http_reused_connections_total{{host="{host}"}} {count}')
+        lines.append("# TYPE upstream_http_opened_connections_total counter")
+        for host, count in cls._opened.items():
+            lines.append(f'upstream_http_opened_connections_total{{host="{host}"}} {count}')
+        lines.append("# TYPE upstream_http_pool_connections gauge")
+        for host, states in (pool or {}).items():
+            for state, count in states.items():
+                lines.append(f'upstream_http_pool_connections{{host="{host}",state="{state}"}} {count}')
+        lines.append("# TYPE upstream_http_bytes_total counter")
+        for (host, direction), count in cls._bytes.items():
+            lines.append(f'upstream_http_bytes_total{{host="{host}",direction="{direction}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+class HttpTracing:
+    """Instrumentation of ``HttpClient`` calls.
+
+    Every attempt is a client span: a child of the incoming request span, propagated to
+    the upstream in ``traceparent``, observed in ``HttpMetrics`` and logged with its phase
+    timings. Calls slower than ``TRACING_SLOW_CALL_MS`` are logged as warnings for a
+    ``TRACING_SLOW_CALL_SAMPLE_RATE`` share of them.
+    """
+    logger = logger.bind(service="http_tracing")
+
+    @classmethod
+    def start(cls, method: str, url: str, attempt: int, retry_reason: str | None = None) -> UpstreamCall:
+        parent = current_span.get()
+        return UpstreamCall(
+            method=method,
+            url=url,
+            attempt=attempt,
+            retry_reason=retry_reason,
+            span=SpanContext.new(parent),
+            parent_span_id=parent.span_id if parent else None,
+        )
+
+    @classmethod
+    def inject(cls, headers: dict[str, Any] | None, call: UpstreamCall) -> dict[str, Any]:
+        return {**(headers or {}), "traceparent": call.span.traceparent}
+
+    @classmethod
+    async def finish(cls, call: UpstreamCall) -> None:
+        call.duration = time.perf_counter() - call.started
+        HttpMetrics.observe(call)
+        if call.duration * 1e3 >= settings.tracing.SLOW_CALL_MS:
+            if random.random() < settings.tracing.SLOW_CALL_SAMPLE_RATE:
+                await cls.logger.awarning("Slow upstream call", **call.context())
+        elif settings.tracing.LOG_SPANS:
+            await cls.logger.ainfo("Upstream call", **call.context())
+
+    @classmethod
+    def trace_config(cls) -> TraceConfig:
+        config = TraceConfig()
+
+        def hook(action):
+            async def on_event(session: ClientSession, context: SimpleNamespace, params: Any) -> None:
+                if isinstance(call := context.trace_request_ctx, UpstreamCall):
+                    action(call, params)
+            return on_event
+
+        def count_out(call: UpstreamCall, params: Any) -> None:
+            call.bytes_out += len(params.chunk)
+
+        def count_in(call: UpstreamCall, params: Any) -> None:
+            call.bytes_in += len(params.chunk)
+
+        def reused(call: UpstreamCall, params: Any) -> None:
+            call.reused_connection = True
+
+        def failed(call: UpstreamCall, params: Any) -> None:
+            call.error = type(params.exception).__name__
+
+        config.on_connection_queued_start.append(hook(lambda call, _: call.mark("queue")))
+        config.on_connection_queued_end.append(hook(lambda call, _: call.measure("queue")))
+        config.on_dns_resolvehost_start.append(hook(lambda call, _: call.mark("dns")))
+        config.on_dns_resolvehost_end.append(hook(lambda call, _: call.measure("dns")))
+        config.on_connection_create_start.append(hook(lambda call, _: call.mark("connect")))
+        config.on_connection_create_end.append(hook(lambda call, _: call.measure("connect")))
+        config.on_connection_reuseconn.append(hook(reused))
+        config.on_request_headers_sent.append(hook(lambda call, _: call.mark("upstream")))
+        config.on_request_end.append(hook(lambda call, _: call.measure("upstream")))
+        config.on_request_chunk_sent.append(hook(count_out))
+        config.on_response_chunk_received.append(hook(count_in))
+        config.on_request_exception.append(hook(failed))
+        return config
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import structlog
+from sqlalchemy import false, func, select, update
+
+from app.config.settings import get_settings
+from app.db.models import User
+from app.services.email.email_service import EmailService
+from app.services.entitlement.entitlement_service import EntitlementService
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Row
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+
+class ProExpiryService:
+    """Demotes users whose Pro period is over.
+
+    Until then ``User.is_pro`` is derived from ``pro_expired_at`` at read time, so nothing
+    depends on how late the job runs. Users are demoted in batches of ``PRO_EXPIRY_BATCH_SIZE``
+    picked through the partial ``ix_user_pro_expired_at`` index; each batch is committed separately.
+    """
+    logger = logger.bind(service="pro_expiry_service")
+
+    @classmethod
+    def demotion_statement(cls, limit: int):
+        user = User.__table__
+        expired = (
+            select(user.c.id)
+            .where(user.c.is_pro, user.c.pro_expired_at <= func.now())
+            .order_by(user.c.pro_expired_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("expired")
+        )
+        return (
+            update(user)
+            .where(user.c.id == expired.c.id)
+            .values(is_pro=false(), pro_expired_at=None, updated_at=func.now())
+            .returning(user.c.id, user.c.email, user.c.first_name)
+        )
+
+    @classmethod
+    async def demote_expired(cls, session: AsyncSession) -> list[Row]:
+        demoted: list[Row] = []
+        while True:
+            rows = (await session.execute(cls.demotion_statement(settings.pro.EXPIRY_BATCH_SIZE))).all()
+            await session.commit()
+            demoted.extend(rows)
+            EntitlementService.revoke(row.id for row in rows)
+            if len(rows) < settings.pro.EXPIRY_BATCH_SIZE:
+                return demoted
+
+    @classmethod
+    async def run(cls, session: AsyncSession) -> None:
+        """Scheduler job: demote expired users and let them know."""
+        demoted = await cls.demote_expired(session)
+        if not demoted:
+            return
+        await cls.logger.ainfo("Pro expired", users=len(demoted))
+        for row in demoted:
+            if not row.email:
+                continue
+            try:
+                await EmailService.send_pro_expired(row.id, row.email, row.first_name)
+            except Exception:
+                # already logged by EmailService
+                continue
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+import io
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import segno
+
+from app.config.settings import get_settings
+from app.services.checkin.checkin_service import TicketToken
+
+settings = get_settings()
+
+
+class QrService:
+    """PNG QR codes of ticket tokens, rendered in a thread pool and kept in an LRU cache by ticket id.
+
+    Concurrent requests for the same ticket (bulk resends, email + download) share one render.
+    """
+    _executor = ThreadPoolExecutor(max_workers=settings.qr.WORKERS, thread_name_prefix="qr")
+    _cache: OrderedDict[int, bytes] = OrderedDict()
+    _rendering: dict[int, asyncio.Future[bytes]] = {}
+
+    @classmethod
+    async def ticket_png(cls, event_id: int, ticket_id: int) -> bytes:
+        if (png := cls._cache.get(ticket_id)) is not None:
+            cls._cache.move_to_end(ticket_id)
+            return png
+        future = cls._rendering.get(ticket_id)
+        if future is None:
+            future = cls._rendering[ticket_id] = asyncio.get_running_loop().run_in_executor(
+                cls._executor, cls.render, TicketToken.sign(event_id, ticket_id)
+            )
+            future.add_done_callback(lambda done: cls._rendered(ticket_id, done))
+        # a cancelled caller (a client gone from qr.png) must not cancel the render for the others
+        return await asyncio.shield(future)
+
+    @classmethod
+    def _rendered(cls, ticket_id: int, future: asyncio.Future[bytes]) -> None:
+        if cls._rendering.get(ticket_id) is future:
+            del cls._rendering[ticket_id]
+        if future.cancelled() or future.exception() is not None:
+            # the exception is retrieved here in case every caller has gone
+            return
+        cls._cache[ticket_id] = future.result()
+        while len(cls._cache) > settings.qr.CACHE_SIZE:
+            cls._cache.popitem(last=False)
+
+    @classmethod
+    def render(cls, token: str) -> bytes:
+        buffer = io.BytesIO()
+        segno.make(token, error="m").save(buffer, kind="png", scale=settings.qr.SCALE, border=settings.qr.BORDER)
+        return buffer.getvalue()
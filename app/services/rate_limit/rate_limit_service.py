@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import structlog
+
+from app.config.settings import get_settings
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+    from redis.commands.core import AsyncScript
+
+settings = get_settings()
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True, slots=True)
+class Limit:
+    """Token bucket of ``capacity`` requests refilled evenly over ``period`` seconds."""
+    capacity: int
+    period: float
+
+    @classmethod
+    def parse(cls, value: str) -> Limit:
+        """``"20/60"``: 20 requests per 60 seconds."""
+        capacity, period = value.split("/")
+        return cls(int(capacity), float(period))
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+
+class MemoryBackend:
+    """Buckets of this worker, least recently used ones evicted past ``RATE_LIMIT_MAX_KEYS``."""
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def acquire(self, checks: list[tuple[str, Limit]]) -> float:
+        now = time.monotonic()
+        retry_after = 0.0
+        refilled = []
+        for key, limit in checks:
+            tokens, updated = self._buckets.get(key, (limit.capacity, now))
+            tokens = min(limit.capacity, tokens + (now - updated) * limit.rate)
+            if tokens < 1:
+                retry_after = max(retry_after, (1 - tokens) / limit.rate)
+            refilled.append(tokens)
+        if retry_after:
+            return retry_after
+        for (key, _), tokens in zip(checks, refilled):
+            self._buckets[key] = (tokens - 1, now)
+            self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return 0.0
+
+    async def close(self) -> None:
+        self._buckets.clear()
+
+
+class RedisBackend:
+    """Buckets shared by all workers, in any server speaking the Redis protocol with Lua scripting.
+
+    All buckets of a request are checked and taken in one script call, with the server
+    clock, so concurrent workers cannot overdraw a bucket. Idle buckets expire after their period.
+    """
+    SCRIPT = """
+        local now = redis.call('TIME')
+        now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+        local retry_after, refilled = 0, {}
+        for i, key in ipairs(KEYS) do
+            local capacity, period = tonumber(ARGV[2 * i - 1]), tonumber(ARGV[2 * i])
+            local rate = capacity / period
+            local bucket = redis.call('HMGET', key, 'tokens', 'updated')
+            local tokens = tonumber(bucket[1]) or capacity
+            tokens = math.min(capacity, tokens + (now - (tonumber(bucket[2]) or now)) * rate)
+            if tokens < 1 then
+                retry_after = math.max(retry_after, (1 - tokens) / rate)
+            end
+            refilled[i] = tokens
+        end
+        if retry_after > 0 then
+            return tostring(retry_after)
+        end
+        for i, key in ipairs(KEYS) do
+            redis.call('HSET', key, 'tokens', tostring(refilled[i] - 1), 'updated', tostring(now))
+            redis.call('PEXPIRE', key, math.ceil(tonumber(ARGV[2 * i]) * 1000))
+        end
+        return '0'
+    """
+
+    def __init__(self, url: str) -> None:
+        # optional dependency: pip install 'containers-course-hw[redis]'
+        from redis.asyncio import Redis
+
+        timeout = settings.rate_limit.REDIS_TIMEOUT
+        self._client: Redis = Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self._script: AsyncScript = self._client.register_script(self.SCRIPT)
+
+    async def acquire(self, checks: list[tuple[str, Limit]]) -> float:
+        args = [value for _, limit in checks for value in (limit.capacity, limit.period)]
+        return float(await self._script(keys=[key for key, _ in checks], args=args))
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class RateLimitService:
+    """Token buckets of unauthenticated endpoints, keyed by client IP, email, user and event.
+
+    A bucket refills continuously, so the limit holds over any window of ``period``
+    seconds, and a check is O(1) per key. ``RATE_LIMIT_BACKEND=redis`` shares the
+    buckets between workers; if that server is unavailable requests are let through.
+    """
+    logger = logger.bind(service="rate_limit_service")
+
+    _backend: MemoryBackend | RedisBackend | None = None
+
+    @classmethod
+    def backend(cls) -> MemoryBackend | RedisBackend:
+        if cls._backend is None:
+            if settings.rate_limit.BACKEND == "redis":
+                cls._backend = RedisBackend(settings.rate_limit.REDIS_URL)
+            else:
+                cls._backend = MemoryBackend(settings.rate_limit.MAX_KEYS)
+        return cls._backend
+
+    @classmethod
+    async def acquire(cls, checks: list[tuple[str, Limit]]) -> float:
+        """Take a token from every bucket, or from none of them.
+
+        Returns 0 when the request is allowed, otherwise the seconds until it would be.
+        """
+        if not checks:
+            return 0.0
+        try:
+            return await cls.backend().acquire(checks)
+        except Exception as e:
+            await cls.logger.aerror("Rate limit backend failed", error=str(e))
+            return 0.0
+
+    @classmethod
+    async def close(cls) -> None:
+        if cls._backend is not None:
+            await cls._backend.close()
+            cls._backend = None
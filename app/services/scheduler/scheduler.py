@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import zlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+import structlog
+from sqlalchemy import func, select
+
+from app.config.alchemy import alchemy
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class Job:
+    name: str
+    interval: float
+    func: Callable[[AsyncSession], Awaitable[None]]
+
+    @property
+    def lock_key(self) -> int:
+        return zlib.crc32(self.name.encode())
+
+
+class Scheduler:
+    """Periodic maintenance jobs running inside the app workers.
+
+    Every worker runs the loop, but a job only executes where its
+    ``pg_try_advisory_lock`` is acquired, so it is never run twice at once.
+    """
+    _jobs: list[Job] = []
+    _tasks: list[asyncio.Task] = []
+    logger = logger.bind(service="scheduler")
+
+    @classmethod
+    def register(cls, name: str, interval: float, func: Callable[[AsyncSession], Awaitable[None]]) -> None:
+        cls._jobs.append(Job(name=name, interval=interval, func=func))
+
+    @classmethod
+    def start(cls) -> None:
+        if not cls._tasks:
+            cls._tasks = [asyncio.create_task(cls._loop(job), name=f"job:{job.name}") for job in cls._jobs]
+
+    @classmethod
+    async def stop(cls) -> None:
+        for task in cls._tasks:
+            task.cancel()
+        await asyncio.gather(*cls._tasks, return_exceptions=True)
+        cls._tasks = []
+
+    @classmethod
+    async def run_once(cls, job: Job) -> bool:
+        """Run ``job`` if no other worker is running it; returns whether it ran."""
+        engine = alchemy.get_engine()
+        async with engine.connect() as lock_connection:
+            acquired = await lock_connection.scalar(select(func.pg_try_advisory_lock(job.lock_key)))
+            await lock_connection.commit()
+            if not acquired:
+                return False
+            try:
+                async with alchemy.get_session() as session:
+                    await job.func(session)
+                    await session.commit()
+            finally:
+                await lock_connection.execute(select(func.pg_advisory_unlock(job.lock_key)))
+                await lock_connection.commit()
+        return True
+
+    @classmethod
+    async def _loop(cls, job: Job) -> None:
+        # first run right away: a fresh worker must not wait a whole interval (e.g. for payment partitions)
+        while True:
+            try:
+                await cls.run_once(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await cls.logger.aerror("Job failed", job=job.name, error=str(e))
+            await asyncio.sleep(job.interval)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from app.config.settings import get_settings
+
+settings = get_settings()
+
+
+class SingleFlight:
+    """Concurrent identical reads share one execution.
+
+    The first caller of a key starts ``func`` in a task of its own; callers arriving while
+    it runs await the same result (or exception). The task does not belong to any request,
+    so ``func`` must open its own session and return plain data, never ORM instances, and a
+    disconnecting caller does not cancel it for the others. Completed results are not kept.
+    """
+    _flights: dict[Hashable, asyncio.Task] = {}
+
+    @classmethod
+    async def do[T](cls, key: Hashable, func: Callable[[], Awaitable[T]], timeout: float | None = None) -> T:
+        """Raises ``TimeoutError`` for all callers of a flight running longer than ``timeout``."""
+        task = cls._flights.get(key)
+        if task is None:
+            timeout = settings.single_flight.TIMEOUT if timeout is None else timeout
+            task = cls._flights[key] = asyncio.create_task(asyncio.wait_for(func(), timeout))
+            task.add_done_callback(lambda done: cls._landed(key, done))
+        return await asyncio.shield(task)
+
+    @classmethod
+    def in_flight(cls) -> int:
+        return len(cls._flights)
+
+    @classmethod
+    def _landed(cls, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if cls._flights.get(key) is task:
+            del cls._flights[key]
+        if not task.cancelled():
+            # retrieved here in case every caller has gone
+            task.exception()
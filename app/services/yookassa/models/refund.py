@@ -0,0 +1,24 @@
+from typing import Optional
+from msgspec import Struct
+
+from app.services.yookassa.models.create_payment import Amount
+
+
+class CreateRefund(Struct):
+    payment_id: str
+    amount: Amount
+    description: Optional[str] = None
+
+
+class RefundAmount(Struct):
+    value: str
+    currency: str
+
+
+class Refund(Struct):
+    id: str
+    payment_id: str
+    status: str
+    amount: RefundAmount
+    created_at: Optional[str] = None
+    description: Optional[str] = None
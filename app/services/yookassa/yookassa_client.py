@@ -1,16 +1,28 @@
-import msgspec
 from app.services.yookassa.models.create_payment import CreatePayment
 from app.services.http.http_client import HttpClient
 from app.config.settings import get_settings
 from app.services.yookassa.models.payment import Payment
+from app.services.yookassa.models.refund import CreateRefund, Refund
 import base64
+import hashlib
 import uuid
+from collections.abc import AsyncIterator
+
+from msgspec import Struct
+
+from app.services.http.json_stream import JsonItemStream
 
 
 settings = get_settings()
 
+
+class PaymentListPage(Struct):
+    next_cursor: str | None = None
+
+
 class YooKassaClient:
-    YOOKASSA_API_URL = "https://api.yookassa.ru/v3"
+    YOOKASSA_API_URL = settings.yookassa.API_URL
+    _headers: dict[str, str] | None = None
     
     @classmethod
     async def create_payment(
@@ -27,16 +39,64 @@ class YooKassaClient:
             url,
             method="POST",
             type_=Payment,
-            json=msgspec.json.decode(msgspec.json.encode(payment)),
+            body=payment,
             headers=headers
         )
         return response
     
+    @classmethod
+    async def get_payment(cls, payment_id: str) -> Payment:
+        return await HttpClient.make_json_request(
+            f"{cls.YOOKASSA_API_URL}/payments/{payment_id}",
+            method="GET",
+            type_=Payment,
+            headers=cls.get_headers()
+        )
+
+    @classmethod
+    async def create_refund(cls, refund: CreateRefund, idempotence_key: str) -> Refund:
+        headers = cls.get_headers()
+        headers["Idempotence-Key"] = idempotence_key
+        return await HttpClient.make_json_request(
+            f"{cls.YOOKASSA_API_URL}/refunds",
+            method="POST",
+            type_=Refund,
+            body=refund,
+            headers=headers
+        )
+
+    @classmethod
+    async def list_payments(cls, params: dict[str, str] | None = None) -> AsyncIterator[Payment]:
+        """All payments matching ``params`` (``created_at.gte``, ``status``, ...), page by page.
+
+        Pages are decoded while they are received, for reconciliation over long periods.
+        """
+        params = {"limit": "100", **(params or {})}
+        while True:
+            items = JsonItemStream("items")
+            async for payment in HttpClient.stream_json_items(
+                f"{cls.YOOKASSA_API_URL}/payments", "GET", Payment,
+                items=items, headers=cls.get_headers(), params=params
+            ):
+                yield payment
+            cursor = items.envelope(PaymentListPage).next_cursor
+            if not cursor:
+                return
+            params = {**params, "cursor": cursor}
+
+    @classmethod
+    def idempotence_key(cls, *parts: object) -> str:
+        """Deterministic key: retries of the same operation get the payment created by the first attempt."""
+        return hashlib.blake2b(":".join(map(str, parts)).encode(), digest_size=24).hexdigest()
+
     @classmethod
     def get_headers(cls) -> dict:
-        auth_value = f"{settings.yookassa.SHOP_ID}:{settings.yookassa.SECRET_KEY}"
-        auth_encoded = base64.b64encode(auth_value.encode()).decode()
-        return {
-            "Authorization": f"Basic {auth_encoded}",
-            "Content-Type": "application/json"
-        }
+        """A copy of the headers, the Basic auth value is computed once."""
+        if cls._headers is None:
+            auth_value = f"{settings.yookassa.SHOP_ID}:{settings.yookassa.SECRET_KEY}"
+            auth_encoded = base64.b64encode(auth_value.encode()).decode()
+            cls._headers = {
+                "Authorization": f"Basic {auth_encoded}",
+                "Content-Type": "application/json"
+            }
+        return dict(cls._headers)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+import structlog
 from litestar.response import Response
 
 from app.domain.events.services import EventService
@@ -8,15 +9,27 @@ from app.domain.payments.services import PaymentService
 from app.domain.registrations.services import EventTicketService
 from app.db.models.payment import PaymentStatus, PaymentSource, PaymentType
 from app.db.models.event_ticket import EventTicketStatus
+from app.services.checkin.checkin_service import CheckInService
 from app.services.email.email_service import EmailService
+from app.services.funnel.funnel_service import FunnelService
+from app.db.models.funnel_event import FunnelStep
 from app.db.models.payment import Payment
+from app.services.yookassa.models.create_payment import Amount
+from app.services.yookassa.models.refund import CreateRefund
+from app.services.yookassa.yookassa_client import YooKassaClient
 if TYPE_CHECKING:
     from app.domain.events.services import EventService
     from app.domain.registrations.services import EventTicketService
     from app.domain.payments.services import PaymentService
+    from app.db.models import EventTicket
+
+
+logger = structlog.get_logger()
 
 
 class YooKassaService:
+    logger = logger.bind(service="yookassa_service")
+
     @classmethod
     async def unregister_payment_with_site(
             cls,
@@ -28,42 +41,99 @@ class YooKassaService:
         metadata = data["object"]["metadata"]
         ticket_id = int(metadata["ticket_id"])
         print(data)
-        
-        # 1. Создать платеж в базе
+        amount = data["object"]["amount"]["value"]
+
+        # 1. Обновить статус билета: истекшая бронь, возвращенный билет и чужой платеж билета
+        # не оплачиваются (место уже могло уйти листу ожидания) — платеж возвращается
+        if not await event_ticket_service.mark_paid(ticket_id, data["object"]["id"], amount):
+            ticket = await event_ticket_service.get_one(id=ticket_id)
+            # a repeated notification of the payment that paid the ticket changes nothing,
+            # so the funnel and the email are recorded once
+            if ticket.status != EventTicketStatus.PAID or ticket.yookassa_payment_id != data["object"]["id"]:
+                await cls._refuse_payment(payment_service, ticket, data)
+            return Response(
+                content="OK",
+                status_code=200
+            )
+
+        # 2. Создать платеж в базе
         payment_data = {
             "yookassa_id": data["object"]["id"],
-            "amount": data["object"]["amount"]["value"],
+            "amount": amount,
             "payment_status": PaymentStatus.SUCCEEDED,
             "payment_source": PaymentSource.WEBSITE,
             "payment_type": PaymentType.EVENT_TICKET,
+            # event_id/user_id are reachable through the ticket
             "payment_metadata": {
-                "event_id": int(metadata["event_id"]),
-                "user_id": int(metadata["user_id"]),
-                "ticket_id": ticket_id,
                 "source": metadata["source"]
             },
             "ticket_id": ticket_id
         }
-        _ = await payment_service.create(data=payment_data)
+        await payment_service.record(payment_data)
 
-        # 2. Обновить статус билета
         ticket = await event_ticket_service.get_one(id=ticket_id)
-        event_ticket_data = await event_ticket_service.get_one(id=ticket_id)
-        event_ticket_data.amount_paid = data["object"]["amount"]["value"]
-        event_ticket_data.status = EventTicketStatus.PAID
-        await event_ticket_service.update(
-            item_id=ticket_id,
-            data=event_ticket_data.to_dict()
-        )
+        CheckInService.ticket_paid(ticket.event_id, ticket_id)
+        funnel = {"event_id": ticket.event_id, "user_id": ticket.user_id, "ticket_id": ticket_id}
+        FunnelService.record(FunnelStep.PAYMENT_SUCCEEDED, metadata["source"], **funnel)
 
         # 3. Отправка сообщения на почту с билетом на мероприятие
         await EmailService.send_ticket_to_email(ticket)
+        FunnelService.record(FunnelStep.EMAIL_SENT, metadata["source"], **funnel)
         
         return Response(
             content="OK",
             status_code=200
         )
     
+    @classmethod
+    async def _refuse_payment(cls, payment_service: PaymentService, ticket: EventTicket, data: dict) -> None:
+        """Refund a payment the ticket did not accept (see ``mark_paid``); the ticket is left as is."""
+        payment_id = data["object"]["id"]
+        amount = data["object"]["amount"]
+        # deterministic key: a repeated notification does not refund twice
+        await YooKassaClient.create_refund(
+            CreateRefund(
+                payment_id=payment_id,
+                amount=Amount(value=float(amount["value"]), currency=amount["currency"]),
+                description=(
+                    "Билет уже оплачен другим платежом" if ticket.status == EventTicketStatus.PAID
+                    else "Бронь истекла до оплаты"
+                ),
+            ),
+            idempotence_key=YooKassaClient.idempotence_key("refund", payment_id),
+        )
+        await payment_service.record({
+            "yookassa_id": payment_id,
+            "amount": amount["value"],
+            "payment_status": PaymentStatus.SUCCEEDED,
+            "payment_source": PaymentSource.WEBSITE,
+            "payment_type": PaymentType.EVENT_TICKET,
+            # refund.succeeded of this payment must not touch the ticket
+            "payment_metadata": {
+                "source": data["object"]["metadata"]["source"],
+                "refused": ticket.status,
+            },
+            "ticket_id": ticket.id
+        })
+        await cls.logger.awarning("Payment refused", ticket_id=ticket.id, status=ticket.status, payment_id=payment_id)
+
+    @classmethod
+    async def refund_succeeded(
+            cls,
+            event_ticket_service: EventTicketService,
+            payment_service: PaymentService,
+            data: dict
+    ) -> int | None:
+        """Mark the refunded ticket; returns its event id so the seat can go to the waitlist."""
+        payment = await payment_service.get_one_or_none(yookassa_id=data["object"]["payment_id"])
+        if payment is None or payment.ticket_id is None or "refused" in payment.payment_metadata:
+            return None
+        ticket = await event_ticket_service.update(
+            item_id=payment.ticket_id,
+            data={"status": EventTicketStatus.REFUNDED}
+        )
+        return ticket.event_id
+
     @classmethod
     async def register_payment_with_site(cls, payment_id: str) -> None:
         pass
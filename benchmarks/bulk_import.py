@@ -0,0 +1,81 @@
+"""Single-item vs bulk import throughput against a running app.
+
+    python -m benchmarks.bulk_import --base-url http://localhost:8000/api/v1 --items 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import time
+import uuid
+
+import aiohttp
+
+
+def _events(count: int, tag: str) -> list[dict]:
+    date = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=30)
+    return [
+        {
+            "title": f"Bench {tag} {index % 50}",
+            "price": 1000,
+            "pro_price": 800,
+            "event_date": date.isoformat(),
+            "location": "Online",
+        }
+        for index in range(count)
+    ]
+
+
+async def single(session: aiohttp.ClientSession, base_url: str, items: list[dict], concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def create(item: dict) -> None:
+        async with semaphore, session.post(f"{base_url}/events", json=item) as response:
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(create(item) for item in items))
+    return time.perf_counter() - started
+
+
+async def bulk(session: aiohttp.ClientSession, base_url: str, items: list[dict], ndjson: bool) -> float:
+    if ndjson:
+        body = "\n".join(json.dumps(item) for item in items).encode()
+        headers = {"Content-Type": "application/x-ndjson"}
+    else:
+        body = json.dumps(items).encode()
+        headers = {"Content-Type": "application/json"}
+
+    started = time.perf_counter()
+    async with session.post(f"{base_url}/events/bulk", data=body, headers=headers) as response:
+        response.raise_for_status()
+        result = await response.json()
+    elapsed = time.perf_counter() - started
+    assert result["failed"] == 0, result
+    return elapsed
+
+
+async def main(base_url: str, count: int, concurrency: int) -> dict:
+    tag = uuid.uuid4().hex[:6]
+    async with aiohttp.ClientSession() as session:
+        timings = {
+            "single": await single(session, base_url, _events(count, f"{tag}-s"), concurrency),
+            "bulk_json": await bulk(session, base_url, _events(count, f"{tag}-j"), ndjson=False),
+            "bulk_ndjson": await bulk(session, base_url, _events(count, f"{tag}-n"), ndjson=True),
+        }
+    return {
+        "items": count,
+        **{name: {"seconds": round(elapsed, 3), "items_per_s": round(count / elapsed, 1)} for name, elapsed in timings.items()},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main(args.base_url, args.items, args.concurrency)), indent=2))
@@ -0,0 +1,82 @@
+"""Bytes on the wire and CPU per request: no compression, per-request compression, precompressed entries.
+
+No database needed::
+
+    python -m benchmarks.compression --page-size 50 --requests 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import time
+from typing import Any
+
+from advanced_alchemy.filters import LimitOffset
+from advanced_alchemy.service import SQLAlchemyAsyncRepositoryService
+from litestar import Litestar, Request, Response, get
+from litestar.testing import TestClient
+
+from app.domain.events.schemas import EventItem
+from app.server import compression
+from app.services.compression.compression_service import CompressionService
+from benchmarks.filters import _events
+
+ETAG = 'W/"bench"'
+ENCODINGS = {"identity": "identity", "gzip": "gzip", "br": "br, gzip"}
+
+
+def _page(page_size: int) -> Any:
+    service = SQLAlchemyAsyncRepositoryService.__new__(SQLAlchemyAsyncRepositoryService)
+    return service.to_schema(
+        data=_events(page_size), total=1000, schema_type=EventItem, filters=[LimitOffset(page_size, 0)]
+    )
+
+
+def _app(page: Any) -> Litestar:
+    @get("/dynamic", sync_to_thread=False)
+    def dynamic() -> Any:
+        return page
+
+    @get("/precompressed")
+    async def precompressed(request: Request) -> Response[Any]:
+        if cached := CompressionService.cached(request, ETAG):
+            return cached
+        return CompressionService.respond(request, ETAG, page)
+
+    return Litestar(route_handlers=[dynamic, precompressed], compression_config=compression.config)
+
+
+def _measure(client: TestClient, path: str, accept_encoding: str, requests: int) -> dict:
+    headers = {"Accept-Encoding": accept_encoding}
+    response = client.get(path, headers=headers)
+    started = time.process_time()
+    for _ in range(requests):
+        client.get(path, headers=headers)
+    return {
+        "content_encoding": response.headers.get("content-encoding", "identity"),
+        "bytes": int(response.headers.get("content-length") or len(response.content)),
+        "cpu_us_per_request": round((time.process_time() - started) / requests * 1e6, 1),
+    }
+
+
+def main(page_size: int, requests: int) -> dict:
+    page = _page(page_size)
+    with TestClient(_app(page)) as client:
+        return {
+            "page_size": page_size,
+            **{
+                path: {name: _measure(client, f"/{path}", value, requests) for name, value in ENCODINGS.items()}
+                for path in ("dynamic", "precompressed")
+            },
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    print(json.dumps(main(args.page_size, args.requests), indent=2))
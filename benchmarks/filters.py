@@ -0,0 +1,159 @@
+"""Per-request overhead of collection filters, ``to_schema`` and encoding.
+
+No database needed::
+
+    python -m benchmarks.filters --number 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import logging
+import timeit
+from typing import Annotated, Any
+
+from advanced_alchemy.filters import FilterTypes, LimitOffset
+from advanced_alchemy.service import OffsetPagination, SQLAlchemyAsyncRepositoryService
+from litestar import Litestar, get
+from litestar.di import Provide
+from litestar.params import Dependency
+from litestar.serialization import encode_json
+from litestar.testing import TestClient
+
+from app.db import models
+from app.domain.accounts.schemas import UserItem
+from app.domain.events.schemas import EventItem
+from app.server import dependencies
+
+QUERIES = {
+    "no_params": "",
+    "paged": "currentPage=3&pageSize=50",
+    "full": (
+        "currentPage=2&pageSize=20&orderBy=created_at&sortOrder=asc&searchField=title&searchString=meetup"
+        "&createdAfter=2025-01-01T00:00:00Z"
+    ),
+}
+
+
+def legacy_dependencies() -> dict[str, Provide]:
+    return {
+        **dependencies.create_collection_dependencies(),
+        dependencies.FILTERS_DEPENDENCY_KEY: Provide(dependencies.provide_filter_dependencies, sync_to_thread=False),
+    }
+
+
+def _app(depends: dict[str, Provide]) -> Litestar:
+    @get("/items", sync_to_thread=False)
+    def items(filters: Annotated[list[FilterTypes], Dependency(skip_validation=True)]) -> int:
+        return len(filters)
+
+    return Litestar(route_handlers=[items], dependencies=depends)
+
+
+def _per_call_us(func: Any, number: int) -> float:
+    return round(min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6, 2)
+
+
+def di_resolution(number: int) -> dict:
+    result: dict[str, dict] = {}
+    for name, depends in (
+        ("legacy", legacy_dependencies()),
+        ("combined", dependencies.create_collection_dependencies()),
+    ):
+        with TestClient(_app(depends)) as client:
+            result[name] = {
+                query_name: {
+                    "us_per_request": _per_call_us(lambda: client.get(f"/items?{query}"), number // 10),
+                    "filters": client.get(f"/items?{query}").json(),
+                }
+                for query_name, query in QUERIES.items()
+            }
+    return result
+
+
+def filter_construction(number: int) -> dict:
+    def legacy() -> list:
+        return dependencies.provide_filter_dependencies(
+            created_filter=dependencies.provide_created_filter(None, None),
+            updated_filter=dependencies.provide_updated_filter(None, None),
+            id_filter=dependencies.provide_id_filter(None),
+            limit_offset=dependencies.provide_limit_offset_pagination(1, 20),
+            search_filter=dependencies.provide_search_filter(None, None, None),
+            order_by=dependencies.provide_order_by(None, "desc"),
+            select_in_str_filter=dependencies.provide_select_in_str_filter(None, None),
+        )
+
+    def combined() -> list:
+        return dependencies.provide_collection_filters(
+            None, None, None, None, None, 1, 20, None, None, None, None, "desc", None, None
+        )
+
+    return {
+        "legacy": {"us_per_call": _per_call_us(legacy, number), "filters": len(legacy())},
+        "combined": {"us_per_call": _per_call_us(combined, number), "filters": len(combined())},
+    }
+
+
+def _events(count: int) -> list[models.Event]:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return [
+        models.Event(
+            id=index,
+            slug=f"event-{index}",
+            title=f"Event {index}",
+            description="Description " * 10,
+            price=1000,
+            pro_price=800,
+            event_date=now,
+            location="Online",
+            max_participants=100,
+            registrations=[
+                models.EventTicket(id=index * 100 + ticket, status="paid", amount_paid=1000) for ticket in range(20)
+            ],
+            materials=[],
+            speakers=[],
+        )
+        for index in range(count)
+    ]
+
+
+def _users(count: int) -> list[models.User]:
+    return [
+        models.User(id=index, email=f"user{index}@example.com", first_name="First", last_name="Last", is_pro=False)
+        for index in range(count)
+    ]
+
+
+def schema_conversion(number: int, page_size: int) -> dict:
+    service = SQLAlchemyAsyncRepositoryService.__new__(SQLAlchemyAsyncRepositoryService)
+    filters = [LimitOffset(page_size, 0)]
+    result = {}
+    for name, rows, schema in (("events", _events(page_size), EventItem), ("users", _users(page_size), UserItem)):
+        page: OffsetPagination = service.to_schema(data=rows, total=1000, schema_type=schema, filters=filters)
+        result[name] = {
+            "to_schema_us": _per_call_us(
+                lambda rows=rows, schema=schema: service.to_schema(data=rows, total=1000, schema_type=schema, filters=filters),
+                number // 10,
+            ),
+            "encode_us": _per_call_us(lambda page=page: encode_json(page), number),
+            "bytes": len(encode_json(page)),
+        }
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=2_000)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    print(json.dumps(
+        {
+            "di_resolution": di_resolution(args.number),
+            "filter_construction": filter_construction(args.number),
+            "schema_conversion": schema_conversion(args.number, args.page_size),
+        },
+        indent=2,
+    ))
@@ -0,0 +1,134 @@
+"""CPU per YooKassa payment request: body encoding, auth headers and response decoding, old vs current.
+
+Also decoding of a large payment listing: whole body vs streamed items (CPU and peak allocations).
+No network or database needed::
+
+    python -m benchmarks.http_client --iterations 20000 --list-size 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import time
+import timeit
+import tracemalloc
+from typing import List
+
+import msgspec
+
+from app.config.settings import get_settings
+from app.lib.utils.serialization import encode
+from app.services.http.http_client import HttpClient
+from app.services.http.json_stream import JsonItemStream
+from app.services.yookassa import Amount, Confirmation, CreatePayment, YooKassaClient
+from app.services.yookassa.models.payment import Payment
+
+settings = get_settings()
+
+PAYMENT = CreatePayment(
+    amount=Amount(value=1500.0, currency="RUB"),
+    confirmation=Confirmation(type="redirect", return_url="https://example.com"),
+    save_payment_method=False,
+    capture=True,
+    description="Оплата участия в мероприятии Benchmark",
+    metadata={"ticket_id": "1", "event_id": "2", "user_id": "3", "source": "bench"},
+)
+RESPONSE = msgspec.json.encode({
+    "id": "2d6e3c8b-000f-5000-9000-1b3f0a0c2d9e",
+    "status": "pending",
+    "amount": {"value": "1500.00", "currency": "RUB"},
+    "recipient": {"account_id": "100500", "gateway_id": "100700"},
+    "created_at": "2026-01-01T00:00:00.000Z",
+    "paid": False,
+    "refundable": False,
+    "test": True,
+    "description": "Оплата участия в мероприятии Benchmark",
+    "confirmation": {"type": "redirect", "confirmation_url": "https://yoomoney.ru/checkout/payments/v2/contract"},
+    "metadata": {"ticket_id": "1", "event_id": "2", "user_id": "3", "source": "bench"},
+})
+
+
+def _old_body() -> bytes:
+    # decode(encode(struct)) in the client, then aiohttp's json_serialize
+    body = encode(msgspec.json.decode(msgspec.json.encode(PAYMENT)))
+    return body if isinstance(body, bytes) else body.encode()
+
+
+def _old_headers() -> dict:
+    auth_value = f"{settings.yookassa.SHOP_ID}:{settings.yookassa.SECRET_KEY}"
+    return {
+        "Authorization": f"Basic {base64.b64encode(auth_value.encode()).decode()}",
+        "Content-Type": "application/json",
+    }
+
+
+def _us(func, iterations: int) -> float:
+    return round(timeit.timeit(func, number=iterations) / iterations * 1e6, 3)
+
+
+def _listing(size: int) -> bytes:
+    item = msgspec.json.decode(RESPONSE)
+    items = [{**item, "id": f"{index:08x}-000f-5000-9000-1b3f0a0c2d9e"} for index in range(size)]
+    return msgspec.json.encode({"type": "list", "items": items, "next_cursor": None})
+
+
+def _whole(body: bytes) -> int:
+    # the previous client: body read at once, list type rebuilt per call
+    return len(msgspec.json.decode(body, type=List[Payment]))
+
+
+def _streamed(body: bytes) -> int:
+    items = JsonItemStream("items", HttpClient.decoder(Payment), HttpClient.decoder(Payment, is_list=True))
+    count = 0
+    for offset in range(0, len(body), HttpClient.STREAM_CHUNK_SIZE):
+        for _ in items.feed(body[offset:offset + HttpClient.STREAM_CHUNK_SIZE]):
+            count += 1
+    return count
+
+
+def _profile(func, body: bytes) -> dict:
+    started = time.process_time()
+    func(body)
+    cpu_ms = (time.process_time() - started) * 1e3
+    tracemalloc.start()
+    func(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"cpu_ms": round(cpu_ms, 1), "peak_kib": peak // 1024}
+
+
+def main(iterations: int, list_size: int) -> dict:
+    assert json.loads(_old_body()) == json.loads(HttpClient.encode_body(PAYMENT))
+    cases = {
+        "body": (_old_body, lambda: HttpClient.encode_body(PAYMENT)),
+        "headers": (_old_headers, YooKassaClient.get_headers),
+        "decode": (
+            lambda: msgspec.json.decode(RESPONSE, type=Payment),
+            lambda: HttpClient.decoder(Payment).decode(RESPONSE),
+        ),
+    }
+    listing = _listing(list_size)
+    listing_items = msgspec.json.encode(msgspec.json.decode(listing)["items"])
+    assert _streamed(listing) == list_size
+    return {
+        **{
+            name: {"old_us": _us(old, iterations), "current_us": _us(current, iterations)}
+            for name, (old, current) in cases.items()
+        },
+        "listing": {
+            "items": list_size,
+            "body_kib": len(listing) // 1024,
+            "whole": _profile(_whole, listing_items),
+            "streamed": _profile(_streamed, listing),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--list-size", type=int, default=20000)
+    args = parser.parse_args()
+    print(json.dumps(main(args.iterations, args.list_size), indent=2))
@@ -0,0 +1,164 @@
+"""Latency of the first upstream requests after startup: previous connector vs tuned and warmed-up pool.
+
+A local TLS server stands in for the YooKassa API behind a proxy that adds ``--rtt-ms`` of
+round trip to every exchange and one more to a new connection, so TCP and TLS handshakes
+cost what they cost over the network. Requests arrive every ``--spacing-ms`` on a fresh
+session per round; keep ``--spacing-ms`` and ``HTTP_CLIENT_WARMUP_CONNECTIONS`` such that
+the expected concurrency fits the warmed pool. Needs the ``openssl`` CLI::
+
+    python -m benchmarks.http_warmup --rounds 5 --requests 50 --rtt-ms 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import socket
+import ssl
+import statistics
+import subprocess
+import tempfile
+import time
+
+import aiohttp.connector
+from aiohttp import ClientSession, ClientTimeout, TCPConnector, web
+
+from app.services.http.http_client import HttpClient
+from app.services.yookassa.models.payment import Payment
+from benchmarks.http_client import RESPONSE
+
+
+def _certificate(directory: str) -> tuple[str, str]:
+    cert, key = f"{directory}/cert.pem", f"{directory}/key.pem"
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:prime256v1", "-nodes",
+            "-days", "1", "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost",
+            "-keyout", key, "-out", cert,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+async def _upstream(cert: str, key: str, upstream_ms: float) -> tuple[web.AppRunner, int]:
+    async def create_payment(request: web.Request) -> web.Response:
+        await request.read()
+        await asyncio.sleep(upstream_ms / 1e3)
+        return web.Response(body=RESPONSE, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_post("/v3/payments", create_payment)
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0, ssl_context=context)
+    await site.start()
+    return runner, site._server.sockets[0].getsockname()[1]
+
+
+async def _latency_proxy(target_port: int, rtt_ms: float) -> asyncio.Server:
+    """Forwards bytes both ways, each direction delayed by half the round trip, order preserved."""
+    delay = rtt_ms / 2e3
+
+    async def pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        queue: asyncio.Queue[tuple[float, bytes]] = asyncio.Queue()
+
+        async def deliver() -> None:
+            while (item := await queue.get())[1]:
+                await asyncio.sleep(max(0.0, item[0] - time.monotonic()))
+                writer.write(item[1])
+            writer.close()
+
+        delivery = asyncio.create_task(deliver())
+        try:
+            while data := await reader.read(65536):
+                queue.put_nowait((time.monotonic() + delay, data))
+        except ConnectionError:
+            pass
+        queue.put_nowait((0.0, b""))
+        await delivery
+
+    async def handle(client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter) -> None:
+        # the TCP handshake: the first bytes of a connection wait one more round trip
+        await asyncio.sleep(rtt_ms / 1e3)
+        upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", target_port)
+        await asyncio.gather(
+            pipe(client_reader, upstream_writer), pipe(upstream_reader, client_writer), return_exceptions=True
+        )
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def _round(api_url: str, warm: bool, requests: int, spacing_ms: float) -> list[float]:
+    if warm:
+        HttpClient.inizialize_session()
+        await HttpClient.warm_up(api_url)
+    else:
+        # the connector before HTTP_CLIENT_* settings: default DNS TTL and keep-alive, no warm-up
+        HttpClient._session = ClientSession(
+            timeout=ClientTimeout(total=30), connector=TCPConnector(family=socket.AF_INET, limit_per_host=100)
+        )
+    latencies: list[float] = []
+
+    async def register() -> None:
+        started = time.perf_counter()
+        await HttpClient.make_json_request(f"{api_url}/payments", method="POST", type_=Payment, body=b"{}")
+        latencies.append((time.perf_counter() - started) * 1e3)
+
+    try:
+        tasks = []
+        for _ in range(requests):
+            tasks.append(asyncio.create_task(register()))
+            await asyncio.sleep(spacing_ms / 1e3)
+        await asyncio.gather(*tasks)
+    finally:
+        await HttpClient.close_session()
+    return latencies
+
+
+def _summary(latencies: list[float]) -> dict:
+    ordered = sorted(latencies)
+    return {
+        "p50_ms": round(statistics.median(ordered), 1),
+        "p90_ms": round(ordered[int(len(ordered) * 0.9)], 1),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 1),
+        "max_ms": round(ordered[-1], 1),
+    }
+
+
+async def main(rounds: int, requests: int, spacing_ms: float, rtt_ms: float, upstream_ms: float) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        cert, key = _certificate(directory)
+        # trust the stand-in certificate in aiohttp's default verifying context
+        aiohttp.connector._SSL_CONTEXT_VERIFIED.load_verify_locations(cert)
+        runner, upstream_port = await _upstream(cert, key, upstream_ms)
+        proxy = await _latency_proxy(upstream_port, rtt_ms)
+        api_url = f"https://localhost:{proxy.sockets[0].getsockname()[1]}/v3"
+        try:
+            results = {}
+            for name, warm in (("before", False), ("after", True)):
+                latencies: list[float] = []
+                for _ in range(rounds):
+                    latencies += await _round(api_url, warm, requests, spacing_ms)
+                results[name] = _summary(latencies)
+        finally:
+            proxy.close()
+            await runner.cleanup()
+    return {"rtt_ms": rtt_ms, "upstream_ms": upstream_ms, "requests": rounds * requests, **results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--spacing-ms", type=float, default=30)
+    parser.add_argument("--rtt-ms", type=float, default=30)
+    parser.add_argument("--upstream-ms", type=float, default=50)
+    args = parser.parse_args()
+    print(json.dumps(
+        asyncio.run(main(args.rounds, args.requests, args.spacing_ms, args.rtt_ms, args.upstream_ms)), indent=2
+    ))
@@ -0,0 +1,100 @@
+"""Local stand-ins for the services the app talks to: YooKassa API and an SMTP server."""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import uuid
+from dataclasses import dataclass, field
+
+from aiohttp import web
+from aiosmtpd.controller import Controller
+
+
+@dataclass
+class FakeYooKassa:
+    """Answers ``POST /v3/payments`` like YooKassa and remembers created payments for webhooks."""
+
+    latency: float = 0.05
+    host: str = "127.0.0.1"
+    port: int = 0
+    payments: dict[str, dict] = field(default_factory=dict)
+    _runner: web.AppRunner | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/v3"
+
+    async def create_payment(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        await asyncio.sleep(self.latency)
+        payment_id = str(uuid.uuid4())
+        payment = {
+            "id": payment_id,
+            "status": "pending",
+            "amount": {"value": f"{body['amount']['value']:.2f}", "currency": body["amount"]["currency"]},
+            "recipient": {"account_id": "100500", "gateway_id": "100700"},
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "paid": False,
+            "refundable": False,
+            "test": True,
+            "description": body.get("description"),
+            "metadata": body.get("metadata"),
+            "confirmation": {
+                "type": "redirect",
+                "confirmation_url": f"https://yoomoney.example/checkout/{payment_id}",
+            },
+        }
+        self.payments[payment_id] = payment
+        return web.json_response(payment)
+
+    def succeeded_notification(self, payment_id: str) -> dict:
+        return {
+            "type": "notification",
+            "event": "payment.succeeded",
+            "object": {**self.payments[payment_id], "status": "succeeded", "paid": True},
+        }
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/v3/payments", self.create_payment)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+class _Sink:
+    def __init__(self) -> None:
+        self.messages = 0
+
+    async def handle_DATA(self, server, session, envelope) -> str:  # noqa: N802
+        self.messages += 1
+        return "250 OK"
+
+
+class SmtpSink:
+    """``aiosmtpd`` server accepting and dropping every message."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.handler = _Sink()
+        self.controller = Controller(self.handler, hostname=host, port=port or 8025)
+
+    @property
+    def host(self) -> str:
+        return self.controller.hostname
+
+    @property
+    def port(self) -> int:
+        return self.controller.port
+
+    def start(self) -> None:
+        self.controller.start()
+
+    def stop(self) -> None:
+        self.controller.stop()
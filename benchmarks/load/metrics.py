@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import statistics
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class QueryCounter:
+    """Counts statements sent through the app engine."""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *_) -> None:
+        self.count += 1
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    concurrency: int
+    elapsed_s: float
+    queries: int
+    latencies_ms: list[float] = field(default_factory=list, repr=False)
+    status_codes: dict[int, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "requests": self.requests,
+            "concurrency": self.concurrency,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "throughput_rps": round(self.requests / self.elapsed_s, 1) if self.elapsed_s else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(self.latencies_ms, 50), 2),
+                "p95": round(percentile(self.latencies_ms, 95), 2),
+                "p99": round(percentile(self.latencies_ms, 99), 2),
+                "mean": round(statistics.fmean(self.latencies_ms), 2) if self.latencies_ms else 0.0,
+            },
+            "db_queries": self.queries,
+            "db_queries_per_request": round(self.queries / self.requests, 2) if self.requests else 0.0,
+            "status_codes": {str(code): count for code, count in sorted(self.status_codes.items())},
+        }
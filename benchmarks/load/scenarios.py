@@ -0,0 +1,89 @@
+"""Request mixes replayed against the app."""
+
+from __future__ import annotations
+
+import itertools
+import random
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+if TYPE_CHECKING:
+    import httpx
+
+    from benchmarks.load.fakes import FakeYooKassa
+    from benchmarks.load.seed import Dataset
+
+API = "/api/v1"
+
+
+@dataclass
+class Scenario:
+    name: str
+    requests: int
+    concurrency: int
+    send: Callable[[int], Awaitable[httpx.Response]]
+
+
+def catalog_browsing(client: httpx.AsyncClient, dataset: Dataset, requests: int, concurrency: int) -> Scenario:
+    pages = max(1, len(dataset.event_ids) // 20)
+
+    async def send(index: int) -> httpx.Response:
+        return await client.get(f"{API}/events", params={"currentPage": index % pages + 1, "pageSize": 20})
+
+    return Scenario("catalog_browsing", requests, concurrency, send)
+
+
+def event_detail(
+    client: httpx.AsyncClient, dataset: Dataset, requests: int, concurrency: int, rng: random.Random
+) -> Scenario:
+    # a few hot events get most of the traffic, like a launch day
+    hot = dataset.event_slugs[:5]
+
+    async def send(index: int) -> httpx.Response:
+        if index % 2:
+            return await client.get(f"{API}/events/slug/{rng.choice(hot)}")
+        return await client.get(f"{API}/events/{rng.choice(dataset.event_ids)}")
+
+    return Scenario("event_detail", requests, concurrency, send)
+
+
+def event_launch(client: httpx.AsyncClient, dataset: Dataset, requests: int, concurrency: int) -> Scenario:
+    """Everyone opens the same event page at once; concurrent reads are coalesced, so queries stay flat."""
+    slug = dataset.event_slugs[0]
+
+    async def send(_: int) -> httpx.Response:
+        return await client.get(f"{API}/events/slug/{slug}")
+
+    return Scenario("event_launch", requests, concurrency, send)
+
+
+def registration_burst(
+    client: httpx.AsyncClient, dataset: Dataset, requests: int, concurrency: int, rng: random.Random
+) -> Scenario:
+    hot = dataset.event_ids[:5]
+
+    async def send(index: int) -> httpx.Response:
+        return await client.post(
+            f"{API}/register/unregistered",
+            json={
+                "email": f"burst-{dataset.tag}-{index}@example.com",
+                "firstName": "Burst",
+                "lastName": f"User{index}",
+                "eventId": rng.choice(hot),
+                "source": rng.choice(("site", "telegram", "partner")),
+            },
+        )
+
+    return Scenario("registration_burst", requests, concurrency, send)
+
+
+def webhook_storm(client: httpx.AsyncClient, yookassa: FakeYooKassa, concurrency: int) -> Scenario:
+    """``payment.succeeded`` for every payment created by the registration burst."""
+    payment_ids = list(yookassa.payments)
+    counter = itertools.count()
+
+    async def send(_: int) -> httpx.Response:
+        payment_id = payment_ids[next(counter)]
+        return await client.post(f"{API}/webhook", json=yookassa.succeeded_notification(payment_id))
+
+    return Scenario("webhook_storm", len(payment_ids), concurrency, send)
@@ -0,0 +1,96 @@
+"""Synthetic data for the load scenarios, written with multi-row inserts."""
+
+from __future__ import annotations
+
+import datetime
+import random
+from dataclasses import dataclass
+
+from sqlalchemy import insert, select
+
+from app.config.alchemy import alchemy
+from app.db.models import Event, EventMaterial, EventSpeaker, EventTicket, Speaker, User
+from app.db.models.event_ticket import EventTicketStatus
+
+
+@dataclass(frozen=True)
+class Scale:
+    events: int
+    speakers: int
+    users: int
+    tickets_per_event: int
+    materials_per_event: int = 3
+    speakers_per_event: int = 2
+
+
+SCALES = {
+    "small": Scale(events=50, speakers=20, users=2_000, tickets_per_event=20),
+    "medium": Scale(events=500, speakers=100, users=20_000, tickets_per_event=40),
+    "large": Scale(events=2_000, speakers=300, users=200_000, tickets_per_event=100),
+}
+
+
+@dataclass
+class Dataset:
+    tag: str
+    event_ids: list[int]
+    event_slugs: list[str]
+
+
+async def _insert(session, model, rows: list[dict], chunk: int = 5_000) -> list[int]:
+    ids: list[int] = []
+    for offset in range(0, len(rows), chunk):
+        result = await session.execute(
+            insert(model).returning(model.id, sort_by_parameter_order=True), rows[offset:offset + chunk]
+        )
+        ids.extend(result.scalars())
+    return ids
+
+
+async def seed(scale: Scale, tag: str, rng: random.Random) -> Dataset:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    async with alchemy.get_session() as session:
+        speaker_ids = await _insert(session, Speaker, [
+            {"name": f"Speaker {index}", "description": "Synthetic speaker", "contacts": f"@speaker{index}"}
+            for index in range(scale.speakers)
+        ])
+        user_ids = await _insert(session, User, [
+            {"first_name": "Load", "last_name": f"User{index}", "email": f"load-{tag}-{index}@example.com"}
+            for index in range(scale.users)
+        ])
+        event_ids = await _insert(session, Event, [
+            {
+                "title": f"Load event {tag} {index}",
+                "slug": f"load-event-{tag}-{index}",
+                "description": "Synthetic event for load testing",
+                "price": 1000,
+                "pro_price": 800,
+                "event_date": now + datetime.timedelta(days=rng.randint(-30, 90)),
+                "location": "Online",
+                "max_participants": scale.tickets_per_event * 5,
+            }
+            for index in range(scale.events)
+        ])
+        await _insert(session, EventSpeaker, [
+            {"event_id": event_id, "speaker_id": speaker_id}
+            for event_id in event_ids
+            for speaker_id in rng.sample(speaker_ids, min(scale.speakers_per_event, len(speaker_ids)))
+        ])
+        await _insert(session, EventMaterial, [
+            {"event_id": event_id, "title": f"Slides {index}", "url": "https://example.com/slides.pdf", "is_pro_only": index == 0}
+            for event_id in event_ids
+            for index in range(scale.materials_per_event)
+        ])
+        await _insert(session, EventTicket, [
+            {
+                "event_id": event_id,
+                "user_id": user_id,
+                "amount_paid": 1000,
+                "status": rng.choice((EventTicketStatus.PAID, EventTicketStatus.WAITING_PAYMENT)),
+            }
+            for event_id in event_ids
+            for user_id in rng.sample(user_ids, min(scale.tickets_per_event, len(user_ids)))
+        ])
+        slugs = list(await session.scalars(select(Event.slug).where(Event.id.in_(event_ids)).order_by(Event.id)))
+        await session.commit()
+    return Dataset(tag=tag, event_ids=event_ids, event_slugs=slugs)
@@ -0,0 +1,116 @@
+"""Creating many same-titled events: per-insert slug probing vs ``SlugAllocator``.
+
+Runs against the database from ``POSTGRES_DSN`` and removes the rows it created::
+
+    python -m benchmarks.slugs --events 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import json
+import time
+import uuid
+
+from slugify import slugify
+from sqlalchemy import delete, exists, insert, select
+
+from app.config.alchemy import alchemy
+from app.db.models import Event, EventSlugCounter
+from app.domain.events.services import SlugAllocator
+
+
+def _row(title: str, slug: str) -> dict:
+    return {
+        "title": title,
+        "slug": slug,
+        "price": 100,
+        "pro_price": 50,
+        "event_date": datetime.datetime.now(datetime.timezone.utc),
+        "location": "Bench",
+    }
+
+
+async def probing(title: str, count: int, batch: int) -> tuple[float, int]:
+    """Previous behaviour plus the probing a slug repository does: query until a free suffix is found."""
+    queries = 0
+    started = time.perf_counter()
+    async with alchemy.get_session() as session:
+        base = slugify(title)
+        for index in range(count):
+            suffix = 1
+            while True:
+                slug = base if suffix == 1 else f"{base}-{suffix}"
+                queries += 1
+                if not await session.scalar(select(exists().where(Event.slug == slug))):
+                    break
+                suffix += 1
+            await session.execute(insert(Event).values(_row(title, slug)))
+            if index % batch == 0:
+                await session.commit()
+        await session.commit()
+    return time.perf_counter() - started, queries
+
+
+async def allocator(title: str, count: int, batch: int) -> tuple[float, int]:
+    queries = 0
+    started = time.perf_counter()
+    async with alchemy.get_session() as session:
+        for offset in range(0, count, batch):
+            size = min(batch, count - offset)
+            slugs = await SlugAllocator.allocate(session, [title] * size)
+            await session.execute(insert(Event), [_row(title, slug) for slug in slugs])
+            await session.commit()
+            queries += 2
+    return time.perf_counter() - started, queries
+
+
+async def single_allocations(title: str, count: int) -> tuple[float, int]:
+    started = time.perf_counter()
+    async with alchemy.get_session() as session:
+        for _ in range(count):
+            [slug] = await SlugAllocator.allocate(session, [title])
+            await session.execute(insert(Event).values(_row(title, slug)))
+        await session.commit()
+    return time.perf_counter() - started, count * 2
+
+
+async def cleanup(titles: list[str]) -> None:
+    async with alchemy.get_session() as session:
+        await session.execute(delete(Event).where(Event.title.in_(titles)))
+        await session.execute(
+            delete(EventSlugCounter).where(EventSlugCounter.base.in_([slugify(title) for title in titles]))
+        )
+        await session.commit()
+
+
+async def main(count: int, batch: int, probe_limit: int) -> dict:
+    tag = uuid.uuid4().hex[:6]
+    titles = {name: f"Meetup {name} {tag}" for name in ("probing", "single", "batch")}
+    try:
+        # probing is quadratic in the number of same-titled events, keep it bounded
+        results = {
+            "probing": await probing(titles["probing"], min(count, probe_limit), batch),
+            "single": await single_allocations(titles["single"], count),
+            "batch": await allocator(titles["batch"], count, batch),
+        }
+    finally:
+        await cleanup(list(titles.values()))
+    return {
+        "events": count,
+        **{
+            name: {"events": min(count, probe_limit) if name == "probing" else count, "seconds": round(elapsed, 3), "queries": queries}
+            for name, (elapsed, queries) in results.items()
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--probe-limit", type=int, default=2_000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main(args.events, args.batch, args.probe_limit)), indent=2))
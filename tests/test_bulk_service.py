@@ -0,0 +1,24 @@
+import msgspec
+import pytest
+from litestar.exceptions import ClientException
+
+from app.services.bulk.bulk_service import BulkItemStatus, BulkService
+
+
+class Item(msgspec.Struct):
+    title: str
+
+
+def test_malformed_ndjson_line_is_an_item_error():
+    body = b'{"title": "a"}\n{"title": \n{"title": 1}\n{"title": "d"}\n'
+    items, errors = BulkService.decode(body, "application/x-ndjson", Item)
+    assert [(index, item.title) for index, item in items] == [(0, "a"), (3, "d")]
+    assert [error.index for error in errors] == [1, 2]
+    assert all(error.status == BulkItemStatus.ERROR for error in errors)
+
+
+@pytest.mark.parametrize("body", [b'[{"title": "a"}', b'{"title": "a"}', b""])
+def test_body_that_is_not_an_array_is_rejected(body):
+    with pytest.raises(ClientException) as raised:
+        BulkService.decode(body, "application/json", Item)
+    assert raised.value.status_code == 400
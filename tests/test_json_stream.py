@@ -0,0 +1,46 @@
+import random
+
+import msgspec
+import pytest
+
+from app.services.http.json_stream import JsonItemStream
+
+
+def _stream(body: bytes, sizes) -> tuple[list, dict]:
+    items = JsonItemStream("items")
+    decoded, offset = [], 0
+    while offset < len(body):
+        size = next(sizes)
+        decoded += items.feed(body[offset:offset + size])
+        offset += size
+    return decoded, items.envelope()
+
+
+def _document(rng: random.Random) -> dict:
+    values = ("}, {", "a", '\\"', "[1,{}]", "", " , ")
+    return {
+        "items": [
+            {"k": rng.choice(values), "n": [rng.randint(0, 9)] * rng.randint(0, 3), "o": {"x": {}}}
+            for _ in range(rng.randint(0, 8))
+        ],
+        "next_cursor": "cursor",
+    }
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 7, 64])
+def test_fixed_chunks(size):
+    body = b'{"items": [{"a": 1}, {"b": [2]}, {"c": 3}], "next_cursor": "x"}'
+    decoded, envelope = _stream(body, iter(lambda: size, None))
+    assert decoded == msgspec.json.decode(body)["items"]
+    assert envelope == {"items": [], "next_cursor": "x"}
+
+
+def test_random_chunks_match_whole_decode():
+    rng = random.Random(0)
+    for _ in range(3000):
+        document = msgspec.json.encode(_document(rng))
+        body = rng.choice((document, msgspec.json.format(document, indent=2)))
+        decoded, envelope = _stream(body, iter(lambda: rng.randint(1, 40), None))
+        expected = msgspec.json.decode(body)
+        assert decoded == expected["items"]
+        assert envelope == {**expected, "items": []}